@@ -5,13 +5,17 @@ Main relations module
 import re
 import inspect
 
-from relations.source import Source
+from relations.source import BaseSource, Source, AsyncSource
 from relations.field import Field, FieldError
 from relations.titles import Titles
 from relations.record import Record, RecordError
-from relations.model import Model, ModelIdentity, ModelError
+from relations.model import BaseModel, Model, AsyncModel, ModelIdentity, ModelError
 from relations.relation import Relation, OneTo, OneToOne, OneToMany
 from relations.migrations import Migrations, MigrationsError
+from relations.session import Session, SESSION
+from relations.cache import Cache
+from relations.collector import Collector
+from relations.detector import Detector
 
 INDEX = re.compile(r'^-?\d+$')
 
@@ -33,6 +37,14 @@ def source(name):
     return SOURCES.get(name)
 
 
+def session():
+    """
+    Returns the current session, if any
+    """
+
+    return SESSION.get()
+
+
 def models(module, from_base=None):
     """
     Returns all models
@@ -40,13 +52,13 @@ def models(module, from_base=None):
         module (str): Python module in which to search.
         from_base (type, optional): Base class from which to filter children of
     """
-    from_base = from_base or Model
+    from_base = from_base or BaseModel
     return [
         m[1]
         for m in inspect.getmembers(
             module,
             lambda model: inspect.isclass(model)
             and issubclass(model, from_base)
-            and model is not from_base,
+            and model not in (from_base, Model, AsyncModel),
         )
     ]
@@ -0,0 +1,104 @@
+"""
+Relations Module for handling cached results
+"""
+
+import json
+import time
+import collections
+
+class Cache:
+    """
+    Least recently used results of retrieves by criteria, expiring after ttl seconds
+    """
+
+    size = None    # Most results to keep
+    ttl = None     # Seconds to keep results, forever if None
+    results = None # Results by key with when they expire and the NAMEs they depend on
+
+    def __init__(self, size=1000, ttl=None):
+
+        self.size = size
+        self.ttl = ttl
+        self.results = collections.OrderedDict()
+
+    @staticmethod
+    def key(model, action, *args):
+        """
+        Gets the canonical key of a query for a model
+        """
+
+        criteria = {field.name: field.criteria for field in model._record._order if field.criteria}
+
+        return json.dumps([
+            model.NAME, action, model._mode, model._role, criteria,
+            model._like, model._sort, model._limit, model._offset, model._only, list(args)
+        ], sort_keys=True, default=str)
+
+    @classmethod
+    def names(cls, model):
+        """
+        Gets the NAMEs titles depend on, the model and its ancestors
+        """
+
+        names = [model.NAME]
+
+        for field in model._titles:
+            relation = model._ancestor(field)
+            if relation is not None:
+                names.extend(name for name in cls.names(relation.Parent.thy()) if name not in names)
+
+        return names
+
+    @classmethod
+    def depends(cls, model):
+        """
+        Gets the NAMEs retrieves and counts depend on, ancestors too when like matches their titles
+        """
+
+        return cls.names(model) if model._like is not None else [model.NAME]
+
+    def get(self, key):
+        """
+        Gets a result if there and not expired
+        """
+
+        if key not in self.results:
+            return None
+
+        expires, _, value = self.results[key]
+
+        if expires is not None and expires < time.time():
+            del self.results[key]
+            return None
+
+        self.results.move_to_end(key)
+
+        return value
+
+    def set(self, key, value, names):
+        """
+        Stores a result, evicting the least recently used over size
+        """
+
+        expires = time.time() + self.ttl if self.ttl is not None else None
+
+        self.results[key] = (expires, names, value)
+        self.results.move_to_end(key)
+
+        while len(self.results) > self.size:
+            self.results.popitem(last=False)
+
+    def invalidate(self, name):
+        """
+        Removes all results depending on a NAME
+        """
+
+        for key in [key for key, (_, names, _) in self.results.items() if name in names]:
+            del self.results[key]
+
+    def clear(self):
+        """
+        Removes all results
+        """
+
+        self.results.clear()
@@ -0,0 +1,61 @@
+"""
+Relations Module for handling collected query timings
+"""
+
+import bisect
+
+class Collector:
+    """
+    Source hook aggregating latency histograms by model and action
+    """
+
+    BUCKETS = [0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5] # Upper bounds in seconds
+
+    buckets = None # Upper bounds in seconds of the histograms
+    stats = None   # Stats by model NAME and action
+
+    def __init__(self, buckets=None):
+
+        self.buckets = sorted(buckets or self.BUCKETS)
+        self.stats = {}
+
+    def __call__(self, event):
+        """
+        Adds an action's timing once it's done
+        """
+
+        if event["stage"] != "after":
+            return
+
+        stat = self.stats.setdefault((event["model"], event["action"]), {
+            "count": 0,
+            "errors": 0,
+            "rows": 0,
+            "seconds": 0.0,
+            "max": 0.0,
+            "histogram": [0] * (len(self.buckets) + 1)
+        })
+
+        stat["count"] += 1
+        stat["errors"] += event["error"] is not None
+        stat["rows"] += event["rows"] or 0
+        stat["seconds"] += event["seconds"]
+        stat["max"] = max(stat["max"], event["seconds"])
+        stat["histogram"][bisect.bisect_left(self.buckets, event["seconds"])] += 1
+
+    def report(self):
+        """
+        Gets the stats, most total time first
+        """
+
+        return sorted([
+            {"model": model, "action": action, **stat, "mean": stat["seconds"] / stat["count"]}
+            for (model, action), stat in self.stats.items()
+        ], key=lambda stat: -stat["seconds"])
+
+    def clear(self):
+        """
+        Removes all stats
+        """
+
+        self.stats = {}
@@ -0,0 +1,160 @@
+"""
+Relations Module for handling detecting N+1 queries
+"""
+
+import os
+import json
+import sysconfig
+import traceback
+import contextvars
+
+import relations
+
+DETECTING = contextvars.ContextVar("relations.detecting", default=None) # Detector for the current context
+
+class Detector:
+    """
+    Source hook flagging the same query repeated for different single ids, used within a with block
+    """
+
+    LIBRARY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "") # Path of relations itself
+    STDLIB = sysconfig.get_paths()["stdlib"]   # Path of the standard library
+    PURELIB = sysconfig.get_paths()["purelib"] # Path of installed packages, possibly within STDLIB
+
+    threshold = None # How many different ids make a problem
+    queries = None   # Ids queried by source, model, action and field
+    sources = None   # Sources hooked while detecting
+    token = None     # Token to restore the enclosing detector
+
+    def __init__(self, threshold=2):
+
+        self.threshold = threshold
+        self.queries = {}
+        self.sources = []
+
+    def __enter__(self):
+
+        self.queries = {}
+        self.sources = list(relations.SOURCES.values())
+
+        for source in self.sources:
+            source.hook(self)
+
+        self.token = DETECTING.set(self)
+
+        return self
+
+    def __exit__(self, *args):
+
+        DETECTING.reset(self.token)
+
+        for source in self.sources:
+            source.unhook(self)
+
+    @staticmethod
+    def single(event):
+        """
+        Gets the id field and value a query is by, if by a single equals or in alone
+        """
+
+        shape = event["shape"]
+
+        if not shape or shape["like"] or len(shape["criteria"]) != 1:
+            return None
+
+        field, criteria = list(shape["criteria"].items())[0]
+
+        if criteria not in [["eq"], ["in"]]:
+            return None
+
+        # Ids are the model's own or those relations connect through
+
+        model = event["instance"]
+
+        ids = [model._id]
+        ids.extend(relation.child_field for relation in model.PARENTS.values())
+        ids.extend(relation.parent_field for relation in model.CHILDREN.values())
+
+        if field not in ids:
+            return None
+
+        return field, model._record._names[field].criteria[criteria[0]]
+
+    @classmethod
+    def ignored(cls, filename):
+        """
+        Whether a frame's file is within relations or the standard library
+        """
+
+        path = os.path.abspath(filename)
+
+        if path.startswith(cls.LIBRARY):
+            return True
+
+        return path.startswith(cls.STDLIB) and not path.startswith(cls.PURELIB)
+
+    @classmethod
+    def site(cls):
+        """
+        Gets the innermost frame calling into relations
+        """
+
+        for frame in reversed(traceback.extract_stack()):
+            if not cls.ignored(frame.filename):
+                return f"{frame.filename}:{frame.lineno} in {frame.name}"
+
+        return None
+
+    def __call__(self, event):
+        """
+        Records a query about to happen
+        """
+
+        if event["stage"] != "before" or DETECTING.get() is not self:
+            return
+
+        single = self.single(event)
+
+        if single is None:
+            return
+
+        field, value = single
+
+        self.queries.setdefault((event["source"], event["model"], event["action"], field), []).append(
+            (json.dumps(value, default=str, sort_keys=True), self.site(), event["instance"]._through)
+        )
+
+    def problems(self):
+        """
+        Gets the queries repeated for at least threshold different ids
+        """
+
+        problems = []
+
+        for (source, model, action, field), queries in self.queries.items():
+
+            if len({value for value, _, _ in queries}) < self.threshold:
+                continue
+
+            problems.append({
+                "source": source,
+                "model": model,
+                "action": action,
+                "field": field,
+                "count": len(queries),
+                "sites": sorted({site for _, site, _ in queries if site}),
+                "relations": sorted({through for _, _, through in queries if through})
+            })
+
+        return problems
+
+    def message(self):
+        """
+        Describes the problems
+        """
+
+        return "\n".join(
+            f"{problem['count']} {problem['action']} queries of {problem['model']} by {problem['field']}"
+            f" through {', '.join(problem['relations']) or 'no relation'} from {', '.join(problem['sites'])}"
+            for problem in self.problems()
+        )
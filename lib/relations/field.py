@@ -51,6 +51,17 @@ class Field: # pylint: disable=too-many-instance-attributes
     original = None   # Original value (as export)
     criteria = None   # Values for searching
     changed = None    # Whether an field has changed for update only
+    dirty = None      # Whether value may differ from original since last stored
+
+    _valid = None     # Compiled validator, cleared when what it checks changes
+
+    VALIDATE = [
+        "kind",
+        "none",
+        "init",
+        "options",
+        "validation"
+    ]
 
     # Operators supported and whether allwo multiple values
 
@@ -67,9 +78,18 @@ class Field: # pylint: disable=too-many-instance-attributes
         "value",
         "original",
         "changed",
+        "dirty",
         "criteria"
     ]
 
+    STATE = [
+        "value",
+        "original",
+        "criteria",
+        "changed",
+        "dirty"
+    ]
+
     OPERATORS = {
         'null': False,
         'eq': False,
@@ -97,6 +117,7 @@ class Field: # pylint: disable=too-many-instance-attributes
         'export',
         'filter',
         'insert',
+        'iterate',
         'titless',
         'like',
         'limit',
@@ -104,6 +125,7 @@ class Field: # pylint: disable=too-many-instance-attributes
         'match',
         'one',
         'overflow',
+        'prefetch',
         'prepare',
         'read',
         'retrieve',
@@ -252,6 +274,13 @@ class Field: # pylint: disable=too-many-instance-attributes
 
             value = self.valid(value)
             self.changed = True
+            self.dirty = True
+
+        if name == "original":
+            self.dirty = True
+
+        if name in self.VALIDATE:
+            object.__setattr__(self, "_valid", None)
 
         object.__setattr__(self, name, value)
 
@@ -275,43 +304,113 @@ class Field: # pylint: disable=too-many-instance-attributes
 
         return definition
 
-    def valid(self, value): # pylint: disable=too-many-branches
+    def clone(self):
         """
-        Returns the valid value, raising issues if invalid
+        Creates a field sharing this field's definition, with its own copy of state
         """
 
-        # none rules all
+        # Compile here so clones share the validator rather than each compiling their own
+
+        if self._valid is None:
+            self._valid = self.validator()
+
+        field = object.__new__(self.__class__)
+        field.__dict__.update(self.__dict__)
+
+        for attr in self.STATE:
+            if attr in self.__dict__:
+                field.__dict__[attr] = copy.deepcopy(self.__dict__[attr])
+
+        return field
+
+    def validator(self): # pylint: disable=too-many-branches
+        """
+        Compiles valid into a single check of a value, taking the field for errors
+        """
+
+        kind = self.kind
+        none = self.none
+        init = self.init
+        options = self.options
+        validation = self.validation
+
+        # How to cast, straight to the kind unless there's init
+
+        if init is not None and callable(init):
+            cast = init
+        elif init is not None:
+            def cast(value):
+                if isinstance(value, dict):
+                    return kind(**{attr: overscore.get(value, store) for attr, store in init.items()})
+                return kind(value)
+        else:
+            cast = kind
+
+        # Look up options as a set if they can be
+
+        if options is not None:
+            try:
+                options = frozenset(options)
+            except TypeError:
+                pass
+
+        if isinstance(validation, str):
+            check = re.compile(validation).match
+        elif callable(validation):
+            check = validation
+        else:
+            check = None
+
+        def valid(field, value):
+
+            # none rules all
+
+            if value is None:
+                if not none:
+                    raise FieldError(field, f"None not allowed for {field.name}")
+                return value
+
+            if value.__class__ is not kind and not isinstance(value, kind):
+                value = cast(value)
+
+            if options is not None:
+                if kind == set:
+                    for each in value:
+                        if each not in options:
+                            raise FieldError(field, f"{each} not in {field.options} for {field.name}")
+                elif value not in options:
+                    raise FieldError(field, f"{value} not in {field.options} for {field.name}")
+
+            if check is not None and not check(value):
+                if isinstance(validation, str):
+                    raise FieldError(field, f"{value} doesn't match {validation} for {field.name}")
+                raise FieldError(field, f"{value} invalid for {field.name}")
 
-        if value is None:
-            if not self.none:
-                raise FieldError(self, f"None not allowed for {self.name}")
             return value
 
-        if not isinstance(value, self.kind):
-            if self.init is not None and callable(self.init):
-                value = self.init(value)
-            elif self.init is not None and isinstance(value, dict):
-                value = self.kind(**{init: overscore.get(value, store) for init, store in self.init.items()})
-            else:
-                value = self.kind(value)
-
-        if self.options is not None:
-            if self.kind == set:
-                for each in value:
-                    if each not in self.options:
-                        raise FieldError(self, f"{each} not in {self.options} for {self.name}")
-            elif value not in self.options:
-                raise FieldError(self, f"{value} not in {self.options} for {self.name}")
-
-        if self.validation is not None:
-            if isinstance(self.validation, str):
-                if not re.match(self.validation, value):
-                    raise FieldError(self, f"{value} doesn't match {self.validation} for {self.name}")
-            elif callable(self.validation):
-                if not self.validation(value): # pylint: disable=not-callable
-                    raise FieldError(self, f"{value} invalid for {self.name}")
-
-        return value
+        return valid
+
+    def valid(self, value):
+        """
+        Returns the valid value, raising issues if invalid
+        """
+
+        if self._valid is None:
+            self._valid = self.validator()
+
+        return self._valid(self, value)
+
+    def valid_many(self, values):
+        """
+        Returns the valid values, raising issues on the first invalid
+        """
+
+        if self._valid is None:
+            self._valid = self.validator()
+
+        valid = self._valid
+
+        return [valid(self, value) for value in values]
 
     def filter(self, value, criterion="eq"): # pylint: disable=too-many-branches
         """
@@ -349,7 +448,7 @@ class Field: # pylint: disable=too-many-instance-attributes
             if path or self.kind in [set, list]:
                 self.criteria[criterion].extend(value)
             else:
-                self.criteria[criterion].extend(self.valid(item) for item in value)
+                self.criteria[criterion].extend(self.valid_many(value))
 
         else:
 
@@ -418,6 +517,17 @@ class Field: # pylint: disable=too-many-instance-attributes
         Detect if a field is different from original
         """
 
+        # Without attr, scalars export as themselves and only change by
+        # assignment, while lists and dicts export as copies of themselves
+
+        if self.attr is None:
+
+            if self.kind in [bool, int, float, str]:
+                return self.dirty is True and self.value != self.original
+
+            if self.kind in [list, dict]:
+                return self.value != self.original
+
         return self.export() != self.original
 
     def write(self, values):
@@ -439,77 +549,106 @@ class Field: # pylint: disable=too-many-instance-attributes
         if not self.auto:
             self.write(values)
             self.original = self.export()
+            self.dirty = False
 
-    def retrieve(self, values): # pylint: disable=too-many-return-statements,too-many-branches)
+    def condition(self, operator, satisfy, path): # pylint: disable=too-many-return-statements,too-many-branches
         """
-        Check if this value satisfies our criteria
+        Compiles a single criterion into a check of a value
         """
 
-        for operator, satisfy in (self.criteria or {}).items():
+        if operator == "null":
+            return lambda value: satisfy == (value is None)
 
-            value = values.get(self.store)
+        if operator == "in":
+            if not path and self.kind in [bool, int, float, str]:
+                try:
+                    satisfy = frozenset(satisfy)
+                except TypeError:
+                    pass
+            return lambda value: value is not None and value in satisfy
 
-            if self.kind in [bool, int, float, str, set, list, dict]:
-                value = self.valid(value)
-            elif not value:
-                value = value or {}
+        if operator == "eq":
+            return lambda value: value is not None and value == satisfy
 
-            path = overscore.parse(operator)
-            operator = path.pop().split('_')
-            operator, invert = (operator[-1], len(operator) > 1)
-            condition = False
+        if operator == "gt":
+            return lambda value: value is not None and value > satisfy
 
-            value = overscore.get(value, path)
+        if operator == "gte":
+            return lambda value: value is not None and value >= satisfy
 
-            if operator == "null":
-                condition = (satisfy == (value is None))
+        if operator == "lt":
+            return lambda value: value is not None and value < satisfy
 
-            elif value is None:
-                condition = False
+        if operator == "lte":
+            return lambda value: value is not None and value <= satisfy
 
-            elif operator == "in":
-                condition = value  in satisfy
+        if operator in ["like", "start", "end"]:
 
-            elif operator == "eq":
-                condition = value == satisfy
+            needle = str(satisfy).lower()
 
-            elif operator == "gt":
-                condition = value > satisfy
+            if operator == "like":
+                return lambda value: value is not None and needle in str(value).lower()
 
-            elif operator == "gte":
-                condition = value >= satisfy
+            if operator == "start":
+                return lambda value: value is not None and str(value).lower().startswith(needle)
 
-            elif operator == "lt":
-                condition = value < satisfy
+            return lambda value: value is not None and str(value).lower().endswith(needle)
 
-            elif operator == "lte":
-                condition = value <= satisfy
+        if operator == "has":
+            return lambda value: value is not None and all(item in value for item in satisfy)
 
-            elif operator == "like":
-                condition = str(satisfy).lower() in str(value).lower()
+        if operator == "any":
+            return lambda value: value is not None and any(item in value for item in satisfy)
 
-            elif operator == "start":
-                condition = str(value).lower().startswith(str(satisfy).lower())
+        if operator == "all":
+            return lambda value: value is not None and all(item in value for item in satisfy) and len(value) == len(satisfy)
 
-            elif operator == "end":
-                condition = str(value).lower().endswith(str(satisfy).lower())
+        return lambda value: False
 
-            elif operator == "has":
-                condition = all(item in value for item in satisfy)
+    def compile(self):
+        """
+        Compiles criteria into a single check of stored values
+        """
 
-            elif operator == "any":
-                condition = any(item in value for item in satisfy)
+        conditions = []
 
-            elif operator == "all":
-                condition = all(item in value for item in satisfy) and len(value) == len(satisfy)
+        for criterion, satisfy in (self.criteria or {}).items():
 
-            if invert:
-                condition = not condition
+            path = overscore.parse(criterion)
+            operator = path.pop().split('_')
+            operator, invert = (operator[-1], len(operator) > 1)
 
-            if not condition:
-                return False
+            conditions.append((path, self.condition(operator, satisfy, path), invert))
+
+        store = self.store
+        valid = self.valid if self.kind in [bool, int, float, str, set, list, dict] else None
+
+        def retrieve(values):
+            """
+            Check if these values satisfy the compiled criteria
+            """
+
+            value = values.get(store)
+
+            if valid is not None:
+                value = valid(value)
+            elif not value:
+                value = {}
+
+            for path, condition, invert in conditions:
+                if bool(condition(overscore.get(value, path) if path else value)) == invert:
+                    return False
+
+            return True
+
+        return retrieve
+
+    def retrieve(self, values):
+        """
+        Check if this value satisfies our criteria
+        """
 
-        return True
+        return self.compile()(values)
 
     def like(self, values, like, parents, path=None):
         """
@@ -547,6 +686,7 @@ class Field: # pylint: disable=too-many-instance-attributes
             self.value = values.get(self.store)
 
         self.original = self.export()
+        self.dirty = False
 
     def title(self, path=None):
         """
@@ -580,6 +720,7 @@ class Field: # pylint: disable=too-many-instance-attributes
         if self.delta():
             self.write(values)
             self.original = self.export()
+            self.dirty = False
 
     def mass(self, values):
         """
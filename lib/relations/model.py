@@ -5,8 +5,8 @@ Relations Module for handling models
 # pylint: disable=unsupported-membership-test,too-few-public-methods,too-many-branches,too-many-statements,too-many-instance-attributes
 
 import copy
-
 import functools
+import itertools
 
 import overscore
 import relations
@@ -28,6 +28,26 @@ class ModelError(Exception):
         """
         return f"{self.model.NAME}: {self.message}"
 
+@functools.total_ordering
+class Descending:
+    """
+    Wraps a sort key so it sorts in reverse within a key tuple
+    """
+
+    __slots__ = ["key"]
+
+    def __init__(self, key):
+
+        self.key = key
+
+    def __eq__(self, other):
+
+        return self.key == other.key
+
+    def __lt__(self, other):
+
+        return other.key < self.key
+
 class ModelIdentity:
     """
     Intermiedate statuc type class for constructing mode information with a full model
@@ -52,6 +72,7 @@ class ModelIdentity:
     BROTHERS = None # Brother relationships (many to many)
 
     _fields = None # Base record to create other records with
+    _fieldset = frozenset() # Names of fields for quick attribute checks
     _id = None     # Name of id field
     _titles = None  # Actual fields of the titles
     _list = None   # Actual fields to list
@@ -59,6 +80,9 @@ class ModelIdentity:
     _index = None  # Actual indexes
     _order = None  # Default sort order
 
+    _thy = None        # Compiled identity for this class, with the generation, source and attributes it was compiled with
+    _generation = 0    # Bumped whenever relationships change, invalidating compiled identities
+
     DEFINE = [
         "id",
         "unique",
@@ -101,11 +125,44 @@ class ModelIdentity:
         Base identity to be known without instantiating the class
         """
 
+        # Compile once per class, again only if relationships or the source changed
+
+        source = relations.source(cls.SOURCE)
+        compiled = cls.__dict__.get('_thy')
+
+        if compiled is None or compiled[0] != ModelIdentity._generation or compiled[1] is not source:
+
+            identity = ModelIdentity()
+            identity.__dict__.update(cls.__dict__)
+            cls._compile(identity)
+
+            # Whatever compiling or the source's init added or changed, instances get too
+
+            derived = {
+                attr: value for attr, value in identity.__dict__.items()
+                if attr not in cls.__dict__ or cls.__dict__[attr] is not value
+            }
+
+            compiled = (ModelIdentity._generation, source, identity, derived)
+            cls._thy = compiled
+
         # If self wasn't sent, we're just providing a shell of an instance
 
         if self is None:
-            self = ModelIdentity()
-            self.__dict__.update(cls.__dict__)
+            return compiled[2]
+
+        self.__dict__.update(compiled[3])
+
+        if source is not None:
+            source.instance_init(self)
+
+        return self
+
+    @classmethod
+    def _compile(cls, self):
+        """
+        Compiles the identity, deriving fields, indexes, etc
+        """
 
         # Use TITLE, NAME if set, else use class name
 
@@ -145,6 +202,7 @@ class ModelIdentity:
             fields.append(field)
 
         setattr(self, '_fields', fields)
+        setattr(self, '_fieldset', frozenset(fields._names))
 
         # Determine the _id field name
 
@@ -308,6 +366,31 @@ class ModelIdentity:
 
         return ordering
 
+    @staticmethod
+    def _sorter(sorting, value):
+        """
+        Creates a key from prefixed sorting, getting each value once per item, None first
+        """
+
+        orders = [(sort[0] == '-', *(sort[1:].split('__', 1) + [None])[:2]) for sort in sorting]
+
+        def key(item):
+
+            keys = []
+
+            for descending, name, path in orders:
+
+                field = value(item, name)
+
+                if path is not None:
+                    field = overscore.get(field, path)
+
+                keys.append(Descending((field is not None, field)) if descending else (field is not None, field))
+
+            return tuple(keys)
+
+        return key
+
     def _ancestor(self, field):
         """
         Looks up a parent class for a field
@@ -349,9 +432,9 @@ class ModelIdentity:
         return relations.Migrations.model(previous, definition)
 
 
-class Model(ModelIdentity):
+class BaseModel(ModelIdentity):
     """
-    Main model class
+    Main model class, everything but querying the source
     """
 
     _record = None # The current loaded single record (from get/create)
@@ -373,6 +456,10 @@ class Model(ModelIdentity):
     _offset = None   # If we're limiting, where to start
     _action = None   # Overall action of this model
     _related = None  # Which fields will be set automatically
+    _prefetch = None # Relations to retrieve along with the models
+    _only = None     # Fields to read when retrieving, None for all
+    _titled = None   # Parent titles already resolved, keyed by parent and field
+    _through = None  # Relation this was looked up through, as NAME.attribute
 
     overflow = False # Whether our overflow limt was reached
 
@@ -422,6 +509,8 @@ class Model(ModelIdentity):
         self._action = self._extract(kwargs, '_action', "create")
 
         self._chunk = self._extract(kwargs, '_chunk', self.CHUNK)
+        self._titled = self._extract(kwargs, '_titled')
+        self._only = self._extract(kwargs, '_only')
 
         # If we're being created from reading from a source
 
@@ -429,7 +518,7 @@ class Model(ModelIdentity):
 
             self._mode = "one"
             self._action = "update"
-            self._record = self._build(self._action, _read=_read)
+            self._record = self._build(self._action, _read=_read, _only=self._only)
 
         # If we're being created as a parent
 
@@ -490,12 +579,24 @@ class Model(ModelIdentity):
 
                 self._record = self._build(self._action, *args, **kwargs)
 
+    def _fielded(self, name):
+        """
+        Whether a name is a field or a path within a field
+        """
+
+        fieldset = object.__getattribute__(self, '_fieldset')
+
+        if name in fieldset:
+            return True
+
+        return '__' in name and name == name.lower() and name.split('__', 1)[0] in fieldset
+
     def __setattr__(self, name, value):
         """
         Use to set field values directly
         """
 
-        if name[0] != '_' and name == name.lower() and name.split('__')[0] in (object.__getattribute__(self, '_fields') or []):
+        if name[0] != '_' and self._fielded(name):
 
             self._ensure()
 
@@ -547,7 +648,16 @@ class Model(ModelIdentity):
         Use to get field values directly
         """
 
-        if name[0] != '_' and name == name.lower() and name.split('__')[0] in (object.__getattribute__(self, '_fields') or []):
+        if name[0] != '_' and object.__getattribute__(self, '_fielded')(name):
+
+            # Plain field on a loaded single record goes straight to the value
+
+            state = object.__getattribute__(self, '__dict__')
+
+            if state.get('_mode') == "one" and state.get('_role') != "child" and state.get('_action') != "retrieve":
+                field = state['_record']._names.get(name)
+                if field is not None:
+                    return field.value
 
             self._ensure()
 
@@ -568,11 +678,11 @@ class Model(ModelIdentity):
 
     def __len__(self):
         """
-        Use for number of records
+        Use for number of records, which have to be counted explicitly
         """
 
         if self._action == "retrieve" and self._mode == "many":
-            return self.count()
+            raise ModelError(self, "need to count")
 
         self._ensure()
 
@@ -702,6 +812,8 @@ class Model(ModelIdentity):
         cls.PARENTS = cls.PARENTS or {}
         cls.PARENTS[relation.child_parent] = relation
 
+        ModelIdentity._generation += 1
+
     @classmethod
     def _child(cls, relation):
         """
@@ -711,6 +823,8 @@ class Model(ModelIdentity):
         cls.CHILDREN = cls.CHILDREN or {}
         cls.CHILDREN[relation.parent_child] = relation
 
+        ModelIdentity._generation += 1
+
     # These aren't used yet and might need to go
 
     @classmethod
@@ -722,6 +836,8 @@ class Model(ModelIdentity):
         cls.SISTERS = cls.SISTERS or {}
         cls.SISTERS[relation.brother_sister] = relation
 
+        ModelIdentity._generation += 1
+
     @classmethod
     def _brother(cls, relation):
         """
@@ -731,6 +847,8 @@ class Model(ModelIdentity):
         cls.BROTHERS = cls.BROTHERS or {}
         cls.BROTHERS[relation.sister_brother] = relation
 
+        ModelIdentity._generation += 1
+
     def _relate(self, name):
         """
         Looks up a relation by attribute name
@@ -745,6 +863,7 @@ class Model(ModelIdentity):
                     self._parents[name] = relation.Parent.many().limit(self._chunk)
                 else:
                     self._parents[name] = relation.Parent(_child={relation.parent_field: self[relation.child_field]})
+                self._parents[name]._through = f"{self.NAME}.{name}"
 
             return self._parents[name]
 
@@ -759,6 +878,7 @@ class Model(ModelIdentity):
                     self._children[name] = relation.Child(
                         _parent={relation.child_field: self._record[relation.parent_field]}, _mode=relation.MODE
                     )
+                self._children[name]._through = f"{self.NAME}.{name}"
 
             return self._children[name]
 
@@ -796,8 +916,23 @@ class Model(ModelIdentity):
                 self._parents[child_parent] = None
 
         for parent_child, relation in self.CHILDREN.items():
-            if field_name == relation.parent_field and self._relate(parent_child):
-                self._relate(parent_child)[relation.child_field] = value
+            if field_name == relation.parent_field:
+                self._reparent(parent_child, relation, value)
+
+    def _reparent(self, parent_child, relation, value):
+        """
+        Resets the parent field of children already there, dropping those not retrieved
+        """
+
+        child = self._children.get(parent_child)
+
+        if child is None:
+            return
+
+        if child._action == "retrieve":
+            self._children[parent_child] = None
+        elif child:
+            child[relation.child_field] = value
 
     def _input(self, record, *args, **kwargs):
         """
@@ -822,17 +957,18 @@ class Model(ModelIdentity):
 
         _defaults = self._extract(kwargs, '_defaults', True)
         _read = self._extract(kwargs, '_read')
+        _only = self._extract(kwargs, '_only')
 
-        record = copy.deepcopy(self._fields)
+        record = self._fields.clone()
         record._action = _action
 
         if _defaults:
             for field in record._order:
-                if field.default is not None:
+                if field.default is not None and (_only is None or field.name in _only):
                     field.value = field.default() if callable(field.default) else field.default
 
         if _read is not None:
-            record.read(_read)
+            record.read(_read, _only)
 
         for field, value in self._related.items():
             record[field] = value
@@ -843,13 +979,13 @@ class Model(ModelIdentity):
 
     def _ensure(self):
         """
-        Makes sure there's records if there's criteria
+        Makes sure there's records, which have to be retrieved explicitly
         """
 
         if self._action == "retrieve":
             if self._record._action == "update":
                 raise ModelError(self, "need to update")
-            self.retrieve()
+            raise ModelError(self, "need to retrieve")
 
     def _each(self, action=None):
         """
@@ -940,12 +1076,7 @@ class Model(ModelIdentity):
 
         else:
 
-            def compare(model1, model2):
-                for sort in sorting:
-                    cmp = (model1[sort[1:]] > model2[sort[1:]]) - (model1[sort[1:]] < model2[sort[1:]])
-                    return cmp if sort[0] == '+' else -cmp
-
-            self._models = sorted(self._models, key=functools.cmp_to_key(compare))
+            self._models = sorted(self._models, key=self._sorter(sorting, lambda model, name: model._record._names[name].value))
 
         return self
 
@@ -968,6 +1099,135 @@ class Model(ModelIdentity):
 
         return self
 
+    def prefetch(self, *names):
+        """
+        Adds relations to retrieve in batches along with the models
+        """
+
+        if self._action != "retrieve":
+            raise ModelError(self, "can only prefetch retrieve")
+
+        for name in names:
+            if name not in self.PARENTS and name not in self.CHILDREN:
+                raise ModelError(self, f"unknown relation {name}")
+
+        self._prefetch = (self._prefetch or []) + list(names)
+
+        return self
+
+    def _project(self, names):
+        """
+        Sets the fields to read, with the id and the fields any injected ones are in
+        """
+
+        names = set(names)
+        names.update(field.inject.split('__')[0] for field in self._fields._order if field.inject and field.name in names)
+
+        self._only = [field.name for field in self._fields._order if field.name in names or field.name == self._id]
+
+    def only(self, *names):
+        """
+        Reads just these fields when retrieving, along with the id
+        """
+
+        if self._action != "retrieve":
+            raise ModelError(self, "can only project retrieve")
+
+        for name in names:
+            if name not in self._fields._names:
+                raise ModelError(self, f"unknown field {name}")
+
+        self._project(names)
+
+        return self
+
+    def defer(self, *names):
+        """
+        Reads all but these fields when retrieving, never the id
+        """
+
+        if self._action != "retrieve":
+            raise ModelError(self, "can only defer retrieve")
+
+        for name in names:
+            if name not in self._fields._names:
+                raise ModelError(self, f"unknown field {name}")
+            if name == self._id:
+                raise ModelError(self, f"cannot defer id {name}")
+
+        only = self._only if self._only is not None else [field.name for field in self._fields._order]
+
+        self._project(name for name in only if name not in names)
+
+        return self
+
+    def _prefetching(self):
+        """
+        Creates a batched retrieve for each prefetched relation, not yet executed
+        """
+
+        queries = []
+
+        for name in self._prefetch or []:
+
+            if name in self.PARENTS:
+                relation = self.PARENTS[name]
+                field, related = relation.child_field, relation.Parent
+                relative = relation.parent_field
+            else:
+                relation = self.CHILDREN[name]
+                field, related = relation.parent_field, relation.Child
+                relative = relation.child_field
+
+            # Deduped in order, as checking a list would be quadratic
+
+            values = dict.fromkeys(model._record[field] for model in self._each())
+            values.pop(None, None)
+
+            if values:
+                queries.append((name, relation, related.many(**{f"{relative}__in": list(values)})))
+
+        return queries
+
+    def _prefetched(self, name, relation, related):
+        """
+        Wires batched retrieved relatives into each model as if retrieved one by one
+        """
+
+        if name in self.PARENTS:
+
+            parents = {}
+
+            for parent in related._models:
+                parent._role = "parent"
+                parent._related = {relation.parent_field: parent._record[relation.parent_field]}
+                parents[parent._record[relation.parent_field]] = parent
+
+            for model in self._each():
+                if model._record[relation.child_field] in parents:
+                    model._parents[name] = parents[model._record[relation.child_field]]
+
+        else:
+
+            children = {}
+
+            for child in related._models:
+                children.setdefault(child._record[relation.child_field], []).append(child)
+
+            for model in self._each():
+
+                value = model._record[relation.parent_field]
+
+                if value is None:
+                    continue
+
+                child = relation.Child(_parent={relation.child_field: value}, _mode=relation.MODE)
+                child._models = children.get(value, [])
+                child._record = None
+                child._action = "update"
+
+                model._children[name] = child
+
     def set(self, *args, **kwargs):
         """
         Sets a single or multiple records or prepares to
@@ -976,9 +1236,8 @@ class Model(ModelIdentity):
         # If we're retrieving, make we're only getting one or we'll store
         if self._action == "retrieve":
             if self._mode == "one":
-                self.retrieve()
-            else:
-                self._record._action = "update"
+                raise ModelError(self, "need to retrieve")
+            self._record._action = "update"
 
         for model in self._each():
             self._input(model._record, *args, **kwargs)
@@ -987,7 +1246,7 @@ class Model(ModelIdentity):
 
     def add(self, *args, **kwargs):
         """
-        Adds records
+        Adds records, leaving bulk inserts to be created explicitly
         """
 
         self._ensure()
@@ -1015,9 +1274,6 @@ class Model(ModelIdentity):
             for _ in range(_count):
                 self._models.append(self.__class__(_action="create", _related=self._related, *args, **kwargs))
 
-            if self._bulk and len(self._models) >= self._size:
-                self.create()
-
         return self
 
     def export(self):
@@ -1042,6 +1298,220 @@ class Model(ModelIdentity):
         """
         return relations.source(cls.SOURCE).define(cls.thy().define(), *args, **kwargs)
 
+    def _cached(self, action, *args):
+        """
+        Gets the source's cache and key for a query by criteria alone, if caching
+        """
+
+        cache = relations.source(self.SOURCE).cache
+
+        if cache is None or self._action != "retrieve" or self._titled is not None:
+            return None, None
+
+        if any(relative is not None for relative in list(self._parents.values()) + list(self._children.values())):
+            return None, None
+
+        return cache, cache.key(self, action, *args)
+
+    def _snapshot(self):
+        """
+        Copies the records retrieved for caching
+        """
+
+        return (
+            self._record.clone() if self._record is not None else None,
+            [each._record.clone() for each in self._models] if self._models is not None else None,
+            self.overflow
+        )
+
+    def _restore(self, snapshot):
+        """
+        Fills in the records retrieved from a cached copy
+        """
+
+        record, records, overflow = snapshot
+
+        self._record = record.clone() if record is not None else None
+
+        if records is not None:
+            self._models = []
+            for each in records:
+                model = self.__class__(_action="update")
+                model._mode = "one"
+                model._only = self._only
+                model._record = each.clone()
+                self._models.append(model)
+
+        self._action = "update"
+        self._sort = None
+        self.overflow = overflow
+
+        return self
+
+    @classmethod
+    def _invalidate(cls):
+        """
+        Removes cached results depending on this model, once changed
+        """
+
+        cache = relations.source(cls.SOURCE).cache
+
+        if cache is not None:
+            cache.invalidate(cls.thy().NAME)
+
+    @classmethod
+    def _batch(cls, rows, names, size):
+        """
+        Gets the next batch of dicts or tuples of values as dicts, checking each field can be inserted
+        """
+
+        thy = cls.thy()
+        batch = []
+
+        for row in itertools.islice(rows, size):
+
+            if not isinstance(row, dict):
+                if len(row) > len(names):
+                    raise ModelError(thy, f"too many values {row}")
+                row = dict(zip(names, row))
+
+            for name in row:
+                if name not in names:
+                    raise ModelError(thy, f"cannot insert field {name}")
+
+            batch.append(row)
+
+        return batch
+
+    @staticmethod
+    def _column(field, batch):
+        """
+        Validates a field's values across a batch, using the default where missing
+        """
+
+        default = field.default() if callable(field.default) else field.default
+
+        column = [default] * len(batch)
+        present = [index for index, row in enumerate(batch) if field.name in row]
+
+        for index, value in zip(present, field.valid_many([batch[index][field.name] for index in present])):
+            column[index] = value
+
+        return column
+
+    @classmethod
+    def _inserts(cls, rows, size=None):
+        """
+        Validates dicts or tuples of values a batch at a time, yielding the storage values
+        """
+
+        thy = cls.thy()
+        record = thy._fields.clone()
+
+        # Tuples fill in fields in order like args, skipping auto fields
+
+        names = [field.name for field in record._order if not field.auto]
+        fields = [field for field in record._order if not field.auto and not field.inject]
+        fields.extend(field for field in record._order if not field.auto and field.inject)
+
+        rows = iter(rows)
+
+        while True:
+
+            batch = cls._batch(rows, names, size or cls.CHUNK)
+
+            if not batch:
+                return
+
+            values = [{} for _ in batch]
+
+            # Validate a column at a time and write each value as the field would
+
+            for field in fields:
+                for stored, value in zip(values, cls._column(field, batch)):
+                    object.__setattr__(field, "value", value)
+                    field.write(stored[record._names[field.inject.split('__')[0]].store] if field.inject else stored)
+
+            yield thy, values
+
+    def query(self, action=None, *args, **kwargs):
+        """
+        get the current query for the model
+        """
+
+        if self._action == "create":
+            return relations.source(self.SOURCE).create_query(self, *args, **kwargs).bind(self)
+
+        if self._action == "retrieve" and action == "count":
+            return relations.source(self.SOURCE).count_query(self, *args, **kwargs).bind(self)
+
+        if self._action == "retrieve" and action == "titles":
+            return relations.source(self.SOURCE).titles_query(self, *args, **kwargs).bind(self)
+
+        if action == "update" or (action is None and self._action == "update"):
+            return relations.source(self.SOURCE).update_query(self, *args, **kwargs).bind(self)
+
+        if action == "delete":
+            return relations.source(self.SOURCE).delete_query(self, *args, **kwargs).bind(self)
+
+        return relations.source(self.SOURCE).retrieve_query(self, *args, **kwargs).bind(self)
+
+
+class Model(BaseModel):
+    """
+    Main model class
+    """
+
+    def __len__(self):
+        """
+        Use for number of records, counting if need be
+        """
+
+        if self._action == "retrieve" and self._mode == "many":
+            return self.count()
+
+        return super().__len__()
+
+    def _reparent(self, parent_child, relation, value):
+        """
+        Resets the parent field of children, retrieving them if need be
+        """
+
+        if self._relate(parent_child):
+            self._relate(parent_child)[relation.child_field] = value
+
+    def _ensure(self):
+        """
+        Makes sure there's records if there's criteria
+        """
+
+        if self._action == "retrieve":
+            if self._record._action == "update":
+                raise ModelError(self, "need to update")
+            self.retrieve()
+
+    def set(self, *args, **kwargs):
+        """
+        Sets a single or multiple records or prepares to
+        """
+
+        if self._action == "retrieve" and self._mode == "one":
+            self.retrieve()
+
+        return super().set(*args, **kwargs)
+
+    def add(self, *args, **kwargs):
+        """
+        Adds records, creating bulk inserts once there's enough
+        """
+
+        super().add(*args, **kwargs)
+
+        if self._bulk and len(self._models) >= self._size:
+            self.create()
+
+        return self
+
     def create(self, *args, **kwargs):
         """
         create the model
@@ -1050,7 +1520,26 @@ class Model(ModelIdentity):
         if self._action not in ["create", "update"]:
             raise ModelError(self, f"cannot create during {self._action}")
 
-        return relations.source(self.SOURCE).create(self, *args, **kwargs)
+        try:
+            return relations.source(self.SOURCE).create(self, *args, **kwargs)
+        finally:
+            self._invalidate()
+
+    @classmethod
+    def insert(cls, rows, size=None):
+        """
+        insert dicts or tuples of values straight to the source, without models
+        """
+
+        inserted = 0
+
+        try:
+            for thy, values in cls._inserts(rows, size):
+                inserted += relations.source(cls.SOURCE).insert(thy, values)
+        finally:
+            cls._invalidate()
+
+        return inserted
 
     def count(self, *args, **kwargs):
         """
@@ -1060,7 +1549,15 @@ class Model(ModelIdentity):
         if self._action not in ["update", "retrieve"]:
             raise ModelError(self, f"cannot count during {self._action}")
 
-        return relations.source(self.SOURCE).count(self, *args, **kwargs)
+        cache, key = self._cached("count", args, kwargs)
+        count = cache.get(key) if cache is not None else None
+
+        if count is None:
+            count = relations.source(self.SOURCE).count(self, *args, **kwargs)
+            if cache is not None:
+                cache.set(key, count, cache.depends(self))
+
+        return count
 
     def retrieve(self, verify=True, *args, **kwargs):
         """
@@ -1070,7 +1567,42 @@ class Model(ModelIdentity):
         if self._action != "retrieve":
             raise ModelError(self, f"cannot retrieve during {self._action}")
 
-        return relations.source(self.SOURCE).retrieve(self, verify, *args, **kwargs)
+        # Models already in the session by id share their record and skip the source
+
+        session = relations.session()
+        identical = session.get(self) if session is not None else None
+
+        if identical is not None:
+            self._record = identical._record
+            self._action = "update"
+            retrieved = identical
+        else:
+            cache, key = self._cached("retrieve", verify, args, kwargs)
+            snapshot = cache.get(key) if cache is not None else None
+            if snapshot is not None:
+                retrieved = self._restore(snapshot)
+            else:
+                retrieved = relations.source(self.SOURCE).retrieve(self, verify, *args, **kwargs)
+                if retrieved is not None and cache is not None:
+                    cache.set(key, retrieved._snapshot(), cache.depends(self))
+            if retrieved is not None and session is not None:
+                session.merge(retrieved)
+
+        if retrieved is not None and self._prefetch:
+            for name, relation, related in self._prefetching():
+                self._prefetched(name, relation, related.retrieve())
+
+        return retrieved
+
+    def iterate(self, chunk=None, *args, **kwargs):
+        """
+        retrieve the models a chunk at a time
+        """
+
+        if self._action != "retrieve" or self._mode != "many":
+            raise ModelError(self, f"cannot iterate during {self._action} {self._mode}")
+
+        return relations.source(self.SOURCE).retrieve_iter(self, chunk or self._chunk, *args, **kwargs)
 
     def titles(self, *args, **kwargs):
         """
@@ -1080,7 +1612,17 @@ class Model(ModelIdentity):
         if self._action not in ["update", "retrieve"]:
             raise ModelError(self, f"cannot titles during {self._action}")
 
-        return relations.source(self.SOURCE).titles(self, *args, **kwargs)
+        cache, key = self._cached("titles", args, kwargs)
+        titles = cache.get(key) if cache is not None else None
+
+        if titles is None:
+            titles = relations.source(self.SOURCE).titles(self, *args, **kwargs)
+            if cache is not None:
+                cache.set(key, copy.deepcopy(titles), cache.names(self))
+        else:
+            titles = copy.deepcopy(titles)
+
+        return titles
 
     def update(self, *args, **kwargs):
         """
@@ -1090,7 +1632,13 @@ class Model(ModelIdentity):
         if self._action not in ["update", "retrieve"]:
             raise ModelError(self, f"cannot update during {self._action}")
 
-        return relations.source(self.SOURCE).update(self, *args, **kwargs)
+        if relations.session() is not None:
+            relations.session().discard(self)
+
+        try:
+            return relations.source(self.SOURCE).update(self, *args, **kwargs)
+        finally:
+            self._invalidate()
 
     def delete(self, *args, **kwargs):
         """
@@ -1103,26 +1651,172 @@ class Model(ModelIdentity):
         if self._action == "retrieve" and self._mode == "one":
             self.retrieve()
 
-        return relations.source(self.SOURCE).delete(self, *args, **kwargs)
+        if relations.session() is not None:
+            relations.session().discard(self)
 
-    def query(self, action=None, *args, **kwargs):
+        try:
+            return relations.source(self.SOURCE).delete(self, *args, **kwargs)
+        finally:
+            self._invalidate()
+
+
+class AsyncModel(BaseModel):
+    """
+    Model whose source queries are all awaited, never run implicitly
+    """
+
+    async def __aiter__(self):
         """
-        get the current query for the model
+        Retrieves if needed and goes through the models
         """
 
-        if self._action == "create":
-            return relations.source(self.SOURCE).create_query(self, *args, **kwargs).bind(self)
+        if self._action == "retrieve":
+            await self.retrieve()
 
-        if self._action == "retrieve" and action == "count":
-            return relations.source(self.SOURCE).count_query(self, *args, **kwargs).bind(self)
+        for model in self:
+            yield model
 
-        if self._action == "retrieve" and action == "titles":
-            return relations.source(self.SOURCE).titles_query(self, *args, **kwargs).bind(self)
+    async def create(self, *args, **kwargs):
+        """
+        create the model
+        """
 
-        if action == "update" or (action is None and self._action == "update"):
-            return relations.source(self.SOURCE).update_query(self, *args, **kwargs).bind(self)
+        if self._action not in ["create", "update"]:
+            raise ModelError(self, f"cannot create during {self._action}")
 
-        if action == "delete":
-            return relations.source(self.SOURCE).delete_query(self, *args, **kwargs).bind(self)
+        try:
+            return await relations.source(self.SOURCE).create(self, *args, **kwargs)
+        finally:
+            self._invalidate()
 
-        return relations.source(self.SOURCE).retrieve_query(self, *args, **kwargs).bind(self)
+    @classmethod
+    async def insert(cls, rows, size=None):
+        """
+        insert dicts or tuples of values straight to the source, without models
+        """
+
+        inserted = 0
+
+        try:
+            for thy, values in cls._inserts(rows, size):
+                inserted += await relations.source(cls.SOURCE).insert(thy, values)
+        finally:
+            cls._invalidate()
+
+        return inserted
+
+    async def count(self, *args, **kwargs):
+        """
+        count the models
+        """
+
+        if self._action not in ["update", "retrieve"]:
+            raise ModelError(self, f"cannot count during {self._action}")
+
+        cache, key = self._cached("count", args, kwargs)
+        count = cache.get(key) if cache is not None else None
+
+        if count is None:
+            count = await relations.source(self.SOURCE).count(self, *args, **kwargs)
+            if cache is not None:
+                cache.set(key, count, cache.depends(self))
+
+        return count
+
+    async def retrieve(self, verify=True, *args, **kwargs):
+        """
+        retrieve the model
+        """
+
+        if self._action != "retrieve":
+            raise ModelError(self, f"cannot retrieve during {self._action}")
+
+        session = relations.session()
+        identical = session.get(self) if session is not None else None
+
+        if identical is not None:
+            self._record = identical._record
+            self._action = "update"
+            retrieved = identical
+        else:
+            cache, key = self._cached("retrieve", verify, args, kwargs)
+            snapshot = cache.get(key) if cache is not None else None
+            if snapshot is not None:
+                retrieved = self._restore(snapshot)
+            else:
+                retrieved = await relations.source(self.SOURCE).retrieve(self, verify, *args, **kwargs)
+                if retrieved is not None and cache is not None:
+                    cache.set(key, retrieved._snapshot(), cache.depends(self))
+            if retrieved is not None and session is not None:
+                session.merge(retrieved)
+
+        if retrieved is not None and self._prefetch:
+            for name, relation, related in self._prefetching():
+                self._prefetched(name, relation, await related.retrieve())
+
+        return retrieved
+
+    def iterate(self, chunk=None, *args, **kwargs):
+        """
+        retrieve the models a chunk at a time, as an async iterator
+        """
+
+        if self._action != "retrieve" or self._mode != "many":
+            raise ModelError(self, f"cannot iterate during {self._action} {self._mode}")
+
+        return relations.source(self.SOURCE).retrieve_iter(self, chunk or self._chunk, *args, **kwargs)
+
+    async def titles(self, *args, **kwargs):
+        """
+        retrieve the model
+        """
+
+        if self._action not in ["update", "retrieve"]:
+            raise ModelError(self, f"cannot titles during {self._action}")
+
+        cache, key = self._cached("titles", args, kwargs)
+        titles = cache.get(key) if cache is not None else None
+
+        if titles is None:
+            titles = await relations.source(self.SOURCE).titles(self, *args, **kwargs)
+            if cache is not None:
+                cache.set(key, copy.deepcopy(titles), cache.names(self))
+        else:
+            titles = copy.deepcopy(titles)
+
+        return titles
+
+    async def update(self, *args, **kwargs):
+        """
+        update the model
+        """
+
+        if self._action not in ["update", "retrieve"]:
+            raise ModelError(self, f"cannot update during {self._action}")
+
+        if relations.session() is not None:
+            relations.session().discard(self)
+
+        try:
+            return await relations.source(self.SOURCE).update(self, *args, **kwargs)
+        finally:
+            self._invalidate()
+
+    async def delete(self, *args, **kwargs):
+        """
+        delete the model
+        """
+
+        if self._action not in ["update", "retrieve"]:
+            raise ModelError(self, f"cannot delete during {self._action}")
+
+        if self._action == "retrieve" and self._mode == "one":
+            await self.retrieve()
+
+        if relations.session() is not None:
+            relations.session().discard(self)
+
+        try:
+            return await relations.source(self.SOURCE).delete(self, *args, **kwargs)
+        finally:
+            self._invalidate()
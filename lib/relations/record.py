@@ -24,6 +24,8 @@ class Record:
     _order = None  # Access in order
     _names = None  # Access by name
     _action = None # What to do with this record
+    _retrieve = None # Compiled criteria
+    _only = None   # Fields read, None for all
 
     def __init__(self):
         """
@@ -160,11 +162,27 @@ class Record:
 
         return [field.define() for field in self._order]
 
+    def clone(self):
+        """
+        Creates a record of cloned fields, sharing their definitions
+        """
+
+        record = object.__new__(self.__class__)
+        record.__dict__.update(self.__dict__)
+
+        record.__dict__["_order"] = [field.clone() for field in self._order]
+        record.__dict__["_names"] = {field.name: field for field in record._order}
+        record.__dict__.pop("_retrieve", None)
+
+        return record
+
     def filter(self, criterion, value):
         """
         Sets criterion on a field
         """
 
+        self._retrieve = None
+
         if isinstance(criterion, int):
             if criterion < len(self._order):
                 return self._order[criterion].filter(value)
@@ -203,16 +221,36 @@ class Record:
 
         return values
 
+    def compile(self):
+        """
+        Compiles all field criteria into a single check, reused until criteria change
+        """
+
+        if self._retrieve is None:
+
+            retrieves = [field.compile() for field in self._order if field.criteria]
+
+            def retrieve(values):
+                """
+                Sees if values satisfy all the compiled criteria
+                """
+
+                for satisfies in retrieves:
+                    if not satisfies(values):
+                        return False
+
+                return True
+
+            self._retrieve = retrieve
+
+        return self._retrieve
+
     def retrieve(self, values):
         """
         Sees if a record satisfies criteria in a dict
         """
 
-        for field in self._order:
-            if not field.retrieve(values):
-                return False
-
-        return True
+        return self.compile()(values)
 
     def like(self, values, titles, like, parents):
         """
@@ -226,12 +264,16 @@ class Record:
 
         return False
 
-    def read(self, values):
+    def read(self, values, only=None):
         """
-        Loads the value from storage
+        Loads the value from storage, just for the fields in only if sent
         """
 
+        self._only = only
+
         for field in self._order:
+            if only is not None and field.name not in only:
+                continue
             if field.inject:
                 field.read(values[self._names[field.inject.split('__')[0]].store])
             else:
@@ -244,7 +286,14 @@ class Record:
 
         inject = []
 
-        for field in self._order:
+        # Fields never read are left alone unless set since
+
+        fields = [
+            field for field in self._order
+            if self._only is None or field.name in self._only or field.dirty or field.refresh
+        ]
+
+        for field in fields:
             if field.inject:
                 inject.append(field)
             else:
@@ -0,0 +1,108 @@
+"""
+Relations Module for handling sessions
+"""
+
+import contextvars
+
+SESSION = contextvars.ContextVar("relations.session", default=None) # Session for the current context
+
+class Session:
+    """
+    Identity map of retrieved models, used within a with block
+    """
+
+    models = None # Models by NAME and id
+    tokens = None # Tokens to restore the enclosing sessions
+
+    def __init__(self):
+
+        self.models = {}
+        self.tokens = []
+
+    def __enter__(self):
+
+        self.tokens.append(SESSION.set(self))
+
+        return self
+
+    def __exit__(self, *args):
+
+        SESSION.reset(self.tokens.pop())
+
+    @staticmethod
+    def key(model):
+        """
+        Gets the key for a model by NAME and id
+        """
+
+        return (model.NAME, model._record[model._id])
+
+    @staticmethod
+    def identity(model):
+        """
+        Gets the id a one retrieve is for, if by id alone
+        """
+
+        if model._mode != "one" or model._id is None or model._like is not None or model._parents or model._children:
+            return None
+
+        criteria = [field for field in model._record._order if field.criteria]
+
+        if len(criteria) != 1 or criteria[0].name != model._id or list(criteria[0].criteria) != ["eq"]:
+            return None
+
+        return criteria[0].criteria["eq"]
+
+    def get(self, model):
+        """
+        Gets the model a one retrieve by id alone is for, if already retrieved
+        """
+
+        id = self.identity(model)
+
+        if id is None:
+            return None
+
+        return self.models.get((model.NAME, id))
+
+    def add(self, model):
+        """
+        Adds a model if new, returning the model already there if not, never one with only some fields read
+        """
+
+        if model._id is None or model._record[model._id] is None or model._only is not None:
+            return model
+
+        return self.models.setdefault(self.key(model), model)
+
+    def merge(self, model):
+        """
+        Swaps retrieved models for those already in the session, adding the rest
+        """
+
+        if model._record is not None:
+            model._record = self.add(model)._record
+
+        if model._models:
+            model._models = [self.add(each) for each in model._models]
+
+    def discard(self, model):
+        """
+        Removes the models being updated or deleted, all for the NAME if by criteria
+        """
+
+        if model._action == "retrieve":
+            for key in [key for key in self.models if key[0] == model.NAME]:
+                del self.models[key]
+            return
+
+        for each in model._each():
+            if each._id is not None:
+                self.models.pop(self.key(each), None)
+
+    def clear(self):
+        """
+        Removes all models
+        """
+
+        self.models = {}
@@ -4,16 +4,79 @@ relations module for storing sources
 
 # pylint: disable=too-many-public-methods
 
+import time
+import inspect
+import functools
+import contextlib
+import contextvars
+
 import relations
 
-class Source:
+INSTRUMENTING = contextvars.ContextVar("relations.instrumenting", default=frozenset()) # Queries being instrumented
+
+def instrumented(action, function):
     """
-    Base Abstraction for Source
+    Wraps a source action so its hooks hear about it
+    """
+
+    if inspect.iscoroutinefunction(function):
+
+        @functools.wraps(function)
+        async def awrapper(self, model, *args, **kwargs):
+            """
+            Wrapper for instrumenting an awaited action
+            """
+
+            if not self.hooks:
+                return await function(self, model, *args, **kwargs)
+
+            with self.instrument(action, model) as event:
+                result = event["result"] = await function(self, model, *args, **kwargs)
+
+            return result
+
+        return awrapper
+
+    @functools.wraps(function)
+    def wrapper(self, model, *args, **kwargs):
+        """
+        Wrapper for instrumenting an action
+        """
+
+        if not self.hooks:
+            return function(self, model, *args, **kwargs)
+
+        with self.instrument(action, model) as event:
+            result = event["result"] = function(self, model, *args, **kwargs)
+
+        return result
+
+    return wrapper
+
+class BaseSource:
+    """
+    Base Abstraction for Source, everything but the queries themselves
     """
 
     name = None
     KIND = None
 
+    cache = None # Cache of results by criteria, if any
+    hooks = None # Callables told before and after each action
+
+    ACTIONS = ["create", "insert", "count", "retrieve", "titles", "update", "delete", "execute"] # Actions hooks hear about
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        Instruments the actions a source defines
+        """
+
+        super().__init_subclass__(**kwargs)
+
+        for action in cls.ACTIONS:
+            if action in cls.__dict__:
+                setattr(cls, action, instrumented(action, cls.__dict__[action]))
+
     def __new__(cls, *args, **kwargs):
         """
         Register this source
@@ -39,6 +102,108 @@ class Source:
 
         setattr(item, attribute, default)
 
+    def hook(self, callback):
+        """
+        Adds a callable to tell about actions
+        """
+
+        self.hooks = (self.hooks or []) + [callback]
+
+    def unhook(self, callback):
+        """
+        Removes a callable told about actions
+        """
+
+        self.hooks = [hook for hook in self.hooks or [] if hook is not callback] or None
+
+    def notify(self, event):
+        """
+        Tells the hooks about an action
+        """
+
+        for hook in self.hooks or []:
+            hook(event)
+
+    @staticmethod
+    def shape(model):
+        """
+        Gets the shape of a query, the criteria used without their values
+        """
+
+        record = getattr(model, "_record", None)
+
+        if record is None:
+            return None
+
+        return {
+            "criteria": {field.name: sorted(field.criteria) for field in record._order if field.criteria},
+            "like": model._like is not None,
+            "limit": model._limit is not None
+        }
+
+    @staticmethod
+    def rows(action, model, result):
+        """
+        Gets how many rows an action went through
+        """
+
+        if action in ["count", "insert", "update", "delete"]:
+            return result
+
+        if action == "titles":
+            return len(result)
+
+        if action == "retrieve":
+            return len(model._each()) if result is not None else 0
+
+        return None
+
+    @contextlib.contextmanager
+    def instrument(self, action, model):
+        """
+        Tells the hooks before and after an action, with its rows and seconds
+        """
+
+        key = (id(self), action, id(model))
+        instrumenting = INSTRUMENTING.get()
+
+        # Actions calling the same action on the same model are only told once
+
+        if not self.hooks or key in instrumenting:
+            yield {}
+            return
+
+        event = {
+            "source": self.name,
+            "stage": "before",
+            "model": getattr(model, "NAME", None),
+            "instance": model,
+            "action": action,
+            "shape": self.shape(model),
+            "rows": len(model._each("create")) if action == "create" else None,
+            "seconds": None,
+            "error": None
+        }
+
+        self.notify(dict(event))
+
+        token = INSTRUMENTING.set(instrumenting | {key})
+        start = time.perf_counter()
+
+        try:
+            yield event
+        except Exception as exception:
+            event["error"] = exception
+            raise
+        finally:
+            INSTRUMENTING.reset(token)
+            event["seconds"] = time.perf_counter() - start
+            event["stage"] = "after"
+            result = event.pop("result", None)
+            if event["error"] is None and action != "create":
+                event["rows"] = self.rows(action, model, result)
+            self.notify(event)
+
     def field_init(self, field):
         """
         init the field
@@ -57,6 +222,11 @@ class Source:
         """
         self.record_init(model._fields)
 
+    def instance_init(self, model):
+        """
+        init each instance of the model, cheaply as init is shared
+        """
+
     def field_define(self, field, *args, **kwargs):
         """
         define the field
@@ -136,11 +306,6 @@ class Source:
         Create query
         """
 
-    def create(self, model, *args, **kwargs):
-        """
-        create the model
-        """
-
     def retrieve_field(self, field, *args, **kwargs):
         """
         retrieve the field
@@ -158,31 +323,16 @@ class Source:
         Count query
         """
 
-    def count(self, model, *args, **kwargs):
-        """
-        retrieve the model
-        """
-
     def retrieve_query(self, model, *args, **kwargs):
         """
         retrieve query
         """
 
-    def retrieve(self, model, verify=True, *args, **kwargs):
-        """
-        retrieve the model
-        """
-
     def titles_query(self, model, *args, **kwargs):
         """
         titles query
         """
 
-    def titles(self, model, *args, **kwargs):
-        """
-        titles of the model
-        """
-
     def update_field(self, field, *args, **kwargs):
         """
         update the field
@@ -212,11 +362,6 @@ class Source:
         update query
         """
 
-    def update(self, model, *args, **kwargs):
-        """
-        update the model
-        """
-
     def delete_field(self, field, *args, **kwargs):
         """
         delete the field
@@ -234,9 +379,19 @@ class Source:
         delete query
         """
 
-    def delete(self, model, *args, **kwargs):
+    def begin(self):
         """
-        delete the model
+        begin a transaction, returning a savepoint if already in one
+        """
+
+    def commit(self, savepoint=None):
+        """
+        commit a transaction, or release a savepoint
+        """
+
+    def rollback(self, savepoint=None):
+        """
+        rollback a transaction, or to a savepoint
         """
 
     def definition(self, file_path, source_path):
@@ -249,14 +404,60 @@ class Source:
         Concvert a general migration file to a source specific file
         """
 
-    def execute(self, commands):
+    def list(self, source_path):
         """
-        Execute a command or commands
+        List the migration pairs in reverse order fro verification
         """
 
-    def list(self, source_path):
+
+class Source(BaseSource):
+    """
+    Base Abstraction for Source
+    """
+
+    def create(self, model, *args, **kwargs):
         """
-        List the migration pairs in reverse order fro verification
+        create the model
+        """
+
+    def insert(self, model, values, *args, **kwargs):
+        """
+        insert storage values for the model
+        """
+
+    def count(self, model, *args, **kwargs):
+        """
+        retrieve the model
+        """
+
+    def retrieve(self, model, verify=True, *args, **kwargs):
+        """
+        retrieve the model
+        """
+
+    def retrieve_iter(self, model, chunk, *args, **kwargs):
+        """
+        retrieve the models a chunk at a time
+        """
+
+    def titles(self, model, *args, **kwargs):
+        """
+        titles of the model
+        """
+
+    def update(self, model, *args, **kwargs):
+        """
+        update the model
+        """
+
+    def delete(self, model, *args, **kwargs):
+        """
+        delete the model
+        """
+
+    def execute(self, commands):
+        """
+        Execute a command or commands
         """
 
     def load(self, file_path):
@@ -268,3 +469,64 @@ class Source:
         """
         Execute a command or commands
         """
+
+
+class AsyncSource(BaseSource):
+    """
+    Base Abstraction for Source with awaited queries
+    """
+
+    async def create(self, model, *args, **kwargs):
+        """
+        create the model
+        """
+
+    async def insert(self, model, values, *args, **kwargs):
+        """
+        insert storage values for the model
+        """
+
+    async def count(self, model, *args, **kwargs):
+        """
+        retrieve the model
+        """
+
+    async def retrieve(self, model, verify=True, *args, **kwargs):
+        """
+        retrieve the model
+        """
+
+    def retrieve_iter(self, model, chunk, *args, **kwargs):
+        """
+        retrieve the models a chunk at a time, as an async iterator
+        """
+
+    async def titles(self, model, *args, **kwargs):
+        """
+        titles of the model
+        """
+
+    async def update(self, model, *args, **kwargs):
+        """
+        update the model
+        """
+
+    async def delete(self, model, *args, **kwargs):
+        """
+        delete the model
+        """
+
+    async def execute(self, commands):
+        """
+        Execute a command or commands
+        """
+
+    async def load(self, file_path):
+        """
+        Load a file into the database
+        """
+
+    async def migrate(self, source_path):
+        """
+        Execute a command or commands
+        """
@@ -12,60 +12,124 @@ class Titles:
     id = None
     fields = None
 
-    ids = None
     titles = None
     format = None
     parents = None
+    absent = None # Parent ids looked up without finding titles
 
     def __init__(self, model):
 
         self.id = model._id
         self.fields = model._titles
 
-        self.ids = []
         self.titles = {}
         self.format = []
         self.parents = {}
+        self.absent = set()
+
+        # Parent titles resolved so far, shared with the parents' own titles
+
+        titled = model._titled if model._titled is not None else {}
+
+        for (Parent, parent_field), ids in self.missing(model, titled).items():
+            self.resolve(titled, (Parent, parent_field), ids, Parent.many(_titled=titled, **{f"{parent_field}__in": ids}).titles())
 
         for field in self.fields:
             relation = model._ancestor(field)
             if relation is not None:
-                self.parents[field] = relation.Parent.many(**{f"{relation.parent_field}__in": model[field]}).titles()
+                self.parents[field] = titled[(relation.Parent, relation.parent_field)]
                 self.format.extend(self.parents[field].format)
             elif field in model._fields._names and model._fields._names[field].format is not None:
                 self.format.extend(model._fields._names[field].format)
             else:
                 self.format.append(None)
 
+    @staticmethod
+    def missing(model, titled):
+        """
+        Gets the parent ids not yet looked up in titled, keyed by parent and field
+        """
+
+        # Deduped in order as dicts, as checking lists would be quadratic
+
+        relatives = {}
+
+        for field in model._titles:
+            relation = model._ancestor(field)
+            if relation is not None:
+                model._ensure()
+                ids = relatives.setdefault((relation.Parent, relation.parent_field), {})
+                ids.update(dict.fromkeys(each._record[field] for each in model._each()))
+                ids.pop(None, None)
+
+        missing = {}
+
+        for relative, ids in relatives.items():
+            if relative not in titled:
+                missing[relative] = list(ids)
+                continue
+            ids = [id for id in ids if id not in titled[relative] and id not in titled[relative].absent]
+            if ids:
+                missing[relative] = ids
+
+        return missing
+
+    @staticmethod
+    def resolve(titled, relative, ids, resolved):
+        """
+        Adds resolved parent titles into titled, noting the ids looked up that weren't found
+        """
+
+        if relative not in titled:
+            titled[relative] = resolved
+        else:
+            for id in resolved:
+                titled[relative][id] = resolved[id]
+
+        titled[relative].absent.update(id for id in ids if id not in resolved)
+
+    @property
+    def ids(self):
+        """
+        Ids in the order added
+        """
+
+        return list(self.titles)
+
+    @ids.setter
+    def ids(self, ids):
+        """
+        Reorders titles by ids
+        """
+
+        self.titles = {id: self.titles.get(id) for id in ids}
+
     def __len__(self):
         """
         Use for number titles
         """
 
-        return len(self.ids)
+        return len(self.titles)
 
     def __contains__(self, id):
         """
         Use whether in ids
         """
 
-        return id in self.ids
+        return id in self.titles
 
     def __iter__(self):
         """
         Use the order of ids
         """
 
-        return iter(self.ids)
+        return iter(self.titles)
 
     def __setitem__(self, id, value):
         """
         Set by id
         """
 
-        if id not in self.ids:
-            self.ids.append(id)
-
         self.titles[id] = value
 
     def __getitem__(self, id):
@@ -80,8 +144,6 @@ class Titles:
         Delete by id
         """
 
-        self.ids.pop(self.ids.index(id))
-
         del self.titles[id]
 
     def add(self, model): # pylint: disable=too-many-branches
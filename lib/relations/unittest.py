@@ -6,11 +6,24 @@ Unittest Tools for Relations
 
 import glob
 import copy
+import asyncio
+import contextvars
 import json
+import heapq
+import bisect
+import itertools
+import functools
+import contextlib
+import collections.abc
 import unittest
 import overscore
 import relations
 
+try:
+    import numpy
+except ImportError: # pragma: no cover
+    numpy = None
+
 
 class MockQuery: # pylint: disable=too-few-public-methods
     """
@@ -18,11 +31,13 @@ class MockQuery: # pylint: disable=too-few-public-methods
     """
 
     action = None
+    fields = None # Fields selected, None for all
     model = None
 
-    def __init__(self, action):
+    def __init__(self, action, fields=None):
 
         self.action = action
+        self.fields = fields
 
     def bind(self, model):
         """
@@ -33,10 +48,95 @@ class MockQuery: # pylint: disable=too-few-public-methods
 
         return self
 
-class MockSource(relations.Source):
+class ColumnTable(collections.abc.MutableMapping):
+    """
+    Rows by id stored as a list per key, with offsets by id and deleted rows left as tombstones
+    """
+
+    MISSING = object() # Marks a key a row lacks
+
+    columns = None # Values by key, one per row offset
+    offsets = None # Row offsets by id, in the order added
+    rows = None    # Row offsets used, deleted included
+
+    def __init__(self, rows=None):
+
+        self.columns = {}
+        self.offsets = {}
+        self.rows = 0
+
+        for id, values in (rows or {}).items():
+            self[id] = values
+
+    def __getitem__(self, id):
+
+        offset = self.offsets[id]
+
+        return {key: column[offset] for key, column in self.columns.items() if column[offset] is not self.MISSING}
+
+    def __setitem__(self, id, values):
+
+        offset = self.offsets.get(id)
+
+        if offset is None:
+
+            offset = self.offsets[id] = self.rows
+            self.rows += 1
+
+            for column in self.columns.values():
+                column.append(self.MISSING)
+
+        for key in values:
+            if key not in self.columns:
+                self.columns[key] = [self.MISSING] * self.rows
+
+        for key, column in self.columns.items():
+            column[offset] = values.get(key, self.MISSING)
+
+    def __delitem__(self, id):
+
+        offset = self.offsets.pop(id)
+
+        for column in self.columns.values():
+            column[offset] = self.MISSING
+
+        # Compact once tombstones are the majority
+
+        if len(self.offsets) * 2 < self.rows:
+            self.compact()
+
+    def __iter__(self):
+
+        return iter(self.offsets)
+
+    def __len__(self):
+
+        return len(self.offsets)
+
+    def __contains__(self, id):
+
+        return id in self.offsets
+
+    def compact(self):
+        """
+        Drops the tombstones of deleted rows, keeping the order
+        """
+
+        offsets = list(self.offsets.values())
+
+        self.columns = {key: [column[offset] for offset in offsets] for key, column in self.columns.items()}
+        self.columns = {
+            key: column for key, column in self.columns.items()
+            if any(value is not self.MISSING for value in column)
+        }
+
+        self.offsets = {id: offset for offset, id in enumerate(self.offsets)}
+        self.rows = len(self.offsets)
+
+class BaseMockSource(relations.BaseSource):
 
     """
-    Mock Source for Testing
+    Mock Source for Testing, storage shared by the sync and async variants
     """
 
     KIND = "mock"
@@ -46,18 +146,31 @@ class MockSource(relations.Source):
     UPDATE = MockQuery
     DELETE = MockQuery
 
+    COLUMNAR = ["null", "eq", "in", "gt", "gte", "lt", "lte"] # Operators scanned by column
+
     ids = None  # ID's keyed by model names
     data = None # Data keyed by model names
     unique = None # Unqiues keyed by model names
+    owners = None # Ids owning unique values keyed by model names
+    indexes = None # Unique and regular indexes keyed by model names, built as needed
+    likes = None # Trigram indexes of titles for like keyed by model names, built as needed
+    trigrams = False # Whether to narrow like searches with trigram indexes
+    columns = None # Numeric columns with null masks keyed by model names, built as needed
+    columnar = False # Whether to scan numeric criteria by column, if NumPy is installed
+    layout = "rows" # How to store data, "rows" of dicts or "columns" in a ColumnTable
     migrations = None # Migrations applied so far
 
-    transaction = None # Whether there's a current transaction for rollbacks
+    transaction = None # Undo log of the current transaction for rollbacks
 
     def __init__(self, name, **kwargs):
 
         self.ids = {}
         self.data = {}
         self.unique = {}
+        self.owners = {}
+        self.indexes = {}
+        self.likes = {}
+        self.columns = {}
         self.migrations = None
 
     def init(self, model):
@@ -67,19 +180,28 @@ class MockSource(relations.Source):
 
         self.record_init(model._fields)
 
+        self.instance_init(model)
+
+        if model._id is not None and model._fields._names[model._id].auto is None:
+            model._fields._names[model._id].auto = True
+
+    def instance_init(self, model):
+        """
+        Init each instance, making sure there's storage in case it's been removed since
+        """
+
         # Even models without ids will have id's internally
         # They just won't be set in the model
 
         self.ids.setdefault(model.NAME, 0)
-        self.data.setdefault(model.NAME, {})
         self.unique.setdefault(model.NAME, {})
 
+        if model.NAME not in self.data:
+            self.data[model.NAME] = self.table()
+
         for unique in model._unique:
             self.unique[model.NAME].setdefault(unique, {})
 
-        if model._id is not None and model._fields._names[model._id].auto is None:
-            model._fields._names[model._id].auto = True
-
     def field_define(self, field, definitions):
         """
         define the field
@@ -147,6 +269,16 @@ class MockSource(relations.Source):
 
         return [{"ACTION": "change", "DEFINITION": definition, "MIGRATION": {**migration, "fields": migrations}}]
 
+    def table(self):
+        """
+        Creates storage for a model's data in the source's layout
+        """
+
+        if self.layout == "columns":
+            return ColumnTable()
+
+        return {}
+
     @staticmethod
     def extract(model, values):
         """
@@ -164,36 +296,63 @@ class MockSource(relations.Source):
         Exception for vilating unique constraints
         """
 
-    def rollback(func): # pylint: disable=no-self-argument
+    def begin(self):
         """
-        Decorator for rolling back a bad transaction
+        Starts a transaction, returning a savepoint if already in one
         """
 
-        def wrapper(self, *args, **kwargs):
-            """
-            Wrapper for rolling back a bad transaction
-            """
+        if self.transaction is None:
+            self.transaction = []
+            return None
+
+        return len(self.transaction)
 
-            if self.transaction is None:
+    def commit(self, savepoint=None):
+        """
+        Ends a transaction, keeping the changes, or releases a savepoint
+        """
 
-                self.transaction = (self.ids, self.data, self.unique)
+        if savepoint is None:
+            self.transaction = None
 
-                try:
+    def rollback(self, savepoint=None):
+        """
+        Undoes changes back to the start of a transaction, or to a savepoint
+        """
+
+        journal, self.transaction = self.transaction or [], None
 
-                    result = func(self, *args, **kwargs)
+        while len(journal) > (savepoint or 0):
+            journal.pop()()
 
-                except self.UniqueError as exception:
+        if savepoint is not None:
+            self.transaction = journal
 
-                    (self.ids, self.data, self.unique) = self.transaction
-                    self.transaction = None
-                    raise exception
+    def journal(self, values, key):
+        """
+        Records how to undo changing a key if in a transaction
+        """
 
-                self.transaction = None
-                return result
+        if self.transaction is None:
+            return
 
-            return func(self, *args, **kwargs)
+        if key in values:
+            previous = values[key]
+            self.transaction.append(lambda: values.__setitem__(key, previous))
+        else:
+            self.transaction.append(lambda: values.pop(key, None))
 
-        return wrapper
+    def unique_owners(self, model, unique):
+        """
+        Gets the ids by value for a unique index, building if needed
+        """
+
+        owners = self.owners.setdefault(model.NAME, {})
+
+        if unique not in owners:
+            owners[unique] = {value: id for id, value in self.unique[model.NAME][unique].items()}
+
+        return owners[unique]
 
     def uniques(self, model, values, id):
         """
@@ -201,388 +360,1177 @@ class MockSource(relations.Source):
         """
 
         for unique, fields in model._unique.items():
+
             value = json.dumps({field: overscore.get(values, field) for field in fields}, sort_keys=True)
-            for key, exists in self.unique[model.NAME][unique].items():
-                if value == exists and id != key:
-                    raise self.UniqueError(model, f"value {value} violates unique {unique}")
+            owners = self.unique_owners(model, unique)
+
+            if owners.get(value, id) != id:
+                raise self.UniqueError(model, f"value {value} violates unique {unique}")
+
+            previous = self.unique[model.NAME][unique].get(id)
+
+            if previous is not None and previous != value and owners.get(previous) == id:
+                self.journal(owners, previous)
+                del owners[previous]
+
+            self.journal(self.unique[model.NAME][unique], id)
             self.unique[model.NAME][unique][id] = value
+            self.journal(owners, value)
+            owners[value] = id
 
-    def create_query(self, model):
+    @staticmethod
+    def copied(values):
         """
-        create query
+        Copies stored values for a model to read, so changing a dict or list in place leaves the store alone
         """
 
-        return self.INSERT("CREATE")
+        return {key: copy.deepcopy(value) if isinstance(value, (dict, list)) else value for key, value in values.items()}
 
-    @rollback
-    def create(self, model):
+    @staticmethod
+    def index_key(key):
         """
-        Executes the create
+        Makes an index key hashable
         """
 
-        for creating in model._each("create"):
+        try:
+            hash(key)
+            return key
+        except TypeError:
+            return json.dumps(key, sort_keys=True, default=str)
 
-            values = creating._record.create({})
+    def model_indexes(self, model):
+        """
+        Gets the indexes for a model, building them if needed
+        """
 
-            self.ids[model.NAME] += 1
+        if model.NAME in self.indexes:
+            return self.indexes[model.NAME]
 
-            self.uniques(model, values, self.ids[model.NAME])
+        indexes = {}
 
-            if model._id is not None and values.get(model._id) is None:
-                values[model._fields._names[model._id].store] = self.ids[model.NAME]
-                creating[model._id] = self.ids[model.NAME]
+        for name, fields in {**model._index, **model._unique}.items():
 
-            self.data[model.NAME][self.ids[model.NAME]] = self.extract(creating, values)
+            specs = []
 
-            if not model._bulk:
+            for field in fields:
+                pieces = field.split('__', 1)
+                spec = model._fields._names[pieces[0]]
+                specs.append((spec.store, pieces[1] if len(pieces) > 1 else None, spec.kind))
 
-                for parent_child in creating.CHILDREN:
-                    if creating._children.get(parent_child):
-                        creating._children[parent_child].create()
+            # Hash only where stored values compare the same as criteria
 
-                creating._action = "update"
-                creating._record._action = "update"
+            if not all(
+                (path is None and kind in [bool, int, float, str]) or (path is not None and kind != set)
+                for _, path, kind in specs
+            ):
+                continue
 
-        if model._bulk:
-            model._models = []
-        else:
-            model._action = "update"
+            index = {
+                "fields": [field.split('__', 1) for field in fields],
+                "specs": specs,
+                "hash": {},
+                "sorted": None
+            }
 
-        return model
+            # Sort single numbers for ranges and single strings (lowered) for starts
+
+            if len(specs) == 1 and specs[0][1] is None and specs[0][2] in [int, float, str]:
+                index["sorted"] = []
 
-    def model_like(self, model):
+            indexes[name] = index
+
+        self.indexes[model.NAME] = indexes
+
+        for id, values in self.data[model.NAME].items():
+            self.index_add(model, id, values)
+
+        return indexes
+
+    def index_add(self, model, id, values):
         """
-        Gets the like matching records
+        Adds stored values to a model's indexes
         """
 
-        parents = {}
+        for index in self.model_indexes(model).values():
 
-        for field in model._titles:
-            relation = model._ancestor(field)
-            if relation:
-                parent = relation.Parent.many(like=model._like).limit(model._chunk)
-                parents[model._fields._names[field].store] = parent[relation.parent_field]
-                model.overflow = model.overflow or parent.overflow
+            key = tuple(
+                overscore.get(values.get(store), path) if path else values.get(store)
+                for store, path, _ in index["specs"]
+            )
 
-        likes = []
+            index["hash"].setdefault(self.index_key(key), set()).add(id)
 
-        for record in self.data[model.NAME].values():
-            if model._record.like(record, model._titles, model._like, parents):
-                likes.append(record)
+            if index["sorted"] is not None and key[0] is not None:
+                bisect.insort(index["sorted"], (key[0].lower() if index["specs"][0][2] == str else key[0], id))
 
-        return likes
+    def index_remove(self, model, id, values):
+        """
+        Removes stored values from a model's indexes
+        """
 
-    @staticmethod
-    def model_sort(model):
+        for index in self.model_indexes(model).values():
+
+            key = tuple(
+                overscore.get(values.get(store), path) if path else values.get(store)
+                for store, path, _ in index["specs"]
+            )
+
+            hashed = self.index_key(key)
+            index["hash"][hashed].discard(id)
+
+            if not index["hash"][hashed]:
+                del index["hash"][hashed]
+
+            if index["sorted"] is not None and key[0] is not None:
+                entry = (key[0].lower() if index["specs"][0][2] == str else key[0], id)
+                del index["sorted"][bisect.bisect_left(index["sorted"], entry)]
+
+    def index_change(self, model, id, before, after):
         """
-        Sorts the resuls
+        Moves a row in a model's indexes from before to after values, either None if absent
         """
 
-        sort = model._sort or model._order
+        self.columns.pop(model.NAME, None)
+
+        if before is not None:
+            self.index_remove(model, id, before)
+            self.like_remove(model, id, before)
+
+        if after is not None:
+            self.index_add(model, id, after)
+            self.like_add(model, id, after)
 
-        if sort:
-            model.sort(*sort)._sort = None
+        if self.transaction is not None:
+            self.transaction.append(lambda: self.index_change(model, id, before=after, after=before))
 
     @staticmethod
-    def model_limit(model):
+    def like_grams(text):
         """
-        Limits the results
+        Gets all the pieces of text up to three long
         """
 
-        if model._limit is None:
-            return
-
-        model._models = model._models[model._offset:model._offset + model._limit]
-        model.overflow = model.overflow or len(model._models) >= model._limit
+        return {text[start:start + size] for size in range(1, 4) for start in range(len(text) - size + 1)}
 
-    def count_query(self, model):
+    @staticmethod
+    def like_texts(model, values):
         """
-        count query
+        Gets the lowered texts like matches against, other than ancestor fields
         """
 
-        return self.SELECT("COUNT")
+        texts = []
 
-    def count(self, model):
+        for name in model._titles:
+
+            if model._ancestor(name) is not None:
+                continue
+
+            path = overscore.parse(name)
+            field = model._fields._names[path.pop(0)]
+            value = values.get(field.store)
+
+            if path:
+                value = overscore.get(value, path)
+            elif value is not None:
+                value = field.valid(value)
+
+            texts.append(str(value).lower())
+
+        return texts
+
+    def model_likes(self, model):
         """
-        Executes the retrieve
+        Gets the trigram index for a model, building if needed
         """
 
-        model._collate()
+        if model.NAME in self.likes:
+            return self.likes[model.NAME]
 
-        values = self.model_like(model) if model._like is not None else self.data[model.NAME].values()
+        self.likes[model.NAME] = {
+            "grams": {},
+            "parents": {model._fields._names[name].store: {} for name in model._titles if model._ancestor(name) is not None}
+        }
 
-        matches = 0
+        for id, values in self.data[model.NAME].items():
+            self.like_add(model, id, values)
 
-        for record in values:
-            if model._record.retrieve(record):
-                matches += 1
+        return self.likes[model.NAME]
 
-        return matches
+    def like_add(self, model, id, values):
+        """
+        Adds stored values to a model's trigram index
+        """
 
-    def retrieve_query(self, model):
+        if not self.trigrams:
+            return
+
+        likes = self.model_likes(model)
+
+        for text in self.like_texts(model, values):
+            for gram in self.like_grams(text):
+                likes["grams"].setdefault(gram, set()).add(id)
+
+        for store, parents in likes["parents"].items():
+            parents.setdefault(self.index_key(values.get(store)), set()).add(id)
+
+    def like_remove(self, model, id, values):
         """
-        retrieve query
+        Removes stored values from a model's trigram index
         """
 
-        return self.SELECT("RETRIEVE")
+        if not self.trigrams:
+            return
+
+        likes = self.model_likes(model)
 
-    def retrieve(self, model, verify=True):
+        for text in self.like_texts(model, values):
+            for gram in self.like_grams(text):
+                likes["grams"].get(gram, set()).discard(id)
+                if not likes["grams"].get(gram, True):
+                    del likes["grams"][gram]
+
+        for store, parents in likes["parents"].items():
+            key = self.index_key(values.get(store))
+            parents.get(key, set()).discard(id)
+            if not parents.get(key, True):
+                del parents[key]
+
+    def like_ids(self, model, parents):
         """
-        Executes the retrieve
+        Gets the ids that could match like, None if not narrowed
         """
 
-        model._collate()
+        like = str(model._like).lower()
 
-        values = self.model_like(model) if model._like is not None else self.data[model.NAME].values()
+        if not self.trigrams or not like:
+            return None
 
-        matches = []
+        likes = self.model_likes(model)
 
-        for record in values:
-            if model._record.retrieve(record):
-                matches.append(record)
+        if len(like) <= 3:
+            ids = set(likes["grams"].get(like, set()))
+        else:
+            ids = None
+            for start in range(len(like) - 2):
+                grams = likes["grams"].get(like[start:start + 3], set())
+                ids = grams & ids if ids is not None else set(grams)
+                if not ids:
+                    break
 
-        if model._mode == "one" and len(matches) > 1:
-            raise relations.model.ModelError(model, "more than one retrieved")
+        for store, values in parents.items():
+            for value in values:
+                ids.update(likes["parents"][store].get(self.index_key(value), set()))
 
-        if model._mode == "one" and model._role != "child":
+        return ids
 
-            if len(matches) < 1:
+    @staticmethod
+    def index_range(index, criteria):
+        """
+        Gets the ids in a sorted index satisfying range criteria, None if not applicable
+        """
 
-                if verify:
-                    raise relations.model.ModelError(model, "none retrieved")
+        entries = index["sorted"]
+        low, high = 0, len(entries)
+        ranged = False
 
-                return None
+        if index["specs"][0][2] == str:
 
-            model._record = model._build("update", _read=matches[0])
+            if "start" in criteria:
+                start = str(criteria["start"]).lower()
+                low = bisect.bisect_left(entries, (start,))
+                high = bisect.bisect_left(entries, (start + chr(0x10FFFF),))
+                ranged = True
 
         else:
 
-            model._models = []
+            if "gt" in criteria:
+                low = max(low, bisect.bisect_right(entries, (criteria["gt"], float("inf"))))
+                ranged = True
 
-            for match in matches:
-                model._models.append(model.__class__(_read=match))
+            if "gte" in criteria:
+                low = max(low, bisect.bisect_left(entries, (criteria["gte"], float("-inf"))))
+                ranged = True
 
-            model._record = None
+            if "lt" in criteria:
+                high = min(high, bisect.bisect_left(entries, (criteria["lt"], float("-inf"))))
+                ranged = True
 
-        model._action = "update"
+            if "lte" in criteria:
+                high = min(high, bisect.bisect_right(entries, (criteria["lte"], float("inf"))))
+                ranged = True
 
-        if model._mode == "many":
-            self.model_sort(model)
-            self.model_limit(model)
+        if not ranged:
+            return None
 
-        return model
+        return {id for _, id in entries[low:high]}
 
-    def titles_query(self, model):
+    @staticmethod
+    def index_keys(model, index):
         """
-        titles query
+        Gets the values to look up in a hash index and the criteria they cover, None if any field lacks equals or in
         """
 
-        return self.SELECT("TITLES")
+        keys = []
+        covered = []
 
-    def titles(self, model):
+        for name, *path in index["fields"]:
+
+            criteria = model._record._names[name].criteria or {}
+            prefix = f"{path[0]}__" if path else ""
+
+            if f"{prefix}eq" in criteria:
+                keys.append([criteria[f"{prefix}eq"]])
+                covered.append((name, f"{prefix}eq"))
+            elif f"{prefix}in" in criteria:
+                keys.append(criteria[f"{prefix}in"])
+                covered.append((name, f"{prefix}in"))
+            else:
+                return None
+
+        return keys, covered
+
+    def index_ids(self, index, keys, limit=1000):
         """
-        Creates the titles structure
+        Gets the ids for every combination of keys in a hash index, None if too many combinations
         """
 
-        if model._action == "retrieve":
-            self.retrieve(model)
+        if functools.reduce(lambda total, values: total * len(values), keys, 1) > limit:
+            return None
 
-        titles = relations.Titles(model)
+        ids = set()
 
-        for titling in model._each():
-            titles.add(titling)
+        for key in itertools.product(*keys):
+            ids.update(index["hash"].get(self.index_key(key), ()))
 
-        return titles
+        return ids
 
-    def update_query(self, model):
+    def model_ids(self, model, limit=1000):
         """
-        update query
+        Gets the candidate ids from indexes the criteria allow, None if no index applies
         """
 
-        return self.UPDATE("UPDATE")
+        candidates = []
 
-    @rollback
-    def update(self, model):
+        for index in self.model_indexes(model).values():
+
+            # Every field needs equals or in for a hash lookup
+
+            keys = self.index_keys(model, index)
+            ids = self.index_ids(index, keys[0], limit) if keys is not None else None
+
+            if ids is None and index["sorted"] is not None:
+                ids = self.index_range(index, model._record._names[index["fields"][0][0]].criteria or {})
+
+            if ids is not None:
+                candidates.append(ids)
+
+        if not candidates:
+            return None
+
+        return set.intersection(*candidates)
+
+    def model_count(self, model, limit=1000):
         """
-        Executes the update
+        Gets the count from row counts or a single index if the criteria allow, None if a scan is needed
         """
 
-        updated = 0
+        criteria = [
+            (field.name, operator, value)
+            for field in model._record._order
+            for operator, value in (field.criteria or {}).items()
+        ]
 
-        # If the overall model is retrieving and the record has values set
+        if not criteria:
+            return len(self.data[model.NAME])
 
-        if model._action == "retrieve" and model._record._action == "update":
+        for index in self.model_indexes(model).values():
 
-            values = model._record.mass({})
+            keys = self.index_keys(model, index)
 
-            for id, data in self.data[model.NAME].items():
-                if model._record.retrieve(data):
-                    updated += 1
-                    self.uniques(model, {**data, **values}, id)
-                    data.update(self.extract(model, copy.deepcopy(values)))
+            # The index has to cover all the criteria, and None never equals anything
 
-        elif model._id:
+            if (
+                keys is None or sorted(keys[1]) != sorted((name, operator) for name, operator, _ in criteria) or
+                any(value is None for values in keys[0] for value in values)
+            ):
+                continue
 
-            for updating in model._each("update"):
-                data = self.extract(updating, updating._record.update({}))
-                self.uniques(model, data, updating[model._id])
-                self.data[model.NAME][updating[model._id]].update(data)
+            ids = self.index_ids(index, keys[0], limit)
 
-                updated += 1
+            if ids is not None:
+                return len(ids)
 
-                for parent_child in updating.CHILDREN:
-                    if updating._children.get(parent_child):
-                        updating._children[parent_child].create().update()
+        return None
 
-        else:
+    def model_values(self, model, ids):
+        """
+        Gets the stored values by id, just those ids unless None
+        """
 
-            raise relations.model.ModelError(model, "nothing to update from")
+        if ids is None:
+            return self.data[model.NAME]
 
-        return updated
+        return {id: self.data[model.NAME][id] for id in sorted(ids)}
 
-    def delete_query(self, model):
+    def model_candidates(self, model):
         """
-        delete query
+        Gets the stored values by id, narrowed by indexes if possible
         """
 
-        return self.DELETE("DELETE")
+        return self.model_values(model, self.model_ids(model))
 
-    def delete(self, model):
+    def model_column(self, model, field):
         """
-        Executes the delete
+        Gets the ids, values and null mask of a numeric field as NumPy arrays, building if needed
         """
 
-        ids = []
+        columns = self.columns.setdefault(model.NAME, {
+            "ids": numpy.array(list(self.data[model.NAME]), dtype=int),
+            "fields": {}
+        })
 
-        if model._action == "retrieve":
+        if field.store not in columns["fields"]:
 
-            for id, record in self.data[model.NAME].items():
-                if model._record.retrieve(record):
-                    ids.append(id)
+            values = field.valid_many([values.get(field.store) for values in self.data[model.NAME].values()])
+            nulls = numpy.array([value is None for value in values], dtype=bool)
 
-        elif model._id:
+            try:
+                column = numpy.array([0 if value is None else value for value in values], dtype=field.kind)
+            except OverflowError:
+                column = None
 
-            for deleting in model._each():
-                ids.append(deleting[model._id])
-                deleting._action = "create"
+            columns["fields"][field.store] = (column, nulls)
 
-            model._action = "create"
+        return (columns["ids"], *columns["fields"][field.store])
+
+    @staticmethod
+    def column_mask(column, nulls, operator, satisfy):
+        """
+        Gets which values in a column satisfy a criterion, as the field's condition would
+        """
+
+        if operator == "null":
+            return nulls if satisfy else ~nulls
 
+        if operator == "in":
+            matches = numpy.isin(column, [value for value in satisfy if value is not None])
+        elif operator == "eq":
+            matches = column == satisfy
+        elif operator == "gt":
+            matches = column > satisfy
+        elif operator == "gte":
+            matches = column >= satisfy
+        elif operator == "lt":
+            matches = column < satisfy
         else:
+            matches = column <= satisfy
 
-            raise relations.model.ModelError(model, "nothing to delete from")
+        return matches & ~nulls
 
-        for id in ids:
+    def model_scan(self, model):
+        """
+        Gets the ids satisfying numeric criteria by column and the fields left to check by row, None if not applicable
+        """
 
-            del self.data[model.NAME][id]
+        if numpy is None or not self.columnar or model._like is not None:
+            return None
 
-            for unique in model._unique:
-                del self.unique[model.NAME][unique][id]
+        columnar = []
+        fields = []
 
-        return len(ids)
+        for field in model._record._order:
 
-    def definition(self, file_path, source_path):
-        """"
-        Converts a definition file to a source definition file
-        """
+            if not field.criteria:
+                continue
 
-        definitions = []
+            if (
+                field.kind in [bool, int, float] and field.attr is None and
+                all(criterion.split('_')[-1] in self.COLUMNAR for criterion in field.criteria)
+            ):
+                columnar.append(field)
+            else:
+                fields.append(field)
 
-        with open(file_path, "r") as definition_file:
-            definition = json.load(definition_file)
-            for name in sorted(definition.keys()):
-                if definition[name]["source"] == self.name:
-                    definitions.extend(self.define(definition[name]))
+        if not columnar:
+            return None
 
-        if definitions:
-            file_name = file_path.split("/")[-1].split('.')[0]
-            with open(f"{source_path}/{file_name}.json", "w") as source_file:
+        mask = None
+
+        for field in columnar:
+
+            ids, column, nulls = self.model_column(model, field)
+
+            # Numbers too big for NumPy get checked a row at a time
+
+            if column is None:
+                fields.append(field)
+                continue
+
+            for criterion, satisfy in field.criteria.items():
+
+                operator = criterion.split('_')
+
+                try:
+                    matches = self.column_mask(column, nulls, operator[-1], satisfy)
+                except OverflowError:
+                    return None
+
+                if len(operator) > 1:
+                    matches = ~matches
+
+                mask = matches if mask is None else mask & matches
+
+        if mask is None:
+            return None
+
+        return ids[mask].tolist(), fields
+
+    def create_query(self, model):
+        """
+        create query
+        """
+
+        return self.INSERT("CREATE")
+
+    def model_create(self, model, creating):
+        """
+        Stores a model being created
+        """
+
+        values = creating._record.create({})
+
+        self.journal(self.ids, model.NAME)
+        self.ids[model.NAME] += 1
+
+        self.uniques(model, values, self.ids[model.NAME])
+
+        if model._id is not None and values.get(model._id) is None:
+            values[model._fields._names[model._id].store] = self.ids[model.NAME]
+            creating[model._id] = self.ids[model.NAME]
+
+        self.index_change(model, self.ids[model.NAME], None, self.extract(creating, values))
+        self.journal(self.data[model.NAME], self.ids[model.NAME])
+        self.data[model.NAME][self.ids[model.NAME]] = values
+
+    def model_insert(self, model, values):
+        """
+        Stores storage values being inserted
+        """
+
+        for inserting in values:
+
+            self.journal(self.ids, model.NAME)
+            self.ids[model.NAME] += 1
+
+            self.uniques(model, inserting, self.ids[model.NAME])
+
+            if model._id is not None and inserting.get(model._fields._names[model._id].store) is None:
+                inserting[model._fields._names[model._id].store] = self.ids[model.NAME]
+
+            self.index_change(model, self.ids[model.NAME], None, self.extract(model, inserting))
+            self.journal(self.data[model.NAME], self.ids[model.NAME])
+            self.data[model.NAME][self.ids[model.NAME]] = inserting
+
+        return len(values)
+
+    @staticmethod
+    def like_parents(model):
+        """
+        Gets the like matching parents of ancestor titles by store, not yet retrieved
+        """
+
+        parents = {}
+
+        for field in model._titles:
+            relation = model._ancestor(field)
+            if relation:
+                parents[model._fields._names[field].store] = (relation, relation.Parent.many(like=model._like).limit(model._chunk))
+
+        return parents
+
+    def model_like(self, model, values=None, parents=None):
+        """
+        Gets the like matching records
+        """
+
+        if parents is None:
+            parents = self.like_parents(model)
+
+        for store, (relation, parent) in list(parents.items()):
+            parents[store] = parent[relation.parent_field]
+            model.overflow = model.overflow or parent.overflow
+
+        if values is None:
+            values = self.data[model.NAME]
+
+        if isinstance(values, collections.abc.Mapping):
+
+            ids = self.like_ids(model, parents)
+
+            if ids is not None:
+                values = {id: values[id] for id in sorted(ids) if id in values}
+
+            values = values.values()
+
+        likes = []
+
+        for record in values:
+            if model._record.like(record, model._titles, model._like, parents):
+                likes.append(record)
+
+        return likes
+
+    @staticmethod
+    def model_order(model, records):
+        """
+        Sorts stored records the way their models would be sorted, only as far as the limit
+        """
+
+        sort = model._sort or model._order
+
+        if not sort:
+            return records
+
+        fields = {}
+
+        # Read as the record would, injected fields from the field they're in
+
+        def value(record, name):
+            if name not in fields:
+                fields[name] = model._fields._names[name].clone()
+            field = fields[name]
+            field.read(record.get(model._fields._names[field.inject.split('__')[0]].store) or {} if field.inject else record)
+            return field.value
+
+        key = model._sorter(model._ordering(sort), value)
+
+        if model._limit is not None:
+            return heapq.nsmallest(model._offset + model._limit, records, key=key)
+
+        return sorted(records, key=key)
+
+    def model_matches(self, model, parents=None):
+        """
+        Gets the stored records matching
+        """
+
+        model._collate()
+
+        # Indexes narrow better than scanning by column if any apply
+
+        ids = self.model_ids(model)
+        scanned = self.model_scan(model) if ids is None else None
+
+        if scanned is not None:
+
+            ids, fields = scanned
+            retrieves = [field.compile() for field in fields]
+            values = [self.data[model.NAME][id] for id in ids]
+
+            return [record for record in values if all(retrieve(record) for retrieve in retrieves)]
+
+        values = self.model_values(model, ids)
+
+        if model._like is not None:
+            values = self.model_like(model, values, parents)
+        else:
+            values = values.values()
+
+        retrieve = model._record.compile()
+
+        return [record for record in values if retrieve(record)]
+
+    def model_records(self, model, parents=None):
+        """
+        Gets the stored records matching, sorted and limited
+        """
+
+        records = self.model_order(model, self.model_matches(model, parents))
+
+        if model._limit is not None:
+            records = records[model._offset:model._offset + model._limit]
+            model.overflow = model.overflow or len(records) >= model._limit
+
+        return records
+
+    def count_query(self, model):
+        """
+        count query
+        """
+
+        return self.SELECT("COUNT")
+
+    def retrieve_query(self, model):
+        """
+        retrieve query
+        """
+
+        return self.SELECT("RETRIEVE", model._only)
+
+    def model_retrieve(self, model, verify=True, parents=None):
+        """
+        Builds the models from the stored records matching
+        """
+
+        if model._mode == "many":
+
+            model._models = [model.__class__(_read=self.copied(record), _only=model._only) for record in self.model_records(model, parents)]
+            model._record = None
+            model._action = "update"
+            model._sort = None
+
+            return model
+
+        matches = self.model_matches(model, parents)
+
+        if len(matches) > 1:
+            raise relations.model.ModelError(model, "more than one retrieved")
+
+        if model._role != "child":
+
+            if len(matches) < 1:
+
+                if verify:
+                    raise relations.model.ModelError(model, "none retrieved")
+
+                return None
+
+            model._record = model._build("update", _read=self.copied(matches[0]), _only=model._only)
+
+        else:
+
+            model._models = [model.__class__(_read=self.copied(match), _only=model._only) for match in matches]
+            model._record = None
+
+        model._action = "update"
+
+        return model
+
+    def titles_query(self, model):
+        """
+        titles query
+        """
+
+        return self.SELECT("TITLES")
+
+    def update_query(self, model):
+        """
+        update query
+        """
+
+        return self.UPDATE("UPDATE")
+
+    def model_mass(self, model):
+        """
+        Stores the values set for all the records matching
+        """
+
+        updated = 0
+
+        values = model._record.mass({})
+        retrieve = model._record.compile()
+
+        for id, data in self.model_candidates(model).items():
+            if retrieve(data):
+                updated += 1
+                self.uniques(model, {**data, **values}, id)
+                self.journal(self.data[model.NAME], id)
+                self.data[model.NAME][id] = {**data, **self.extract(model, copy.deepcopy(values))}
+                self.index_change(model, id, data, self.data[model.NAME][id])
+
+        return updated
+
+    def model_update(self, model, updating):
+        """
+        Stores a model being updated
+        """
+
+        id = updating[model._id]
+        data = {**self.data[model.NAME][id], **self.extract(updating, updating._record.update({}))}
+        self.uniques(model, data, id)
+        self.index_change(model, id, self.data[model.NAME][id], data)
+        self.journal(self.data[model.NAME], id)
+        self.data[model.NAME][id] = data
+
+    def delete_query(self, model):
+        """
+        delete query
+        """
+
+        return self.DELETE("DELETE")
+
+    def model_delete(self, model):
+        """
+        Removes the stored records being deleted
+        """
+
+        ids = []
+
+        if model._action == "retrieve":
+
+            retrieve = model._record.compile()
+
+            for id, record in self.model_candidates(model).items():
+                if retrieve(record):
+                    ids.append(id)
+
+        elif model._id:
+
+            for deleting in model._each():
+                ids.append(deleting[model._id])
+                deleting._action = "create"
+
+            model._action = "create"
+
+        else:
+
+            raise relations.model.ModelError(model, "nothing to delete from")
+
+        for id in ids:
+
+            self.index_change(model, id, self.data[model.NAME][id], None)
+            self.journal(self.data[model.NAME], id)
+            del self.data[model.NAME][id]
+
+            for unique in model._unique:
+                owners = self.unique_owners(model, unique)
+                self.journal(self.unique[model.NAME][unique], id)
+                value = self.unique[model.NAME][unique].pop(id)
+                if owners.get(value) == id:
+                    self.journal(owners, value)
+                    del owners[value]
+
+        return len(ids)
+
+    def definition(self, file_path, source_path):
+        """"
+        Converts a definition file to a source definition file
+        """
+
+        definitions = []
+
+        with open(file_path, "r") as definition_file:
+            definition = json.load(definition_file)
+            for name in sorted(definition.keys()):
+                if definition[name]["source"] == self.name:
+                    definitions.extend(self.define(definition[name]))
+
+        if definitions:
+            file_name = file_path.split("/")[-1].split('.')[0]
+            with open(f"{source_path}/{file_name}.json", "w") as source_file:
                 source_file.write(json.dumps(definitions))
                 source_file.write("\n")
 
-    def migration(self, file_path, source_path):
-        """"
-        Converts a migration file to a source definition file
+    def migration(self, file_path, source_path):
+        """"
+        Converts a migration file to a source definition file
+        """
+
+        migrations = []
+
+        with open(file_path, "r") as migration_file:
+            migration = json.load(migration_file)
+
+            for add in sorted(migration.get('add', {}).keys()):
+                if migration['add'][add]["source"] == self.name:
+                    migrations.extend(self.model_add(migration['add'][add]))
+
+            for remove in sorted(migration.get('remove', {}).keys()):
+                if migration['remove'][remove]["source"] == self.name:
+                    migrations.extend(self.model_remove(migration['remove'][remove]))
+
+            for change in sorted(migration.get('change', {}).keys()):
+                if migration['change'][change]['definition']["source"] == self.name:
+                    migrations.extend(
+                        self.model_change(migration['change'][change]['definition'], migration['change'][change]['migration'])
+                    )
+
+        if migrations:
+            file_name = file_path.split("/")[-1].split('.')[0]
+            with open(f"{source_path}/{file_name}.json", "w") as source_file:
+                source_file.write(json.dumps(migrations))
+                source_file.write("\n")
+
+    def model_execute(self, model): # pylint: disable=too-many-branches
+        """
+        Executes a model's definition or migration
+        """
+
+        # Indexes get rebuilt as needed
+
+        self.indexes.pop(model.get("name", model.get("DEFINITION", {}).get("name")), None)
+        self.indexes.pop(model.get("MIGRATION", {}).get("name"), None)
+        self.likes.pop(model.get("name", model.get("DEFINITION", {}).get("name")), None)
+        self.likes.pop(model.get("MIGRATION", {}).get("name"), None)
+        self.columns.pop(model.get("name", model.get("DEFINITION", {}).get("name")), None)
+        self.columns.pop(model.get("MIGRATION", {}).get("name"), None)
+
+        if model["ACTION"] == "add":
+
+            if model['name'] not in self.data:
+                self.data[model['name']] = self.table()
+
+            self.ids.setdefault(model['name'], 0)
+
+        elif model["ACTION"] == "remove":
+
+            del self.data[model['name']]
+            del self.ids[model['name']]
+
+            self.unique.pop(model['name'], None)
+            self.owners.pop(model['name'], None)
+
+        elif model["ACTION"] == "change":
+
+            name = model["MIGRATION"].get("name", model["DEFINITION"]["name"])
+
+            if model["DEFINITION"]["name"] != name:
+
+                self.data[name] = self.data[model["DEFINITION"]["name"]]
+                self.ids[name] = self.ids[model["DEFINITION"]["name"]]
+
+                del self.data[model["DEFINITION"]["name"]]
+                del self.ids[model["DEFINITION"]["name"]]
+
+                if model["DEFINITION"]["name"] in self.unique:
+                    self.unique[name] = self.unique.pop(model["DEFINITION"]["name"])
+
+                self.owners.pop(model["DEFINITION"]["name"], None)
+
+            # Records are replaced rather than changed in place, whatever the layout
+
+            data = self.data[name]
+
+            for field in model["MIGRATION"].get("fields"):
+
+                if field["ACTION"] == "add":
+
+                    for id, record in list(data.items()):
+                        data[id] = {**record, field['store']: field.get("default")}
+
+                elif field["ACTION"] == "remove":
+
+                    for id, record in list(data.items()):
+                        data[id] = {key: value for key, value in record.items() if key != field['store']}
+
+                elif field["ACTION"] == "change":
+
+                    store = field["MIGRATION"].get("store", field["DEFINITION"]["store"])
+
+                    if field["DEFINITION"]["store"] != store:
+
+                        for id, record in list(data.items()):
+                            record = dict(record)
+                            record[store] = record.pop(field["DEFINITION"]["store"])
+                            data[id] = record
+
+    def list(self, source_path):
+        """
+        List the migration by pairs
+        """
+
+        migrations = {}
+
+        for file_path in glob.glob(f"{source_path}/*-*.json"):
+
+            file_name = file_path.rsplit("/", 1)[-1]
+            kind, stamp = file_name.split('.')[0].split('-', 1)
+
+            migrations.setdefault(stamp, {})
+            migrations[stamp][kind] = file_name
+
+        return migrations
+
+    def migrate_paths(self, source_path):
+        """
+        Gets the files to load to bring migrations up to date
+        """
+
+        if self.migrations is None:
+            return [f"{source_path}/definition.json"]
+
+        return [
+            migration_path for migration_path in sorted(glob.glob(f"{source_path}/migration-*.json"))
+            if migration_path.rsplit("/migration-", 1)[-1].split('.')[0] not in self.migrations
+        ]
+
+    def migrate_stamps(self, source_path):
+        """
+        Records all the migrations as applied
+        """
+
+        if self.migrations is None:
+            self.migrations = []
+
+        for migration_path in sorted(glob.glob(f"{source_path}/migration-*.json")):
+            migration = migration_path.rsplit("/migration-", 1)[-1].split('.')[0]
+            if migration not in self.migrations:
+                self.migrations.append(migration)
+
+class MockSource(BaseMockSource, relations.Source):
+    """
+    Mock Source for Testing
+    """
+
+    def atomic(func): # pylint: disable=no-self-argument
+        """
+        Decorator for rolling back a bad transaction
+        """
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            """
+            Wrapper for rolling back a bad transaction
+            """
+
+            savepoint = self.begin()
+
+            try:
+
+                result = func(self, *args, **kwargs) # pylint: disable=not-callable
+
+            except Exception:
+
+                self.rollback(savepoint)
+                raise
+
+            self.commit(savepoint)
+
+            return result
+
+        return wrapper
+
+    @atomic
+    def create(self, model):
+        """
+        Executes the create
+        """
+
+        for creating in model._each("create"):
+
+            self.model_create(model, creating)
+
+            if not model._bulk:
+
+                for parent_child in creating.CHILDREN:
+                    if creating._children.get(parent_child):
+                        creating._children[parent_child].create()
+
+                creating._action = "update"
+                creating._record._action = "update"
+
+        if model._bulk:
+            model._models = []
+        else:
+            model._action = "update"
+
+        return model
+
+    @atomic
+    def insert(self, model, values):
+        """
+        Executes the insert of storage values
         """
 
-        migrations = []
+        return self.model_insert(model, values)
 
-        with open(file_path, "r") as migration_file:
-            migration = json.load(migration_file)
+    def count(self, model):
+        """
+        Executes the retrieve
+        """
 
-            for add in sorted(migration.get('add', {}).keys()):
-                if migration['add'][add]["source"] == self.name:
-                    migrations.extend(self.model_add(migration['add'][add]))
+        model._collate()
 
-            for remove in sorted(migration.get('remove', {}).keys()):
-                if migration['remove'][remove]["source"] == self.name:
-                    migrations.extend(self.model_remove(migration['remove'][remove]))
+        if model._like is None:
 
-            for change in sorted(migration.get('change', {}).keys()):
-                if migration['change'][change]['definition']["source"] == self.name:
-                    migrations.extend(
-                        self.model_change(migration['change'][change]['definition'], migration['change'][change]['migration'])
-                    )
+            count = self.model_count(model)
 
-        if migrations:
-            file_name = file_path.split("/")[-1].split('.')[0]
-            with open(f"{source_path}/{file_name}.json", "w") as source_file:
-                source_file.write(json.dumps(migrations))
-                source_file.write("\n")
+            if count is not None:
+                return count
+
+        return len(self.model_matches(model))
+
+    def retrieve(self, model, verify=True):
+        """
+        Executes the retrieve
+        """
 
-    def execute(self, models): # pylint: disable=too-many-branches
+        return self.model_retrieve(model, verify)
+
+    def retrieve_iter(self, model, chunk):
         """
-        execute the model or models
+        Executes the retrieve, building models a chunk at a time
         """
 
-        if not isinstance(models, list):
-            models = [models]
+        records = self.model_records(model)
+
+        for start in range(0, len(records), chunk):
+            yield from [model.__class__(_read=self.copied(record), _only=model._only) for record in records[start:start + chunk]]
+
+    def titles(self, model):
+        """
+        Creates the titles structure
+        """
+
+        if model._action == "retrieve":
+            self.retrieve(model)
+
+        titles = relations.Titles(model)
+
+        for titling in model._each():
+            titles.add(titling)
 
-        for model in models: # pylint: disable=too-many-nested-blocks
+        return titles
 
-            if model["ACTION"] == "add":
+    @atomic
+    def update(self, model):
+        """
+        Executes the update
+        """
 
-                self.data.setdefault(model['name'], {})
-                self.ids.setdefault(model['name'], 0)
+        updated = 0
 
-            elif model["ACTION"] == "remove":
+        # If the overall model is retrieving and the record has values set
 
-                del self.data[model['name']]
-                del self.ids[model['name']]
+        if model._action == "retrieve" and model._record._action == "update":
 
-            elif model["ACTION"] == "change":
+            updated = self.model_mass(model)
 
-                name = model["MIGRATION"].get("name", model["DEFINITION"]["name"])
+        elif model._id:
 
-                if model["DEFINITION"]["name"] != name:
+            for updating in model._each("update"):
 
-                    self.data[name] = self.data[model["DEFINITION"]["name"]]
-                    self.ids[name] = self.ids[model["DEFINITION"]["name"]]
+                self.model_update(model, updating)
 
-                    del self.data[model["DEFINITION"]["name"]]
-                    del self.ids[model["DEFINITION"]["name"]]
+                updated += 1
 
-                for field in model["MIGRATION"].get("fields"):
+                for parent_child in updating.CHILDREN:
+                    if updating._children.get(parent_child):
+                        updating._children[parent_child].create().update()
 
-                    if field["ACTION"] == "add":
+        else:
 
-                        for record in self.data[name].values():
-                            record[field['store']] = field.get("default")
+            raise relations.model.ModelError(model, "nothing to update from")
 
-                    elif field["ACTION"] == "remove":
+        return updated
 
-                        for record in self.data[name].values():
-                            del record[field['store']]
+    @atomic
+    def delete(self, model):
+        """
+        Executes the delete
+        """
 
-                    elif field["ACTION"] == "change":
+        return self.model_delete(model)
 
-                        store = field["MIGRATION"].get("store", field["DEFINITION"]["store"])
+    def execute(self, models):
+        """
+        execute the model or models
+        """
 
-                        if field["DEFINITION"]["store"] != store:
+        if not isinstance(models, list):
+            models = [models]
 
-                            for record in self.data[name].values():
-                                record[store] = record[field["DEFINITION"]["store"]]
-                                del record[field["DEFINITION"]["store"]]
+        for model in models:
+            self.model_execute(model)
 
     def load(self, load_path):
         """
@@ -592,52 +1540,276 @@ class MockSource(relations.Source):
         with open(load_path, 'r') as load_file:
             self.execute(json.load(load_file))
 
-    def list(self, source_path):
+    def migrate(self, source_path):
         """
-        List the migration by pairs
+        Migrate all the existing files to where we are
         """
 
-        migrations = {}
+        migration_paths = self.migrate_paths(source_path)
 
-        for file_path in glob.glob(f"{source_path}/*-*.json"):
+        for migration_path in migration_paths:
+            self.load(migration_path)
 
-            file_name = file_path.rsplit("/", 1)[-1]
-            kind, stamp = file_name.split('.')[0].split('-', 1)
+        self.migrate_stamps(source_path)
 
-            migrations.setdefault(stamp, {})
-            migrations[stamp][kind] = file_name
+        return bool(migration_paths)
 
-        return migrations
 
-    def migrate(self, source_path):
+class AsyncMockSource(BaseMockSource, relations.AsyncSource):
+    """
+    Mock Source for Testing with awaited queries
+    """
+
+    lock = None   # Keeps writes from interleaving their transactions
+    writer = None # Whether the current task holds the lock
+
+    def __init__(self, name, **kwargs):
+
+        super().__init__(name, **kwargs)
+
+        self.lock = asyncio.Lock()
+        self.writer = contextvars.ContextVar(f"writer-{name}", default=False)
+
+    def atomic(func): # pylint: disable=no-self-argument
         """
-        Migrate all the existing files to where we are
+        Decorator for rolling back a bad transaction, one writing task at a time
         """
 
-        migrated = False
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            """
+            Wrapper for rolling back a bad transaction
+            """
+
+            if self.writer.get():
+                return await self.atomically(func, *args, **kwargs)
 
-        migration_paths = sorted(glob.glob(f"{source_path}/migration-*.json"))
+            async with self.lock:
 
-        if self.migrations is None:
+                token = self.writer.set(True)
 
-            self.migrations = []
+                try:
+                    return await self.atomically(func, *args, **kwargs)
+                finally:
+                    self.writer.reset(token)
+
+        return wrapper
+
+    async def atomically(self, func, *args, **kwargs):
+        """
+        Awaits within a transaction or savepoint, rolling back on any exception
+        """
+
+        savepoint = self.begin()
+
+        try:
+
+            result = await func(self, *args, **kwargs)
+
+        except Exception:
+
+            self.rollback(savepoint)
+            raise
+
+        self.commit(savepoint)
+
+        return result
+
+    async def model_relatives(self, model):
+        """
+        Retrieves the relatives whose criteria narrow the model
+        """
+
+        for relatives in [model._parents, model._children]:
+            for relative in relatives.values():
+                if relative is not None and relative._action == "retrieve":
+                    await relative.retrieve()
+
+    async def model_liked(self, model):
+        """
+        Retrieves the like matching parents of ancestor titles
+        """
+
+        if model._like is None:
+            return None
+
+        parents = self.like_parents(model)
+
+        for _, parent in parents.values():
+            await parent.retrieve()
+
+        return parents
+
+    @atomic
+    async def create(self, model):
+        """
+        Executes the create
+        """
+
+        for creating in model._each("create"):
+
+            self.model_create(model, creating)
+
+            if not model._bulk:
+
+                for parent_child in creating.CHILDREN:
+                    if creating._children.get(parent_child):
+                        await creating._children[parent_child].create()
 
-            self.load(f"{source_path}/definition.json")
-            migrated = True
+                creating._action = "update"
+                creating._record._action = "update"
 
+        if model._bulk:
+            model._models = []
         else:
+            model._action = "update"
+
+        return model
+
+    @atomic
+    async def insert(self, model, values):
+        """
+        Executes the insert of storage values
+        """
+
+        return self.model_insert(model, values)
+
+    async def count(self, model):
+        """
+        Executes the count
+        """
+
+        await self.model_relatives(model)
+
+        model._collate()
+
+        if model._like is None:
+
+            count = self.model_count(model)
+
+            if count is not None:
+                return count
+
+        return len(self.model_matches(model, await self.model_liked(model)))
+
+    async def retrieve(self, model, verify=True):
+        """
+        Executes the retrieve
+        """
+
+        await self.model_relatives(model)
+
+        return self.model_retrieve(model, verify, await self.model_liked(model))
+
+    async def retrieve_iter(self, model, chunk): # pylint: disable=invalid-overridden-method
+        """
+        Executes the retrieve, building models a chunk at a time
+
+        Calling an async generator doesn't await, so this still returns the iterator the stub promises
+        """
+
+        await self.model_relatives(model)
 
-            for migration_path in migration_paths:
-                if migration_path.rsplit("/migration-", 1)[-1].split('.')[0] not in self.migrations:
-                    self.load(migration_path)
-                    migrated = True
+        records = self.model_records(model, await self.model_liked(model))
+
+        for start in range(0, len(records), chunk):
+            for iterated in [model.__class__(_read=self.copied(record), _only=model._only) for record in records[start:start + chunk]]:
+                yield iterated
+
+    async def titles(self, model):
+        """
+        Creates the titles structure, resolving parent titles first
+        """
+
+        if model._action == "retrieve":
+            await self.retrieve(model)
+
+        if model._titled is None:
+            model._titled = {}
+
+        for (Parent, parent_field), ids in relations.Titles.missing(model, model._titled).items():
+            relations.Titles.resolve(
+                model._titled, (Parent, parent_field), ids,
+                await Parent.many(_titled=model._titled, **{f"{parent_field}__in": ids}).titles()
+            )
+
+        titles = relations.Titles(model)
+
+        for titling in model._each():
+            titles.add(titling)
+
+        return titles
+
+    @atomic
+    async def update(self, model):
+        """
+        Executes the update
+        """
+
+        if model._action == "retrieve" and model._record._action == "update":
+            return self.model_mass(model)
+
+        if not model._id:
+            raise relations.model.ModelError(model, "nothing to update from")
+
+        updated = 0
+
+        for updating in model._each("update"):
+
+            self.model_update(model, updating)
+
+            updated += 1
+
+            # Children never retrieved have nothing to cascade
+
+            for parent_child in updating.CHILDREN:
+                child = updating._children.get(parent_child)
+                if child is not None and child._action != "retrieve" and child:
+                    await child.create()
+                    await child.update()
+
+        return updated
+
+    @atomic
+    async def delete(self, model):
+        """
+        Executes the delete
+        """
+
+        return self.model_delete(model)
+
+    async def execute(self, models):
+        """
+        Executes the definitions and migrations
+        """
+
+        if not isinstance(models, list):
+            models = [models]
+
+        for model in models:
+            self.model_execute(model)
+
+    async def load(self, load_path):
+        """
+        Load a file
+        """
+
+        with open(load_path, 'r') as load_file:
+            await self.execute(json.load(load_file))
+
+    async def migrate(self, source_path):
+        """
+        Migrate all the existing files to where we are
+        """
+
+        migration_paths = self.migrate_paths(source_path)
 
         for migration_path in migration_paths:
-            migration = migration_path.rsplit("/migration-", 1)[-1].split('.')[0]
-            if migration not in self.migrations:
-                self.migrations.append(migration)
+            await self.load(migration_path)
 
-        return migrated
+        self.migrate_stamps(source_path)
+
+        return bool(migration_paths)
 
 
 class TestCase(unittest.TestCase):
@@ -721,6 +1893,19 @@ class TestCase(unittest.TestCase):
         for index, field in enumerate(items):
             self.assertEqual(field, data[index], index)
 
+    @contextlib.contextmanager
+    def assertNoNPlusOne(self, threshold=2, message=None):
+        """
+        Asserts nothing within doesn't query the same way for threshold different single ids.
+        Good with catching relations accessed row by row
+        """
+
+        with relations.Detector(threshold) as detector:
+            yield detector
+
+        if detector.problems():
+            self.fail(message or detector.message())
+
     def assertStatusValue(self, response, code, key, value):
         """
         Assert a response's code and keyed json value are equal.
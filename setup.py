@@ -18,7 +18,11 @@ setup(
         'relations.model',
         'relations.record',
         'relations.relation',
-        'relations.migrations'
+        'relations.migrations',
+        'relations.session',
+        'relations.cache',
+        'relations.collector',
+        'relations.detector'
     ],
     install_requires=[
         'overscore==0.1.1'
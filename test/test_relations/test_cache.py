@@ -0,0 +1,149 @@
+"""
+Unittests for Cache
+"""
+
+import unittest
+import unittest.mock
+import freezegun
+
+import relations
+import relations.unittest
+
+class CacheModel(relations.Model):
+    SOURCE = "TestCache"
+
+class Unit(CacheModel):
+    id = int
+    name = str
+
+class Test(CacheModel):
+    id = int
+    unit_id = int
+    name = str
+
+relations.OneToMany(Unit, Test)
+
+class Case(CacheModel):
+    id = int
+    test_id = int
+    name = str
+
+relations.OneToMany(Test, Case)
+
+class TestCache(unittest.TestCase):
+
+    maxDiff = None
+
+    def setUp(self):
+
+        self.source = relations.unittest.MockSource("TestCache")
+
+        self.cache = relations.Cache(size=2, ttl=60)
+
+    def tearDown(self):
+
+        del relations.SOURCES["TestCache"]
+
+    def test___init__(self):
+
+        cache = relations.Cache()
+
+        self.assertEqual(cache.size, 1000)
+        self.assertIsNone(cache.ttl)
+        self.assertEqual(cache.results, {})
+
+    def test_key(self):
+
+        key = self.cache.key(Unit.many(name__in=["people", "stuff"]).sort("-name").limit(5, 10), "retrieve", True)
+
+        self.assertEqual(key, self.cache.key(Unit.many(name__in=["people", "stuff"]).sort("-name").limit(5, 10), "retrieve", True))
+
+        self.assertNotEqual(key, self.cache.key(Unit.many(name__in=["people", "stuff"]).sort("-name").limit(5, 10), "count", True))
+        self.assertNotEqual(key, self.cache.key(Unit.many(name__in=["people"]).sort("-name").limit(5, 10), "retrieve", True))
+        self.assertNotEqual(key, self.cache.key(Unit.many(name__in=["people", "stuff"]).sort("name").limit(5, 10), "retrieve", True))
+        self.assertNotEqual(key, self.cache.key(Unit.many(name__in=["people", "stuff"]).sort("-name").limit(5, 0), "retrieve", True))
+        self.assertNotEqual(self.cache.key(Unit.one(name="people"), "retrieve"), self.cache.key(Unit.many(name="people"), "retrieve"))
+        self.assertNotEqual(key, self.cache.key(Test.many(name__in=["people", "stuff"]).sort("-name").limit(5, 10), "retrieve", True))
+        self.assertNotEqual(self.cache.key(Unit.many(like="p"), "count"), self.cache.key(Unit.many(like="s"), "count"))
+        self.assertNotEqual(self.cache.key(Unit.many(), "retrieve"), self.cache.key(Unit.many().only("name"), "retrieve"))
+
+    def test_names(self):
+
+        self.assertEqual(self.cache.names(Unit.many()), ["unit"])
+        self.assertEqual(self.cache.names(Case.many()), ["case", "test", "unit"])
+
+    def test_depends(self):
+
+        self.assertEqual(self.cache.depends(Test.many()), ["test"])
+        self.assertEqual(self.cache.depends(Test.many(like="app")), ["test", "unit"])
+
+        self.source.cache = relations.Cache()
+
+        unit = Unit("apple")
+        unit.test.add("pie")
+        unit.create()
+
+        self.assertEqual(Test.many(like="app").retrieve().name, ["pie"])
+        self.assertEqual(Test.many(like="app").count(), 1)
+
+        Unit.many(id=unit.id).set(name="banana").update()
+
+        self.assertEqual(Test.many(like="app").retrieve().name, [])
+        self.assertEqual(Test.many(like="app").count(), 0)
+
+    def test_get(self):
+
+        self.assertIsNone(self.cache.get("nope"))
+
+        with freezegun.freeze_time("2012-07-07 00:00:00"):
+            self.cache.set("people", 1, ["unit"])
+            self.cache.set("stuff", 2, ["unit"])
+
+        with freezegun.freeze_time("2012-07-07 00:01:00"):
+            self.assertEqual(self.cache.get("people"), 1)
+            self.assertEqual(list(self.cache.results), ["stuff", "people"])
+
+        with freezegun.freeze_time("2012-07-07 00:01:01"):
+            self.assertIsNone(self.cache.get("people"))
+            self.assertEqual(list(self.cache.results), ["stuff"])
+
+        cache = relations.Cache()
+        cache.set("people", 1, ["unit"])
+
+        with freezegun.freeze_time("2112-07-07 00:00:00"):
+            self.assertEqual(cache.get("people"), 1)
+
+    def test_set(self):
+
+        with freezegun.freeze_time("2012-07-07 00:00:00"):
+
+            self.cache.set("people", 1, ["unit"])
+            self.assertEqual(self.cache.results["people"], (1341619260.0, ["unit"], 1))
+
+            self.cache.set("stuff", 2, ["unit"])
+            self.cache.set("people", 3, ["unit"])
+            self.assertEqual(list(self.cache.results), ["stuff", "people"])
+
+            self.cache.set("things", 4, ["test"])
+            self.assertEqual(list(self.cache.results), ["people", "things"])
+
+    def test_invalidate(self):
+
+        self.cache.set("people", 1, ["unit"])
+        self.cache.set("stuff", 2, ["test", "unit"])
+
+        self.cache.invalidate("test")
+        self.assertEqual(list(self.cache.results), ["people"])
+
+        self.cache.set("stuff", 2, ["test", "unit"])
+
+        self.cache.invalidate("unit")
+        self.assertEqual(self.cache.results, {})
+
+    def test_clear(self):
+
+        self.cache.set("people", 1, ["unit"])
+
+        self.cache.clear()
+
+        self.assertEqual(self.cache.results, {})
@@ -0,0 +1,104 @@
+"""
+Unittests for Collector
+"""
+
+import unittest
+import unittest.mock
+
+import relations
+import relations.unittest
+
+class CollectorModel(relations.Model):
+    SOURCE = "TestCollector"
+
+class Unit(CollectorModel):
+    id = int
+    name = str
+
+class TestCollector(unittest.TestCase):
+
+    maxDiff = None
+
+    def setUp(self):
+
+        self.collector = relations.Collector([0.1, 1])
+
+    def test___init__(self):
+
+        collector = relations.Collector()
+
+        self.assertEqual(collector.buckets, relations.Collector.BUCKETS)
+        self.assertEqual(collector.stats, {})
+
+        self.assertEqual(relations.Collector([1, 0.1]).buckets, [0.1, 1])
+
+    def test___call__(self):
+
+        self.collector({"stage": "before", "model": "unit", "action": "count"})
+        self.assertEqual(self.collector.stats, {})
+
+        self.collector({"stage": "after", "model": "unit", "action": "count", "rows": 3, "seconds": 0.05, "error": None})
+        self.collector({"stage": "after", "model": "unit", "action": "count", "rows": None, "seconds": 2, "error": Exception()})
+        self.collector({"stage": "after", "model": "unit", "action": "count", "rows": 1, "seconds": 1, "error": None})
+
+        self.assertEqual(self.collector.stats, {
+            ("unit", "count"): {
+                "count": 3,
+                "errors": 1,
+                "rows": 4,
+                "seconds": 3.05,
+                "max": 2,
+                "histogram": [1, 1, 1]
+            }
+        })
+
+        source = relations.unittest.MockSource("TestCollector")
+        source.hook(self.collector)
+
+        Unit([["people"], ["stuff"]]).create()
+        Unit.many().retrieve()
+
+        self.assertEqual(self.collector.stats[("unit", "create")]["rows"], 2)
+        self.assertEqual(self.collector.stats[("unit", "retrieve")]["count"], 1)
+        self.assertEqual(self.collector.stats[("unit", "retrieve")]["rows"], 2)
+
+        del relations.SOURCES["TestCollector"]
+
+    def test_report(self):
+
+        self.collector({"stage": "after", "model": "unit", "action": "count", "rows": 1, "seconds": 0.5, "error": None})
+        self.collector({"stage": "after", "model": "unit", "action": "retrieve", "rows": 4, "seconds": 1.0, "error": None})
+        self.collector({"stage": "after", "model": "unit", "action": "retrieve", "rows": 2, "seconds": 2.0, "error": None})
+
+        self.assertEqual(self.collector.report(), [
+            {
+                "model": "unit",
+                "action": "retrieve",
+                "count": 2,
+                "errors": 0,
+                "rows": 6,
+                "seconds": 3.0,
+                "max": 2.0,
+                "histogram": [0, 1, 1],
+                "mean": 1.5
+            },
+            {
+                "model": "unit",
+                "action": "count",
+                "count": 1,
+                "errors": 0,
+                "rows": 1,
+                "seconds": 0.5,
+                "max": 0.5,
+                "histogram": [0, 1, 0],
+                "mean": 0.5
+            }
+        ])
+
+    def test_clear(self):
+
+        self.collector({"stage": "after", "model": "unit", "action": "count", "rows": 1, "seconds": 0.5, "error": None})
+
+        self.collector.clear()
+
+        self.assertEqual(self.collector.stats, {})
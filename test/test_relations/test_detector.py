@@ -0,0 +1,161 @@
+"""
+Unittests for Detector
+"""
+
+import unittest
+import unittest.mock
+
+import os
+
+import relations
+import relations.unittest
+
+class DetectorModel(relations.Model):
+    SOURCE = "TestDetector"
+
+class Unit(DetectorModel):
+    id = int
+    name = str
+
+class Test(DetectorModel):
+    id = int
+    unit_id = int
+    name = str
+
+relations.OneToMany(Unit, Test)
+
+class TestDetector(unittest.TestCase):
+
+    maxDiff = None
+
+    def setUp(self):
+
+        self.source = relations.unittest.MockSource("TestDetector")
+
+        unit = Unit([["people"], ["stuff"]]).create()
+        unit[0].test.add("moar")
+        unit[1].test.add("less")
+        unit.update()
+
+        self.detector = relations.Detector()
+
+    def tearDown(self):
+
+        del relations.SOURCES["TestDetector"]
+
+    def test___init__(self):
+
+        detector = relations.Detector(3)
+
+        self.assertEqual(detector.threshold, 3)
+        self.assertEqual(detector.queries, {})
+        self.assertEqual(detector.sources, [])
+
+    def test___enter__(self):
+
+        with self.detector as detector:
+
+            self.assertIs(detector, self.detector)
+            self.assertIn(self.source, detector.sources)
+            self.assertIn(detector, self.source.hooks)
+            self.assertIs(relations.detector.DETECTING.get(), detector)
+
+    def test___exit__(self):
+
+        with self.detector:
+            pass
+
+        self.assertIsNone(self.source.hooks)
+        self.assertIsNone(relations.detector.DETECTING.get())
+
+    def test_single(self):
+
+        def event(model):
+            return {"shape": self.source.shape(model), "instance": model}
+
+        self.assertEqual(self.detector.single(event(Unit.one(1))), ("id", 1))
+        self.assertEqual(self.detector.single(event(Test.many(unit_id__in=[1, 2]))), ("unit_id", [1, 2]))
+
+        self.assertIsNone(self.detector.single({"shape": None}))
+        self.assertIsNone(self.detector.single(event(Unit.many())))
+        self.assertIsNone(self.detector.single(event(Unit.one(1, like="p"))))
+        self.assertIsNone(self.detector.single(event(Unit.one(1, name="people"))))
+        self.assertIsNone(self.detector.single(event(Unit.one(id__gt=1))))
+        self.assertIsNone(self.detector.single(event(Unit.one(name="people"))))
+
+    def test_ignored(self):
+
+        self.assertTrue(self.detector.ignored(relations.detector.__file__))
+        self.assertTrue(self.detector.ignored(unittest.__file__))
+        self.assertTrue(self.detector.ignored(os.path.join(relations.Detector.STDLIB, "nope.py")))
+        self.assertFalse(self.detector.ignored(__file__))
+        self.assertFalse(self.detector.ignored(os.path.join(relations.Detector.PURELIB, "nope.py")))
+
+    def test_site(self):
+
+        self.assertEqual(self.detector.site(), f"{__file__}:{self.test_site.__code__.co_firstlineno + 2} in test_site")
+
+    def test___call__(self):
+
+        self.detector({"stage": "before"})
+        self.assertEqual(self.detector.queries, {})
+
+        with self.detector:
+
+            self.detector({"stage": "after"})
+            self.assertEqual(self.detector.queries, {})
+
+            Unit.many().retrieve()
+            self.assertEqual(self.detector.queries, {})
+
+            test = Test.one(name="moar")
+            test.unit.name
+
+        self.assertEqual(self.detector.queries, {
+            ("TestDetector", "unit", "retrieve", "id"): [("1", f"{__file__}:{self.test___call__.__code__.co_firstlineno + 14} in test___call__", "test.unit")]
+        })
+
+    def test_problems(self):
+
+        with self.detector:
+
+            for test in Test.many():
+                test.unit.name
+
+            Unit.one(1).retrieve()
+
+        self.assertEqual(self.detector.problems(), [{
+            "source": "TestDetector",
+            "model": "unit",
+            "action": "retrieve",
+            "field": "id",
+            "count": 3,
+            "sites": [
+                f"{__file__}:{self.test_problems.__code__.co_firstlineno + 5} in test_problems",
+                f"{__file__}:{self.test_problems.__code__.co_firstlineno + 7} in test_problems"
+            ],
+            "relations": ["test.unit"]
+        }])
+
+        with relations.Detector(3) as detector:
+            for test in Test.many():
+                test.unit.name
+
+        self.assertEqual(detector.problems(), [])
+
+        with self.detector:
+            for test in Test.many().prefetch("unit"):
+                test.unit.name
+
+        self.assertEqual(self.detector.problems(), [])
+
+    def test_message(self):
+
+        with self.detector:
+            for unit in Unit.many():
+                unit.test.name
+
+        self.assertEqual(
+            self.detector.message(),
+            f"2 retrieve queries of test by unit_id through unit.test from {__file__}:{self.test_message.__code__.co_firstlineno + 4} in test_message"
+        )
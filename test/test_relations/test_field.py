@@ -129,6 +129,11 @@ class TestField(unittest.TestCase):
         field.value = "1"
         self.assertEqual(field.value, 1)
         self.assertTrue(field.changed)
+        self.assertTrue(field.dirty)
+
+        field.dirty = False
+        field.original = 2
+        self.assertTrue(field.dirty)
 
         field.value = None
         self.assertIsNone(field.value)
@@ -173,6 +178,51 @@ class TestField(unittest.TestCase):
             }
         })
 
+    def test_clone(self):
+
+        field = relations.Field(set, name="test", options=["a", "b"], format=["fancy"])
+        field.value = {"a"}
+        field.filter("b", "has")
+
+        clone = field.clone()
+
+        self.assertIsInstance(clone, relations.Field)
+        self.assertEqual(clone.name, "test")
+        self.assertIs(clone.options, field.options)
+        self.assertIs(clone.format, field.format)
+        self.assertIs(clone._valid, field._valid)
+
+        self.assertEqual(clone.value, {"a"})
+        self.assertIsNot(clone.value, field.value)
+        self.assertEqual(clone.criteria, {"has": ["b"]})
+        self.assertIsNot(clone.criteria, field.criteria)
+
+        clone.value.add("b")
+        clone.filter("a", "has")
+
+        self.assertEqual(field.value, {"a"})
+        self.assertEqual(field.criteria, {"has": ["b"]})
+
+    def test_validator(self):
+
+        field = relations.Field(int, name="id", options=[1, 2])
+        valid = field.validator()
+
+        self.assertEqual(valid(field, "1"), 1)
+        self.assertRaisesRegex(relations.FieldError, "3 not in \[1, 2\] for id", valid, field, 3)
+
+        field = relations.Field(list, name="things", options=[[1], [2]])
+        self.assertEqual(field.validator()(field, [1]), [1])
+
+        field = relations.Field(str, name="name", validation="yep")
+        self.assertRaisesRegex(relations.FieldError, "nope doesn't match yep for name", field.validator(), field, "nope")
+
+        field = relations.Field(int, name="id", validation=lambda value: value > 1)
+        self.assertRaisesRegex(relations.FieldError, "1 invalid for id", field.validator(), field, 1)
+
+        field.validation = 2
+        self.assertEqual(field.validator()(field, 1), 1)
+
     def test_valid(self):
 
         field = relations.Field(int, name="id", none=False)
@@ -219,6 +269,21 @@ class TestField(unittest.TestCase):
         self.assertEqual(field.valid("yepyep"), "yepyep")
         self.assertRaisesRegex(relations.FieldError, "nope invalid for name", field.valid, "nope")
 
+        field = relations.Field(str, name="name")
+        self.assertIsNone(field.valid(None))
+
+        field.none = False
+        self.assertRaisesRegex(relations.FieldError, "None not allowed for name", field.valid, None)
+
+        field.options = ["yep"]
+        self.assertRaisesRegex(relations.FieldError, "nope not in \['yep'\] for name", field.valid, "nope")
+
+    def test_valid_many(self):
+
+        field = relations.Field(int, name="id", options=[1, 2])
+        self.assertEqual(field.valid_many(["1", 2]), [1, 2])
+        self.assertRaisesRegex(relations.FieldError, "3 not in \[1, 2\] for id", field.valid_many, [1, 3])
+
     def test_filter(self):
 
         field = relations.Field(int)
@@ -400,6 +465,26 @@ class TestField(unittest.TestCase):
         field.value = ipaddress.IPv4Address("1.2.3.4")
         self.assertFalse(field.delta())
 
+        field = relations.Field(str, store="name")
+        field.read({"name": "yep"})
+        field.__dict__["value"] = "nope"
+        self.assertFalse(field.delta())
+
+        field.value = "nope"
+        self.assertTrue(field.delta())
+
+        field = relations.Field(dict, store="things")
+        field.read({"things": {"a": [1]}})
+        self.assertFalse(field.delta())
+
+        field.value["a"].append(2)
+        self.assertTrue(field.delta())
+
+        field = relations.Field(set, store="things")
+        field.read({"things": ["a"]})
+        field.value.add("b")
+        self.assertTrue(field.delta())
+
     def test_write(self):
 
         field = relations.Field(int, store="_id", default=-1, refresh=True)
@@ -430,6 +515,7 @@ class TestField(unittest.TestCase):
         field.create(values)
         self.assertEqual(values, {'_id': 1})
         self.assertEqual(field.original, 1)
+        self.assertFalse(field.dirty)
 
         field = relations.Field(int, store="_id")
         field.auto = True
@@ -438,6 +524,48 @@ class TestField(unittest.TestCase):
         self.assertEqual(values, {})
         self.assertIsNone(field.original)
 
+    def test_condition(self):
+
+        field = relations.Field(str, name="name")
+
+        self.assertTrue(field.condition("null", True, [])(None))
+        self.assertFalse(field.condition("null", True, [])("a"))
+
+        condition = field.condition("in", ["a", "b"], [])
+        self.assertTrue(condition("a"))
+        self.assertFalse(condition("c"))
+        self.assertFalse(condition(None))
+
+        self.assertTrue(field.condition("in", [[1], 2], ["a"])([1]))
+
+        self.assertTrue(field.condition("like", "Ni", [])("UNIT"))
+        self.assertTrue(field.condition("start", "Un", [])("UNIT"))
+        self.assertTrue(field.condition("end", "It", [])("UNIT"))
+        self.assertFalse(field.condition("end", "Un", [])("UNIT"))
+
+        self.assertFalse(field.condition("nope", "Un", [])("UNIT"))
+
+    def test_compile(self):
+
+        field = relations.Field(int, store="id")
+        field.filter(1, "gt")
+        field.filter([3, 4], "not_in")
+
+        retrieve = field.compile()
+
+        self.assertTrue(retrieve({"id": 2}))
+        self.assertFalse(retrieve({"id": 1}))
+        self.assertFalse(retrieve({"id": 3}))
+        self.assertFalse(retrieve({"id": None}))
+
+        field = relations.Field(dict, store="things")
+        field.filter("yep", "a__like")
+
+        retrieve = field.compile()
+
+        self.assertTrue(retrieve({"things": {"a": "Yeppers"}}))
+        self.assertFalse(retrieve({"things": {}}))
+
     def test_retrieve(self):
 
         field = relations.Field(str, store="name")
@@ -589,6 +717,7 @@ class TestField(unittest.TestCase):
         field = relations.Field(int, store="_id")
         field.read({"_id": "1"})
         self.assertEqual(field.value, 1)
+        self.assertFalse(field.dirty)
         self.assertFalse(field.delta())
 
         field = relations.Field(str, inject="things__a__b__0____1")
@@ -639,6 +768,7 @@ class TestField(unittest.TestCase):
         field.update(values)
         self.assertEqual(values, {'_id': 1})
         self.assertEqual(field.original, 1)
+        self.assertFalse(field.dirty)
 
         values = {}
         field.update(values)
@@ -1,5 +1,6 @@
 import unittest
 import unittest.mock
+import types
 import relations.unittest
 
 import ipaddress
@@ -28,6 +29,25 @@ class TestModelError(unittest.TestCase):
 
         self.assertEqual(str(error), "whoops: adaisy")
 
+class TestDescending(unittest.TestCase):
+
+    maxDiff = None
+
+    def test___init__(self):
+
+        self.assertEqual(relations.model.Descending((True, 1)).key, (True, 1))
+
+    def test___eq__(self):
+
+        self.assertEqual(relations.model.Descending((True, 1)), relations.model.Descending((True, 1)))
+        self.assertNotEqual(relations.model.Descending((True, 1)), relations.model.Descending((True, 2)))
+
+    def test___lt__(self):
+
+        self.assertLess(relations.model.Descending((True, 2)), relations.model.Descending((True, 1)))
+        self.assertLess(relations.model.Descending((True, 1)), relations.model.Descending((False, None)))
+        self.assertGreater(relations.model.Descending((True, 1)), relations.model.Descending((True, 2)))
+
 
 class People(relations.ModelIdentity):
 
@@ -141,6 +161,21 @@ class Net(ModelTest):
     TITLES = "ip__address"
     INDEX = "ip__address"
 
+class AsyncModelTest(relations.AsyncModel):
+
+    SOURCE = "AsyncTestModel"
+
+class AsyncUnit(AsyncModelTest):
+    id = int
+    name = str
+
+class AsyncTest(AsyncModelTest):
+    id = int
+    unit_id = int
+    name = str
+
+relations.OneToMany(AsyncUnit, AsyncTest, child_field="unit_id", parent_child="test", child_parent="unit")
+
 class TestModelIdentity(unittest.TestCase):
 
     maxDiff = None
@@ -265,6 +300,65 @@ class TestModelIdentity(unittest.TestCase):
 
         self.assertRaisesRegex(relations.FieldError, "field name not list or dict from inject name__value", Inject.thy)
 
+        # compiled once and shared
+
+        self.assertIs(People.thy(), People.thy())
+        self.assertIs(People.thy()._fields, People.thy()._fields)
+
+        people = People()
+        People.thy(people)
+        self.assertIs(people._fields, People.thy()._fields)
+
+        # recompiled when relationships change
+
+        class Cached(relations.Model):
+            id = int
+            name = str
+
+        cached = Cached.thy()
+
+        relation = unittest.mock.MagicMock()
+        relation.child_parent = "unittest"
+        Cached._parent(relation)
+
+        self.assertIsNot(Cached.thy(), cached)
+        self.assertEqual(Cached.thy().PARENTS, {"unittest": relation})
+
+        # recompiled when the source changes
+
+        class Sourced(relations.ModelIdentity):
+            SOURCE = "CachedSource"
+            id = int
+
+        sourced = Sourced.thy()
+        self.assertIs(Sourced.thy(), sourced)
+
+        source = relations.unittest.MockSource("CachedSource")
+        self.assertIsNot(Sourced.thy(), sourced)
+        self.assertEqual(source.data, {"sourced": {}})
+
+        del relations.SOURCES["CachedSource"]
+
+        # whatever the source's init sets, instances get too
+
+        class TableSource(relations.unittest.MockSource):
+
+            def init(self, model):
+                super().init(model)
+                model.TABLE = f"{model.NAME}_tbl"
+
+        class Tabled(relations.Model):
+            SOURCE = "TableSource"
+            id = int
+            name = str
+
+        TableSource("TableSource")
+
+        self.assertEqual(Tabled.thy().TABLE, "tabled_tbl")
+        self.assertEqual(Tabled(name="a").TABLE, "tabled_tbl")
+
+        del relations.SOURCES["TableSource"]
+
     def test__field_name(self):
 
         stuff = Stuff()
@@ -285,6 +379,24 @@ class TestModelIdentity(unittest.TestCase):
 
         self.assertRaisesRegex(relations.ModelError, "unknown sort field nope", stuff._ordering, "nope")
 
+    def test__sorter(self):
+
+        key = relations.Model._sorter(["+a", "-b__c"], lambda item, name: item[name])
+
+        items = [
+            {"a": 1, "b": {"c": 1}},
+            {"a": None, "b": {"c": 2}},
+            {"a": 1, "b": {"c": 3}},
+            {"a": 0, "b": {}}
+        ]
+
+        self.assertEqual(sorted(items, key=key), [
+            {"a": None, "b": {"c": 2}},
+            {"a": 0, "b": {}},
+            {"a": 1, "b": {"c": 3}},
+            {"a": 1, "b": {"c": 1}}
+        ])
+
     def test__ancestor(self):
 
         test = Test.thy()
@@ -474,6 +586,9 @@ class TestModel(unittest.TestCase):
 
         model = Run(_chunk=5)
         self.assertEqual(model._chunk, 5)
+
+        model = Run.many(_titled={})
+        self.assertEqual(model._titled, {})
         self.assertEqual(model._record._names["status"].options, ["pass", "fail"])
 
         # read
@@ -574,6 +689,18 @@ class TestModel(unittest.TestCase):
         self.assertTrue(models._bulk)
         self.assertEqual(models._size, 4)
 
+    def test__fielded(self):
+
+        model = Net()
+
+        self.assertEqual(model._fieldset, frozenset(["id", "ip"]))
+
+        self.assertTrue(model._fielded("ip"))
+        self.assertTrue(model._fielded("ip__address"))
+        self.assertFalse(model._fielded("ip__Address"))
+        self.assertFalse(model._fielded("nope"))
+        self.assertFalse(model._fielded("nope__address"))
+
     def test___setattr__(self):
 
         # model
@@ -1068,6 +1195,7 @@ class TestModel(unittest.TestCase):
 
         self.assertEqual(test.unit._related, {"id": None})
         self.assertEqual(test.unit._role, "parent")
+        self.assertEqual(test.unit._through, "test.unit")
         self.assertEqual(test.unit._mode, "one")
         self.assertEqual(test.unit._action, "retrieve")
         self.assertEqual(test.unit._record._action, "retrieve")
@@ -1088,6 +1216,7 @@ class TestModel(unittest.TestCase):
 
         self.assertEqual(unit.test._related, {"unit_id": None})
         self.assertEqual(unit.test._role, "child")
+        self.assertEqual(unit.test._through, "unit.test")
         self.assertEqual(unit.test._mode, "many")
         self.assertEqual(unit.test._action, "create")
 
@@ -1399,6 +1528,9 @@ class TestModel(unittest.TestCase):
         units = Unit([["ya"], ["sure"], ["whatever"]]).create().sort("name")
         self.assertEqual(units.name, ["sure", "whatever", "ya"])
 
+        metas = Meta([["yep", True], ["sure", False], ["fine", True], ["ok"]]).create().sort("-flag", "name")
+        self.assertEqual(metas.name, ["fine", "yep", "sure", "ok"])
+
         self.assertRaisesRegex(relations.ModelError, "unit: unknown sort field nope", Unit.many().sort, "nope")
         self.assertRaisesRegex(relations.ModelError, "unit: cannot sort one", Unit.one(name="ya").retrieve().sort)
 
@@ -1424,6 +1556,136 @@ class TestModel(unittest.TestCase):
 
         self.assertRaisesRegex(relations.ModelError, "unit: can only limit retrieve", Unit.one(name="ya").retrieve().limit)
 
+    def test__project(self):
+
+        meta = Meta.many()
+
+        meta._project(["name"])
+        self.assertEqual(meta._only, ["id", "name"])
+
+        meta._project(["push"])
+        self.assertEqual(meta._only, ["id", "stuff", "push"])
+
+    def test_only(self):
+
+        Meta("yep", True, 1.1, {"people"}, things={"a": 1}).create()
+
+        meta = Meta.many().only("name", "flag")
+        self.assertEqual(meta._only, ["id", "name", "flag"])
+        self.assertEqual(meta.query().fields, ["id", "name", "flag"])
+
+        meta = meta[0]
+        self.assertEqual(meta._only, ["id", "name", "flag"])
+        self.assertEqual(meta.name, "yep")
+        self.assertTrue(meta.flag)
+        self.assertIsNone(meta.spend)
+        self.assertIsNone(meta.things)
+
+        meta.name = "sure"
+        meta.spend = 2.2
+        meta.update()
+
+        self.assertEqual(self.source.data["meta"][1]["name"], "sure")
+        self.assertEqual(self.source.data["meta"][1]["spend"], 2.2)
+        self.assertEqual(self.source.data["meta"][1]["things"], {"a": 1})
+
+        meta = Meta.one(name="sure").only("spend").retrieve()
+        self.assertEqual(meta.id, 1)
+        self.assertEqual(meta.spend, 2.2)
+        self.assertIsNone(meta.name)
+
+        self.assertRaisesRegex(relations.ModelError, "meta: unknown field nope", Meta.many().only, "nope")
+        self.assertRaisesRegex(relations.ModelError, "meta: can only project retrieve", Meta().only, "name")
+
+    def test_defer(self):
+
+        Meta("yep", True, 1.1, {"people"}, things={"a": 1}).create()
+
+        meta = Meta.many().defer("people", "stuff", "things", "push")
+        self.assertEqual(meta._only, ["id", "name", "flag", "spend"])
+
+        meta = meta.defer("flag")[0]
+        self.assertEqual(meta.name, "yep")
+        self.assertEqual(meta.spend, 1.1)
+        self.assertIsNone(meta.flag)
+        self.assertIsNone(meta.things)
+
+        self.assertEqual(Meta.many().only("name", "flag").defer("flag")._only, ["id", "name"])
+
+        self.assertRaisesRegex(relations.ModelError, "meta: unknown field nope", Meta.many().defer, "nope")
+        self.assertRaisesRegex(relations.ModelError, "meta: cannot defer id id", Meta.many().defer, "id")
+        self.assertRaisesRegex(relations.ModelError, "meta: can only defer retrieve", Meta().defer, "name")
+
+    def test_prefetch(self):
+
+        unit = Unit("people")
+        unit.test.add("stuff").add("things")
+        unit.create()
+        Unit("nobody").create()
+
+        tests = Test.many().prefetch("unit", "case")
+        self.assertEqual(tests._prefetch, ["unit", "case"])
+
+        with unittest.mock.patch.object(self.source, "retrieve", wraps=self.source.retrieve) as retrieve:
+
+            tests.retrieve()
+            self.assertEqual(retrieve.call_count, 3)
+
+            self.assertEqual([test.unit.name for test in tests], ["people", "people"])
+            self.assertEqual([len(test.case) for test in tests], [0, 0])
+            self.assertEqual(retrieve.call_count, 3)
+
+        self.assertIs(tests[0].unit, tests[1].unit)
+
+        units = Unit.many().prefetch("test")
+        self.assertEqual([unit.test.name for unit in units], [[], ["stuff", "things"]])
+
+        unit = Unit.one(name="people").prefetch("test")
+        self.assertEqual(unit.test.name, ["stuff", "things"])
+
+        self.assertRaisesRegex(relations.ModelError, "unit: unknown relation nope", Unit.many().prefetch, "nope")
+        self.assertRaisesRegex(relations.ModelError, "unit: can only prefetch retrieve", Unit("nope").prefetch, "test")
+
+    def test__prefetching(self):
+
+        unit = Unit("people")
+        unit.test.add("stuff").add("things")
+        unit.create()
+
+        tests = Test.many().prefetch("unit", "case").retrieve()
+
+        queries = tests._prefetching()
+
+        self.assertEqual([(name, relation) for name, relation, _ in queries], [("unit", Test.PARENTS["unit"]), ("case", Test.CHILDREN["case"])])
+        self.assertEqual(queries[0][2]._record._names["id"].criteria, {"in": [1]})
+        self.assertEqual(queries[1][2]._record._names["test_id"].criteria, {"in": [1, 2]})
+        self.assertEqual(queries[1][2]._action, "retrieve")
+
+        self.assertEqual(Unit.many().prefetch("test").retrieve()._prefetching()[0][2]._record._names["unit_id"].criteria, {"in": [1]})
+        self.assertEqual(Unit.many(name="nope").prefetch("test").retrieve()._prefetching(), [])
+
+    def test__prefetched(self):
+
+        unit = Unit("people")
+        unit.test.add("stuff")
+        unit.create()
+        Unit("nobody").create()
+
+        tests = Test.many().retrieve()
+        tests._prefetched("unit", Test.PARENTS["unit"], Unit.many(id__in=[1]).retrieve())
+
+        self.assertEqual(tests[0]._parents["unit"].name, "people")
+        self.assertEqual(tests[0]._parents["unit"]._role, "parent")
+        self.assertEqual(tests[0]._parents["unit"]._related, {"id": 1})
+
+        units = Unit.many().retrieve()
+        units._prefetched("test", Unit.CHILDREN["test"], Test.many(unit_id__in=[1, 2]).retrieve())
+
+        self.assertEqual(units[0]._children["test"]._models, [])
+        self.assertEqual(units[1]._children["test"].name, ["stuff"])
+        self.assertEqual(units[1]._children["test"]._role, "child")
+        self.assertEqual(units[1]._children["test"]._action, "update")
+
     def test_set(self):
 
         model = UnitTest().set("unit")
@@ -1524,6 +1786,74 @@ class TestModel(unittest.TestCase):
             "index": {}
         }])
 
+    def test__cached(self):
+
+        self.assertEqual(Unit.many()._cached("count"), (None, None))
+
+        self.source.cache = relations.Cache()
+
+        cache, key = Unit.many(name="yep")._cached("count", [], {})
+        self.assertIs(cache, self.source.cache)
+        self.assertEqual(key, cache.key(Unit.many(name="yep"), "count", [], {}))
+
+        self.assertEqual(Unit("yep")._cached("count"), (None, None))
+        self.assertEqual(Unit.many(_titled={})._cached("titles"), (None, None))
+        self.assertEqual(Test.many(unit__name="yep")._cached("count"), (None, None))
+
+    def test__snapshot(self):
+
+        Unit([["yep"], ["sure"]]).create()
+
+        unit = Unit.one(name="yep").retrieve()
+        record, records, overflow = unit._snapshot()
+        self.assertIsNot(record, unit._record)
+        self.assertEqual(record.name, "yep")
+        self.assertIsNone(records)
+        self.assertFalse(overflow)
+
+        units = Unit.many().limit(1).retrieve()
+        record, records, overflow = units._snapshot()
+        self.assertIsNone(record)
+        self.assertEqual([each.name for each in records], ["sure"])
+        self.assertTrue(overflow)
+
+    def test__restore(self):
+
+        Unit([["yep"], ["sure"]]).create()
+
+        snapshot = Unit.one(name="yep").retrieve()._snapshot()
+
+        unit = Unit.one(name="yep")
+        self.assertIs(unit._restore(snapshot), unit)
+        self.assertEqual(unit._action, "update")
+        self.assertEqual(unit.id, 1)
+        self.assertIsNot(unit._record, snapshot[0])
+
+        snapshot = Unit.many().sort("-name").limit(1).retrieve()._snapshot()
+
+        units = Unit.many().sort("-name").limit(1)._restore(snapshot)
+        self.assertEqual(units.name, ["yep"])
+        self.assertIsNone(units._sort)
+        self.assertTrue(units.overflow)
+
+        units[0].name = "whatever"
+        self.assertEqual(snapshot[1][0].name, "yep")
+
+    def test__invalidate(self):
+
+        Unit._invalidate()
+
+        self.source.cache = relations.Cache()
+        self.source.cache.set("yep", 1, ["unit"])
+        self.source.cache.set("sure", 2, ["test", "unit"])
+        self.source.cache.set("whatever", 3, ["case", "test", "unit"])
+
+        Test._invalidate()
+        self.assertEqual(list(self.source.cache.results), ["yep"])
+
+        Unit("yep")._invalidate()
+        self.assertEqual(self.source.cache.results, {})
+
     def test_create(self):
 
         Unit("yep").create()
@@ -1532,6 +1862,69 @@ class TestModel(unittest.TestCase):
         unit = Unit.one(0)
         self.assertRaisesRegex(relations.ModelError, "unit: cannot create during retrieve", unit.create)
 
+    def test__batch(self):
+
+        rows = iter([("people",), {"name": "stuff"}, ("things",)])
+
+        self.assertEqual(Unit._batch(rows, ["name"], 2), [{"name": "people"}, {"name": "stuff"}])
+        self.assertEqual(Unit._batch(rows, ["name"], 2), [{"name": "things"}])
+        self.assertEqual(Unit._batch(rows, ["name"], 2), [])
+
+        self.assertRaisesRegex(relations.ModelError, "unit: cannot insert field id", Unit._batch, iter([{"id": 1}]), ["name"], 2)
+        self.assertRaisesRegex(relations.ModelError, "unit: too many values", Unit._batch, iter([(1, 2)]), ["name"], 2)
+
+    def test__column(self):
+
+        field = relations.Field(int, name="id", default=-1)
+
+        self.assertEqual(Unit._column(field, [{"id": "1"}, {}, {"id": 2}]), [1, -1, 2])
+        self.assertEqual(Unit._column(field, []), [])
+
+        field = relations.Field(dict, name="things")
+        self.assertEqual(Unit._column(field, [{}]), [{}])
+
+    def test__inserts(self):
+
+        inserts = Unit._inserts([("people",), {"name": "stuff"}, ("things",)], 2)
+
+        thy, values = next(inserts)
+        self.assertEqual(thy.NAME, "unit")
+        self.assertEqual(values, [{"name": "people"}, {"name": "stuff"}])
+
+        thy, values = next(inserts)
+        self.assertEqual(values, [{"name": "things"}])
+
+        self.assertRaises(StopIteration, next, inserts)
+
+    def test_insert(self):
+
+        Meta("yep", True, 3.50, {"tom"}, [1, None], {"a": 1, "for": [{"1": "yep"}]}, "sure").create()
+        created = self.source.data["meta"][1]
+
+        self.assertEqual(Meta.insert([
+            ("dive", True, 3.50, {"tom"}, [1, None], {"a": 1, "for": [{"1": "yep"}]}, "sure"),
+            {"name": "deep", "people": ["tom"]}
+        ], 1), 2)
+
+        self.assertEqual(self.source.data["meta"][2], {**created, "id": 2, "name": "dive"})
+        self.assertEqual(self.source.data["meta"][3], {
+            "id": 3,
+            "name": "deep",
+            "flag": None,
+            "spend": None,
+            "people": ["tom"],
+            "stuff": [{"relations.io": {"1": None}}],
+            "things": {},
+            "things__for__0____1": None
+        })
+        self.assertEqual(Meta.one(name="deep").people, {"tom"})
+
+        self.assertEqual(Meta.insert(iter([])), 0)
+
+        self.assertRaisesRegex(relations.ModelError, "meta: cannot insert field id", Meta.insert, [{"id": 4}])
+        self.assertRaisesRegex(relations.ModelError, "meta: too many values", Meta.insert, [tuple(range(8))])
+        self.assertRaisesRegex(relations.FieldError, "None not allowed for status", Run.insert, [{"status": None}])
+
     def test_count(self):
 
         self.assertEqual(Unit.many(name="yep").count(), 0)
@@ -1542,6 +1935,19 @@ class TestModel(unittest.TestCase):
         unit = Unit("sure")
         self.assertRaisesRegex(relations.ModelError, "unit: cannot count during create", unit.count)
 
+        self.source.cache = relations.Cache()
+
+        with unittest.mock.patch.object(self.source, "count", wraps=self.source.count) as count:
+
+            self.assertEqual(Unit.many(name="yep").count(), 1)
+            self.assertEqual(Unit.many(name="yep").count(), 1)
+            self.assertEqual(count.call_count, 1)
+
+            Unit("sure").create()
+
+            self.assertEqual(Unit.many(name="yep").count(), 1)
+            self.assertEqual(Unit.many().count(), 2)
+
     def test_retrieve(self):
 
         self.assertIsNone(Unit.one(name="yep").retrieve(False))
@@ -1552,6 +1958,62 @@ class TestModel(unittest.TestCase):
         unit = Unit("sure")
         self.assertRaisesRegex(relations.ModelError, "unit: cannot retrieve during create", unit.retrieve)
 
+        unit.create()
+        unit.test.add("moar").add("less")
+        unit.update()
+
+        with relations.Session() as session:
+
+            unit = Unit.one(2).retrieve()
+            self.assertIs(session.models[("unit", 2)], unit)
+
+            with unittest.mock.patch.object(self.source, "retrieve", wraps=self.source.retrieve) as retrieve:
+
+                self.assertIs(Unit.one(2).retrieve(), unit)
+
+                tests = Test.many().retrieve()
+                self.assertEqual(tests[0].unit.name, "sure")
+                self.assertIs(tests[0].unit._record, unit._record)
+                self.assertEqual(tests[1].unit.id, 2)
+                self.assertIs(tests[1].unit._record, unit._record)
+
+                self.assertEqual(retrieve.call_count, 1)
+
+            self.assertIs(Unit.many(name="sure").retrieve()[0], unit)
+
+        self.source.cache = relations.Cache()
+
+        with unittest.mock.patch.object(self.source, "retrieve", wraps=self.source.retrieve) as retrieve:
+
+            units = Unit.many().sort("-name").retrieve()
+            self.assertEqual(units.name, ["yep", "sure"])
+
+            units = Unit.many().sort("-name").retrieve()
+            self.assertEqual(units.name, ["yep", "sure"])
+            self.assertEqual(retrieve.call_count, 1)
+
+            self.assertEqual(Unit.one(name="sure").name, "sure")
+            self.assertEqual(Unit.one(name="sure").name, "sure")
+            self.assertEqual(retrieve.call_count, 2)
+
+            Unit.one(name="sure").set(name="whatever").update()
+
+            self.assertEqual(Unit.many().sort("-name").retrieve().name, ["yep", "whatever"])
+            self.assertEqual(retrieve.call_count, 3)
+
+    def test_iterate(self):
+
+        Unit([["yep"], ["sure"], ["fine"]]).create()
+
+        iterating = Unit.many().iterate(2)
+
+        self.assertIsInstance(iterating, types.GeneratorType)
+        self.assertEqual([unit.name for unit in iterating], ["fine", "sure", "yep"])
+        self.assertEqual([unit.id for unit in Unit.many(name__not_eq="sure").iterate()], [3, 1])
+
+        unit = Unit("sure")
+        self.assertRaisesRegex(relations.ModelError, "unit: cannot iterate during create one", unit.iterate)
+
     def test_titles(self):
 
         Unit("yep").create()
@@ -1560,6 +2022,28 @@ class TestModel(unittest.TestCase):
         unit = Unit("sure")
         self.assertRaisesRegex(relations.ModelError, "unit: cannot titles during create", unit.titles)
 
+        self.source.cache = relations.Cache()
+
+        unit = Unit.one(name="yep")
+        unit.test.add("sure")
+        unit.update()
+
+        with unittest.mock.patch.object(self.source, "titles", wraps=self.source.titles) as titles:
+
+            self.assertEqual(Test.many().titles().titles, {1: ["yep", "sure"]})
+
+            cached = Test.many().titles()
+            self.assertEqual(cached.titles, {1: ["yep", "sure"]})
+            self.assertEqual(titles.call_count, 2)
+
+            cached.titles[1] = ["nope"]
+            self.assertEqual(Test.many().titles().titles, {1: ["yep", "sure"]})
+
+            Unit.many().set(name="whatever").update()
+
+            self.assertEqual(Test.many().titles().titles, {1: ["whatever", "sure"]})
+            self.assertEqual(titles.call_count, 4)
+
     def test_update(self):
 
         unit = Unit("yep").create()
@@ -1573,6 +2057,19 @@ class TestModel(unittest.TestCase):
         unit = Unit("sure")
         self.assertRaisesRegex(relations.ModelError, "unit: cannot update during create", unit.update)
 
+        unit.create()
+
+        with relations.Session() as session:
+
+            unit = Unit.one(2).retrieve()
+            unit.name = "yep"
+            unit.update()
+            self.assertEqual(session.models, {})
+
+            Unit.many().retrieve()
+            Unit.many(name="whatever").set(name="sure").update()
+            self.assertEqual(session.models, {})
+
     def test_delete(self):
 
         unit = Unit("yep").create()
@@ -1586,6 +2083,17 @@ class TestModel(unittest.TestCase):
         unit = Unit("sure")
         self.assertRaisesRegex(relations.ModelError, "unit: cannot delete during create", unit.delete)
 
+        Unit([["yep"], ["sure"]]).create()
+
+        with relations.Session() as session:
+
+            Unit.one(3).delete()
+            self.assertEqual(list(session.models), [])
+
+            Unit.many().retrieve()
+            Unit.many(name="sure").delete()
+            self.assertEqual(session.models, {})
+
     def test_query(self):
 
         unit = Unit("yep")
@@ -1629,3 +2137,261 @@ class TestModel(unittest.TestCase):
         query = unit.query()
         self.assertEqual(query.action, "RETRIEVE")
         self.assertEqual(query.model, unit)
+
+
+class TestAsyncModel(unittest.IsolatedAsyncioTestCase):
+
+    maxDiff = None
+
+    def setUp(self):
+
+        self.source = relations.unittest.AsyncMockSource("AsyncTestModel")
+
+    def tearDown(self):
+
+        del relations.SOURCES["AsyncTestModel"]
+
+    async def test__ensure(self):
+
+        unit = AsyncUnit.one(name="people")
+
+        self.assertRaisesRegex(relations.ModelError, "async_unit: need to retrieve", unit._ensure)
+
+        unit = AsyncUnit.many().set(name="people")
+
+        self.assertRaisesRegex(relations.ModelError, "async_unit: need to update", unit._ensure)
+
+        AsyncUnit("people")._ensure()
+
+    async def test__propagate(self):
+
+        unit = AsyncUnit("people")
+        unit.test.add("stuff")
+        await unit.create()
+
+        unit = await AsyncUnit.one(name="people").retrieve()
+        unit.test
+        unit.id = 2
+        self.assertIsNone(unit._children["test"])
+
+        unit = AsyncUnit("things")
+        unit.test.add("stuff")
+        unit.id = 3
+        self.assertEqual(unit.test[0].unit_id, 3)
+
+    async def test___len__(self):
+
+        await AsyncUnit("people").create()
+
+        def count():
+            len(AsyncUnit.many())
+
+        self.assertRaisesRegex(relations.ModelError, "async_unit: need to count", count)
+
+        self.assertEqual(len(await AsyncUnit.many().retrieve()), 1)
+        self.assertRaisesRegex(relations.ModelError, "async_unit: need to retrieve", len, AsyncUnit.one())
+        self.assertEqual(len(await AsyncUnit.one().retrieve()), 2)
+
+    async def test___aiter__(self):
+
+        await AsyncUnit.insert([("people",), ("stuff",)])
+
+        self.assertEqual([unit.name async for unit in AsyncUnit.many()], ["people", "stuff"])
+
+        units = await AsyncUnit.many().retrieve()
+        self.assertEqual([unit.id async for unit in units], [1, 2])
+
+    async def test_set(self):
+
+        await AsyncUnit("people").create()
+
+        self.assertRaisesRegex(relations.ModelError, "async_unit: need to retrieve", AsyncUnit.one().set, name="stuff")
+
+        self.assertEqual(await AsyncUnit.many().set(name="stuff").update(), 1)
+        self.assertEqual((await AsyncUnit.one().retrieve()).name, "stuff")
+
+    async def test_add(self):
+
+        # Bulk inserts aren't created implicitly, as that would need awaiting
+
+        with unittest.mock.patch.object(relations.AsyncModel, "create") as create:
+            units = AsyncUnit.bulk(2).add("people").add("stuff").add("things")
+            create.assert_not_called()
+
+        self.assertEqual(len(units._models), 3)
+        self.assertEqual(await AsyncUnit.many().count(), 0)
+
+        await units.create()
+
+        self.assertEqual(units._models, [])
+        self.assertEqual(await AsyncUnit.many().count(), 3)
+
+    async def test_create(self):
+
+        unit = AsyncUnit("people")
+        unit.test.add("stuff")
+
+        self.assertIs(await unit.create(), unit)
+        self.assertEqual(unit.id, 1)
+        self.assertEqual(unit._action, "update")
+        self.assertEqual(unit.test[0].id, 1)
+        self.assertEqual(unit.test[0].unit_id, 1)
+
+        unit = await AsyncUnit.one(id=1).retrieve()
+
+        with self.assertRaisesRegex(relations.ModelError, "async_unit: cannot create during retrieve"):
+            await AsyncUnit.many().create()
+
+    async def test_insert(self):
+
+        self.assertEqual(await AsyncUnit.insert([{"name": "people"}, ("stuff",), ("things",)], size=2), 3)
+        self.assertEqual(await AsyncUnit.many().count(), 3)
+
+    async def test_count(self):
+
+        await AsyncUnit.insert([("people",), ("stuff",)])
+
+        self.assertEqual(await AsyncUnit.many().count(), 2)
+        self.assertEqual(await AsyncUnit.many(name="people").count(), 1)
+
+        with self.assertRaisesRegex(relations.ModelError, "async_unit: cannot count during create"):
+            await AsyncUnit("things").count()
+
+        self.source.cache = relations.Cache()
+
+        with unittest.mock.patch.object(self.source, "count", wraps=self.source.count) as count:
+
+            self.assertEqual(await AsyncUnit.many().count(), 2)
+            self.assertEqual(await AsyncUnit.many().count(), 2)
+            self.assertEqual(count.call_count, 1)
+
+            await AsyncUnit.insert([("things",)])
+
+            self.assertEqual(await AsyncUnit.many().count(), 3)
+            self.assertEqual(count.call_count, 2)
+
+    async def test_retrieve(self):
+
+        unit = AsyncUnit("people")
+        unit.test.add("stuff").add("things")
+        await unit.create()
+
+        unit = await AsyncUnit.one(name="people").retrieve()
+        self.assertEqual(unit.id, 1)
+
+        self.assertRaisesRegex(relations.ModelError, "async_test: need to count", len, unit.test)
+        self.assertEqual([test.name async for test in unit.test], ["stuff", "things"])
+
+        tests = await AsyncTest.many().prefetch("unit").retrieve()
+        self.assertEqual(tests[0].unit.name, "people")
+        self.assertIs(tests[0].unit, tests[1].unit)
+
+        units = await AsyncUnit.many().prefetch("test").retrieve()
+        self.assertEqual(units[0].test.name, ["stuff", "things"])
+
+        with self.assertRaisesRegex(relations.ModelError, "async_unit: none retrieved"):
+            await AsyncUnit.one(name="nope").retrieve()
+
+        self.assertIsNone(await AsyncUnit.one(name="nope").retrieve(False))
+
+        with relations.Session() as session:
+
+            unit = await AsyncUnit.one(1).retrieve()
+            self.assertIs(await AsyncUnit.one(1).retrieve(), unit)
+
+            tests = await AsyncTest.many().retrieve()
+            self.assertIs((await tests[0].unit.retrieve())._record, unit._record)
+
+        with self.assertRaisesRegex(relations.ModelError, "async_unit: cannot retrieve during update"):
+            await unit.retrieve()
+
+        self.source.cache = relations.Cache()
+
+        self.assertEqual((await AsyncTest.many().retrieve()).name, ["stuff", "things"])
+        self.assertEqual((await AsyncTest.many().retrieve()).name, ["stuff", "things"])
+        self.assertEqual(len(self.source.cache.results), 1)
+
+        await AsyncTest.many(name="stuff").delete()
+
+        self.assertEqual(self.source.cache.results, {})
+        self.assertEqual((await AsyncTest.many().retrieve()).name, ["things"])
+
+    async def test_iterate(self):
+
+        await AsyncUnit.insert([("yep",), ("sure",), ("fine",)])
+
+        iterating = AsyncUnit.many().iterate(2)
+
+        self.assertIsInstance(iterating, types.AsyncGeneratorType)
+        self.assertEqual([unit.name async for unit in iterating], ["fine", "sure", "yep"])
+
+        with unittest.mock.patch.object(self.source, "retrieve_iter", wraps=self.source.retrieve_iter) as retrieve_iter:
+            self.assertEqual([unit.id async for unit in AsyncUnit.many(name__not_eq="sure").iterate()], [3, 1])
+            self.assertEqual(retrieve_iter.call_args.args[1], AsyncUnit.CHUNK)
+
+        self.assertRaisesRegex(relations.ModelError, "async_unit: cannot iterate during create one", AsyncUnit("sure").iterate)
+
+    async def test_titles(self):
+
+        unit = AsyncUnit("people")
+        unit.test.add("stuff")
+        await unit.create()
+
+        titles = await AsyncTest.many().titles()
+
+        self.assertEqual(titles.fields, ["unit_id", "name"])
+        self.assertEqual(titles.titles, {1: ["people", "stuff"]})
+
+        with self.assertRaisesRegex(relations.ModelError, "async_unit: cannot titles during create"):
+            await AsyncUnit("things").titles()
+
+        self.source.cache = relations.Cache()
+
+        self.assertEqual((await AsyncTest.many().titles()).titles, {1: ["people", "stuff"]})
+
+        await AsyncUnit.many().set(name="things").update()
+
+        self.assertEqual((await AsyncTest.many().titles()).titles, {1: ["things", "stuff"]})
+
+        # Parents that aren't there have empty titles rather than being looked up again
+
+        await AsyncTest.insert([{"unit_id": 9, "name": "orphan"}])
+
+        self.assertEqual((await AsyncTest.many(name="orphan").titles()).titles, {2: [None, "orphan"]})
+
+    async def test_update(self):
+
+        unit = await AsyncUnit("people").create()
+        unit.name = "stuff"
+
+        self.assertEqual(await unit.update(), 1)
+        self.assertEqual((await AsyncUnit.one().retrieve()).name, "stuff")
+
+        self.assertEqual(await AsyncUnit.many(name="stuff").set(name="things").update(), 1)
+        self.assertEqual(await AsyncUnit.many(name="things").count(), 1)
+
+        with self.assertRaisesRegex(relations.ModelError, "async_unit: cannot update during create"):
+            await AsyncUnit("nope").update()
+
+        with relations.Session() as session:
+
+            unit = await AsyncUnit.one(1).retrieve()
+            await unit.update()
+            self.assertEqual(session.models, {})
+
+    async def test_delete(self):
+
+        await AsyncUnit.insert([("people",), ("stuff",), ("things",)])
+
+        self.assertEqual(await AsyncUnit.one(name="people").delete(), 1)
+        self.assertEqual(await AsyncUnit.many(name="stuff").delete(), 1)
+        self.assertEqual(await AsyncUnit.many().count(), 1)
+
+        with self.assertRaisesRegex(relations.ModelError, "async_unit: cannot delete during create"):
+            await AsyncUnit("nope").delete()
+
+        with relations.Session() as session:
+
+            await AsyncUnit.many().retrieve()
+            await AsyncUnit.one(3).delete()
+            self.assertEqual(session.models, {})
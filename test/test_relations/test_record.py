@@ -165,6 +165,22 @@ class TestRecord(unittest.TestCase):
             }
         ])
 
+    def test_clone(self):
+
+        self.record._action = "update"
+        self.record.name = "unit"
+
+        record = self.record.clone()
+
+        self.assertEqual(record._action, "update")
+        self.assertEqual(list(record), ["id", "name"])
+        self.assertIsNot(record._names["name"], self.name)
+        self.assertIs(record._order[1], record._names["name"])
+        self.assertEqual(record.name, "unit")
+
+        record.name = "test"
+        self.assertEqual(self.record.name, "unit")
+
     def test_filter(self):
 
         self.meta = relations.Field(dict, name="meta")
@@ -222,6 +238,21 @@ class TestRecord(unittest.TestCase):
 
         self.assertEqual(self.record.create({}), {"_id": 1, "_name": "unit", "_things": {"a":{"b": [{"1": "yep"}]}}})
 
+    def test_compile(self):
+
+        self.record.filter("id", "1")
+
+        retrieve = self.record.compile()
+
+        self.assertIs(self.record.compile(), retrieve)
+        self.assertTrue(retrieve({"_id": 1, "_name": "test"}))
+
+        self.record.filter("name", "unit")
+
+        self.assertIsNot(self.record.compile(), retrieve)
+        self.assertFalse(self.record.compile()({"_id": 1, "_name": "test"}))
+        self.assertIsNone(self.record.clone()._retrieve)
+
     def test_retrieve(self):
 
         self.record.filter("id", "1")
@@ -258,6 +289,13 @@ class TestRecord(unittest.TestCase):
         self.assertEqual(self.record.things, {"a":{"b": [{"1": "yep"}]}})
         self.assertEqual(self.record.push, "yep")
 
+        record = self.record.clone()
+        record.read({"_id": 2, "_name": "moar", "_things": {"a":{"b": [{"1": "sure"}]}}}, ["id", "push"])
+
+        self.assertEqual(record.id, 2)
+        self.assertEqual(record.name, "unit")
+        self.assertEqual(record.push, "sure")
+
     def test_update(self):
 
         self.things = relations.Field(dict, name="things", store="_things", default=dict)
@@ -277,6 +315,18 @@ class TestRecord(unittest.TestCase):
 
         self.assertEqual(self.record.update({}), {"_id": 1, "_name": "unit", "_things": {"a":{"b": [{"1": "yep"}]}}})
 
+        record = relations.Record()
+        record.append(relations.Field(int, name="id", store="_id"))
+        record.append(relations.Field(str, name="name", store="_name"))
+        record.append(relations.Field(set, name="people", store="_people"))
+
+        record.read({"_id": 2, "_name": "unit", "_people": ["a"]}, ["id", "name"])
+
+        self.assertEqual(record.update({}), {})
+
+        record.people = {"b"}
+        self.assertEqual(record.update({}), {"_people": ["b"]})
+
     def test_mass(self):
 
         self.things = relations.Field(dict, name="things", store="_things", default=dict)
@@ -0,0 +1,167 @@
+"""
+Unittests for Session
+"""
+
+import unittest
+import unittest.mock
+
+import relations
+import relations.unittest
+
+class SessionModel(relations.Model):
+    SOURCE = "TestSession"
+
+class Unit(SessionModel):
+    id = int
+    name = str
+
+class Test(SessionModel):
+    id = int
+    unit_id = int
+    name = str
+
+relations.OneToMany(Unit, Test)
+
+class Plain(SessionModel):
+    ID = None
+    name = str
+
+class TestSession(unittest.TestCase):
+
+    maxDiff = None
+
+    def setUp(self):
+
+        self.source = relations.unittest.MockSource("TestSession")
+
+        self.session = relations.Session()
+
+    def tearDown(self):
+
+        del relations.SOURCES["TestSession"]
+
+    def test___init__(self):
+
+        self.assertEqual(self.session.models, {})
+        self.assertEqual(self.session.tokens, [])
+
+    def test___enter__(self):
+
+        self.assertIsNone(relations.session())
+
+        with self.session as session:
+
+            self.assertIs(session, self.session)
+            self.assertIs(relations.session(), self.session)
+
+            with relations.Session() as inner:
+                self.assertIs(relations.session(), inner)
+
+            self.assertIs(relations.session(), self.session)
+
+    def test___exit__(self):
+
+        with self.session:
+            with self.session:
+                self.assertIs(relations.session(), self.session)
+            self.assertIs(relations.session(), self.session)
+
+        self.assertIsNone(relations.session())
+        self.assertEqual(self.session.tokens, [])
+
+    def test_key(self):
+
+        self.assertEqual(self.session.key(Unit(id=1, name="people")), ("unit", 1))
+
+    def test_identity(self):
+
+        self.assertEqual(self.session.identity(Unit.one(1)), 1)
+        self.assertEqual(self.session.identity(Unit.one(id=2)), 2)
+
+        self.assertIsNone(self.session.identity(Unit.many(id=1)))
+        self.assertIsNone(self.session.identity(Unit.one(id__in=[1])))
+        self.assertIsNone(self.session.identity(Unit.one(1, name="people")))
+        self.assertIsNone(self.session.identity(Unit.one(1, like="p")))
+        self.assertIsNone(self.session.identity(Unit.one(name="people")))
+        self.assertIsNone(self.session.identity(Test.one(1, unit__name="people")))
+        self.assertIsNone(self.session.identity(Plain.one(name="people")))
+
+    def test_get(self):
+
+        unit = Unit("people").create()
+
+        self.assertIsNone(self.session.get(Unit.one(1)))
+
+        self.session.add(unit)
+
+        self.assertIs(self.session.get(Unit.one(1)), unit)
+        self.assertIsNone(self.session.get(Unit.one(2)))
+        self.assertIsNone(self.session.get(Unit.one(name="people")))
+
+    def test_add(self):
+
+        unit = Unit("people").create()
+
+        self.assertIs(self.session.add(unit), unit)
+        self.assertIs(self.session.add(Unit.one(1).retrieve()), unit)
+        self.assertEqual(self.session.models, {("unit", 1): unit})
+
+        plain = Plain("people").create()
+
+        self.assertIs(self.session.add(plain), plain)
+
+        unit = Unit("stuff")
+
+        self.assertIs(self.session.add(unit), unit)
+        self.assertEqual(len(self.session.models), 1)
+
+        Unit("things").create()
+        unit = Unit.one(name="things").only("id").retrieve()
+
+        self.assertIs(self.session.add(unit), unit)
+        self.assertEqual(len(self.session.models), 1)
+
+    def test_merge(self):
+
+        Unit([["people"], ["stuff"]]).create()
+
+        unit = Unit.one(1).retrieve()
+
+        self.session.merge(unit)
+        self.assertIs(self.session.models[("unit", 1)], unit)
+
+        again = Unit.one(name="people").retrieve()
+
+        self.session.merge(again)
+        self.assertIs(again._record, unit._record)
+
+        units = Unit.many().retrieve()
+
+        self.session.merge(units)
+        self.assertIs(units[0], unit)
+        self.assertIs(self.session.models[("unit", 2)], units[1])
+
+    def test_discard(self):
+
+        Unit([["people"], ["stuff"]]).create()
+
+        units = Unit.many().retrieve()
+        plain = Plain("people").create()
+
+        self.session.merge(units)
+        self.session.discard(plain)
+
+        self.session.discard(units[0])
+        self.assertEqual(list(self.session.models), [("unit", 2)])
+
+        self.session.merge(units)
+        self.session.discard(Unit.many(name="people"))
+        self.assertEqual(self.session.models, {})
+
+    def test_clear(self):
+
+        self.session.add(Unit("people").create())
+
+        self.session.clear()
+
+        self.assertEqual(self.session.models, {})
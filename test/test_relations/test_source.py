@@ -1,8 +1,15 @@
 import unittest
 import unittest.mock
 
+import asyncio
+
 import relations
 
+class Unit(relations.Model):
+    SOURCE = "unittest"
+    id = int
+    name = str
+
 class TestSource(unittest.TestCase):
 
     maxDiff = None
@@ -17,6 +24,39 @@ class TestSource(unittest.TestCase):
 
         self.assertEqual(relations.source("testunit"), source)
         self.assertTrue(source.reverse)
+        self.assertIsNone(source.cache)
+
+    def test___init_subclass__(self):
+
+        class Check(relations.Source):
+
+            def retrieve(self, model, verify=True, *args, **kwargs):
+                return model
+
+            async def count(self, model, *args, **kwargs):
+                return 1
+
+            def retrieve_query(self, model, *args, **kwargs):
+                return model
+
+        self.assertIsNot(Check.retrieve, Check.__dict__["retrieve"].__wrapped__)
+        self.assertEqual(Check.retrieve.__name__, "retrieve")
+        self.assertNotIn("create", Check.__dict__)
+        self.assertFalse(hasattr(Check.retrieve_query, "__wrapped__"))
+
+        source = Check("checkunit")
+        events = []
+        source.hook(events.append)
+
+        self.assertIsNone(source.retrieve(None))
+        self.assertEqual(asyncio.run(source.count(None)), 1)
+
+        self.assertEqual([(event["action"], event["stage"], event["rows"]) for event in events], [
+            ("retrieve", "before", None),
+            ("retrieve", "after", 0),
+            ("count", "before", None),
+            ("count", "after", 1)
+        ])
 
     def test_ensure_attribute(self):
 
@@ -36,6 +76,125 @@ class TestSource(unittest.TestCase):
         self.source.ensure_attribute(item, "something", True)
         self.assertTrue(item.something)
 
+    def test_hook(self):
+
+        self.source.hook(print)
+        self.assertEqual(self.source.hooks, [print])
+
+        hooks = self.source.hooks
+
+        self.source.hook(len)
+        self.assertEqual(self.source.hooks, [print, len])
+        self.assertEqual(hooks, [print])
+
+    def test_unhook(self):
+
+        self.source.unhook(print)
+        self.assertIsNone(self.source.hooks)
+
+        self.source.hook(print)
+        self.source.hook(len)
+
+        self.source.unhook(print)
+        self.assertEqual(self.source.hooks, [len])
+
+        self.source.unhook(len)
+        self.assertIsNone(self.source.hooks)
+
+    def test_notify(self):
+
+        self.source.notify({})
+
+        hook = unittest.mock.MagicMock()
+        self.source.hook(hook)
+
+        self.source.notify({"stage": "before"})
+        hook.assert_called_once_with({"stage": "before"})
+
+    def test_shape(self):
+
+        self.assertIsNone(self.source.shape(None))
+        self.assertIsNone(self.source.shape(Unit.thy()))
+
+        self.assertEqual(self.source.shape(Unit.many(id__in=[1, 2], name__not_like="p", like="y").limit(3)), {
+            "criteria": {"id": ["in"], "name": ["not_like"]},
+            "like": True,
+            "limit": True
+        })
+
+        self.assertEqual(self.source.shape(Unit.one(1)), {
+            "criteria": {"id": ["eq"]},
+            "like": False,
+            "limit": False
+        })
+
+    def test_rows(self):
+
+        self.assertEqual(self.source.rows("count", None, 3), 3)
+        self.assertEqual(self.source.rows("delete", None, 2), 2)
+        self.assertEqual(self.source.rows("titles", None, [1, 2]), 2)
+
+        unit = Unit([{"name": "people"}, {"name": "stuff"}])
+
+        self.assertEqual(self.source.rows("retrieve", unit, unit), 2)
+        self.assertEqual(self.source.rows("retrieve", unit, None), 0)
+        self.assertIsNone(self.source.rows("execute", None, None))
+
+    def test_instrument(self):
+
+        unit = Unit([{"name": "people"}, {"name": "stuff"}])
+
+        with self.source.instrument("create", unit) as event:
+            self.assertEqual(event, {})
+
+        events = []
+        self.source.hook(events.append)
+
+        with self.source.instrument("create", unit) as event:
+
+            self.assertEqual(events, [{
+                "source": "unittest",
+                "stage": "before",
+                "model": "unit",
+                "instance": unit,
+                "action": "create",
+                "shape": None,
+                "rows": 2,
+                "seconds": None,
+                "error": None
+            }])
+
+            with self.source.instrument("create", unit) as nested:
+                self.assertEqual(nested, {})
+
+            with self.source.instrument("count", unit):
+                pass
+
+            event["result"] = unit
+
+        self.assertEqual([(event["action"], event["stage"]) for event in events], [
+            ("create", "before"),
+            ("count", "before"),
+            ("count", "after"),
+            ("create", "after")
+        ])
+        self.assertEqual(events[-1]["rows"], 2)
+        self.assertNotIn("result", events[-1])
+        self.assertGreaterEqual(events[-1]["seconds"], 0)
+
+        def fail():
+            with self.source.instrument("retrieve", unit):
+                raise Exception("whoops")
+
+        self.assertRaisesRegex(Exception, "whoops", fail)
+        self.assertEqual(str(events[-1]["error"]), "whoops")
+        self.assertIsNone(events[-1]["rows"])
+
+        with self.source.instrument("create", unit):
+            pass
+
+        self.assertEqual(events[-1]["action"], "create")
+
     def test_field_init(self):
 
         self.source.field_init(None)
@@ -61,6 +220,10 @@ class TestSource(unittest.TestCase):
 
         mock_field.assert_called_once_with(record)
 
+    def test_instance_init(self):
+
+        self.source.instance_init(None)
+
     def test_field_define(self):
 
         self.source.field_define(None)
@@ -148,6 +311,10 @@ class TestSource(unittest.TestCase):
 
         self.source.create(None)
 
+    def test_insert(self):
+
+        self.source.insert(None, None)
+
     def test_retrieve_field(self):
 
         self.source.retrieve_field(None)
@@ -178,6 +345,10 @@ class TestSource(unittest.TestCase):
 
         self.source.retrieve(None)
 
+    def test_retrieve_iter(self):
+
+        self.source.retrieve_iter(None, None)
+
     def test_titles_query(self):
 
         self.source.titles_query(None)
@@ -244,6 +415,18 @@ class TestSource(unittest.TestCase):
 
         self.source.delete(None)
 
+    def test_begin(self):
+
+        self.source.begin()
+
+    def test_commit(self):
+
+        self.source.commit()
+
+    def test_rollback(self):
+
+        self.source.rollback()
+
     def test_definition(self):
 
         self.source.definition(None, None)
@@ -267,3 +450,56 @@ class TestSource(unittest.TestCase):
     def test_migrate(self):
 
         self.source.migrate(None)
+
+
+class TestAsyncSource(unittest.IsolatedAsyncioTestCase):
+
+    maxDiff = None
+
+    def setUp(self):
+
+        self.source = relations.AsyncSource("asyncunittest")
+
+    async def test_create(self):
+
+        await self.source.create(None)
+
+    async def test_insert(self):
+
+        await self.source.insert(None, [])
+
+    async def test_count(self):
+
+        await self.source.count(None)
+
+    async def test_retrieve(self):
+
+        await self.source.retrieve(None)
+
+    def test_retrieve_iter(self):
+
+        self.source.retrieve_iter(None, 1)
+
+    async def test_titles(self):
+
+        await self.source.titles(None)
+
+    async def test_update(self):
+
+        await self.source.update(None)
+
+    async def test_delete(self):
+
+        await self.source.delete(None)
+
+    async def test_execute(self):
+
+        await self.source.execute(None)
+
+    async def test_load(self):
+
+        await self.source.load(None)
+
+    async def test_migrate(self):
+
+        await self.source.migrate(None)
@@ -24,6 +24,13 @@ class Test(TitlesModel):
 
 relations.OneToMany(Unit, Test)
 
+class Case(TitlesModel):
+    id = int
+    test_id = int
+    name = str
+
+relations.OneToMany(Test, Case)
+
 class Meta(TitlesModel):
     id = int
     name = str
@@ -94,12 +101,78 @@ class TestTitles(unittest.TestCase):
 
         self.assertEqual(titles.format, ["fancy", "shmancy"])
 
+        unit = Unit.one(name="people")
+        unit.test[0].case.add("run").add("walk")
+        unit.test[1].case.add("crawl")
+        unit.update()
+
+        titled = {}
+
+        with unittest.mock.patch.object(self.source, "retrieve", wraps=self.source.retrieve) as retrieve:
+
+            titles = relations.Titles(Case.many(_titled=titled))
+
+            self.assertEqual(retrieve.call_count, 3)
+            self.assertEqual(titles.format, ["fancy", "shmancy", None])
+            self.assertEqual(titles.parents["test_id"].parents["unit_id"].ids, [1])
+            self.assertEqual(titled[(Test, "id")].ids, [1, 2])
+            self.assertIs(titled[(Unit, "id")], titles.parents["test_id"].parents["unit_id"])
+
+            titles = relations.Titles(Case.many(name__in=["run", "walk"], _titled=titled))
+
+            self.assertEqual(retrieve.call_count, 4)
+            self.assertIs(titles.parents["test_id"], titled[(Test, "id")])
+
         titles = relations.Titles(Meta.many())
         self.assertEqual(titles.format, [None])
 
         titles = relations.Titles(Net.many())
         self.assertEqual(titles.format, [None, None])
 
+    def test_missing(self):
+
+        Unit("people").create().test.add("stuff").add("things").create()
+
+        self.assertEqual(relations.Titles.missing(Unit.many(), {}), {})
+        self.assertEqual(relations.Titles.missing(Test.many(), {}), {(Unit, "id"): [1]})
+        self.assertEqual(relations.Titles.missing(Test.many(), {(Unit, "id"): self.titles}), {})
+
+        titles = relations.Titles(Unit.many())
+        titles[2] = "stuff"
+        self.assertEqual(relations.Titles.missing(Test.many(), {(Unit, "id"): titles}), {(Unit, "id"): [1]})
+
+        titles.absent.add(1)
+        self.assertEqual(relations.Titles.missing(Test.many(), {(Unit, "id"): titles}), {})
+
+        # Deduped in order, without None
+
+        Unit("things").create()
+        Test.insert([{"unit_id": 2, "name": "more"}, {"unit_id": None, "name": "none"}, {"unit_id": 1, "name": "again"}])
+
+        self.assertEqual(relations.Titles.missing(Test.many().sort("id"), {}), {(Unit, "id"): [1, 2]})
+
+    def test_resolve(self):
+
+        titled = {}
+
+        relations.Titles.resolve(titled, (Unit, "id"), [1, 2, 3], self.titles)
+        self.assertIs(titled[(Unit, "id")], self.titles)
+        self.assertEqual(self.titles.absent, set())
+
+        relations.Titles.resolve(titled, (Unit, "id"), [4, 5], {4: "fourth"})
+        self.assertEqual(self.titles.ids, [1, 2, 3, 4])
+        self.assertEqual(self.titles[4], "fourth")
+        self.assertEqual(self.titles.absent, {5})
+
+    def test_ids(self):
+
+        self.assertEqual(self.titles.ids, [1, 2, 3])
+
+        self.titles.ids = [3, 1, 4]
+
+        self.assertEqual(self.titles.ids, [3, 1, 4])
+        self.assertEqual(self.titles.titles, {3: "things", 1: "people", 4: None})
+
     def test___len__(self):
 
         self.assertEqual(len(self.titles), 3)
@@ -135,6 +208,19 @@ class TestTitles(unittest.TestCase):
         self.assertEqual(self.titles.ids, [1, 3])
         self.assertEqual(self.titles.titles, {1: "people", 3: "things"})
 
+        titles = relations.Titles(Unit.many())
+
+        for id in range(100000):
+            titles[id] = [str(id)]
+
+        for id in range(0, 100000, 2):
+            del titles[id]
+
+        self.assertEqual(len(titles), 50000)
+        self.assertNotIn(2, titles)
+        self.assertIn(99999, titles)
+        self.assertEqual(titles.ids[:3], [1, 3, 5])
+
     def test_add(self):
 
         titles = relations.Titles(Unit.many())
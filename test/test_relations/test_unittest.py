@@ -2,8 +2,10 @@ import unittest
 import unittest.mock
 
 import os
+import asyncio
 import shutil
 import pathlib
+import copy
 import json
 import ipaddress
 
@@ -78,6 +80,34 @@ class Case(SourceModel):
 relations.OneToMany(Unit, Test)
 relations.OneToOne(Test, Case)
 
+class Thing(SourceModel):
+    id = int
+    name = str
+    meta = dict
+    INDEX = {"meta_a": ["meta__a"]}
+
+class AsyncSourceModel(relations.AsyncModel):
+    SOURCE = "AsyncUnittestSource"
+
+class AsyncSimple(AsyncSourceModel):
+    id = int
+    name = str
+
+class AsyncPlain(AsyncSourceModel):
+    ID = None
+    name = str
+
+class AsyncUnit(AsyncSourceModel):
+    id = int
+    name = str
+
+class AsyncTest(AsyncSourceModel):
+    id = int
+    unit_id = int
+    name = str
+
+relations.OneToMany(AsyncUnit, AsyncTest, child_field="unit_id", parent_child="test", child_parent="unit")
+
 
 class TestQuery(unittest.TestCase):
 
@@ -87,6 +117,10 @@ class TestQuery(unittest.TestCase):
 
         query = relations.unittest.MockQuery("ACTION")
         self.assertEqual(query.action, "ACTION")
+        self.assertIsNone(query.fields)
+
+        query = relations.unittest.MockQuery("ACTION", ["id"])
+        self.assertEqual(query.fields, ["id"])
 
     def test_bind(self):
 
@@ -94,6 +128,81 @@ class TestQuery(unittest.TestCase):
         self.assertEqual(query.model, "MODEL")
 
 
+class TestColumnTable(unittest.TestCase):
+
+    maxDiff = None
+
+    def setUp(self):
+
+        self.table = relations.unittest.ColumnTable({1: {"id": 1, "name": "ya"}, 2: {"id": 2, "things": {}}})
+
+    def test___init__(self):
+
+        self.assertEqual(self.table.offsets, {1: 0, 2: 1})
+        self.assertEqual(self.table.rows, 2)
+        self.assertEqual(self.table.columns["id"], [1, 2])
+        self.assertEqual(self.table.columns["name"], ["ya", relations.unittest.ColumnTable.MISSING])
+
+    def test___getitem__(self):
+
+        self.assertEqual(self.table[1], {"id": 1, "name": "ya"})
+        self.assertEqual(self.table[2], {"id": 2, "things": {}})
+        self.assertRaises(KeyError, self.table.__getitem__, 3)
+
+    def test___setitem__(self):
+
+        self.table[1] = {"id": 1, "name": "sure"}
+        self.table[3] = {"id": 3, "flag": True}
+
+        self.assertEqual(self.table.offsets, {1: 0, 2: 1, 3: 2})
+        self.assertEqual(self.table[1], {"id": 1, "name": "sure"})
+        self.assertEqual(self.table[2], {"id": 2, "things": {}})
+        self.assertEqual(self.table[3], {"id": 3, "flag": True})
+
+    def test___delitem__(self):
+
+        self.table[3] = {"id": 3}
+
+        del self.table[2]
+
+        self.assertNotIn(2, self.table)
+        self.assertEqual(self.table.rows, 3)
+
+        del self.table[1]
+
+        self.assertEqual(self.table.offsets, {3: 0})
+        self.assertEqual(self.table.rows, 1)
+        self.assertEqual(self.table.columns, {"id": [3]})
+
+        self.table[1] = {"id": 1}
+        self.assertEqual(list(self.table), [3, 1])
+
+        self.assertRaises(KeyError, self.table.__delitem__, 2)
+
+    def test___iter__(self):
+
+        self.assertEqual(list(self.table), [1, 2])
+
+    def test___len__(self):
+
+        self.assertEqual(len(self.table), 2)
+
+    def test___contains__(self):
+
+        self.assertIn(1, self.table)
+        self.assertNotIn(3, self.table)
+
+    def test_compact(self):
+
+        del self.table[1]
+        self.table[1] = {"id": 1, "name": "sure"}
+
+        self.table.compact()
+
+        self.assertEqual(self.table.offsets, {2: 0, 1: 1})
+        self.assertEqual(self.table.columns["id"], [2, 1])
+        self.assertEqual(self.table, {1: {"id": 1, "name": "sure"}, 2: {"id": 2, "things": {}}})
+
 class TestSource(unittest.TestCase):
 
     maxDiff = None
@@ -127,6 +236,63 @@ class TestSource(unittest.TestCase):
         self.assertEqual(self.source.unique, {"check": {"name": {}}})
         self.assertTrue(model._fields._names["id"].auto)
 
+    def test_instance_init(self):
+
+        Unit("people").create()
+
+        self.source.execute({"ACTION": "remove", "name": "unit"})
+
+        self.source.instance_init(Unit.thy())
+
+        self.assertEqual(self.source.ids["unit"], 0)
+        self.assertEqual(dict(self.source.data["unit"]), {})
+        self.assertEqual(self.source.unique["unit"], {"name": {}})
+
+        # Each instance gets storage back after a remove
+
+        self.source.execute({"ACTION": "remove", "name": "unit"})
+
+        self.assertEqual(Unit(name="stuff").create().id, 1)
+        self.assertEqual(Unit.one(name="stuff").id, 1)
+
+    def test_table(self):
+
+        self.assertEqual(self.source.table(), {})
+
+        self.source.layout = "columns"
+
+        self.assertIsInstance(self.source.table(), relations.unittest.ColumnTable)
+
+        # Same results either way
+
+        Unit([["stuff"], ["people"], ["things"]]).create()
+
+        self.assertIsInstance(self.source.data["unit"], relations.unittest.ColumnTable)
+
+        unit = Unit.one(name="people")
+        unit.test.add("moar")
+        unit.update()
+
+        self.assertEqual(Unit.many(like="p").name, ["people"])
+        self.assertEqual(Test.many(unit__name="people").name, ["moar"])
+        self.assertEqual(Unit.many(name__not_eq="people").count(), 2)
+
+        Unit.many(name="things").set(name="thingies").update()
+        Unit.one(name="stuff").delete()
+
+        self.assertEqual(self.source.data["unit"], {
+            2: {"id": 2, "name": "people"},
+            3: {"id": 3, "name": "thingies"}
+        })
+
+        self.source.execute({
+            "ACTION": "change",
+            "DEFINITION": {"name": "unit"},
+            "MIGRATION": {"fields": [{"ACTION": "add", "store": "flag", "default": True}]}
+        })
+
+        self.assertEqual(self.source.data["unit"][2], {"id": 2, "name": "people", "flag": True})
+
     def test_field_define(self):
 
         field = relations.Field(int, store="_id")
@@ -365,39 +531,128 @@ class TestSource(unittest.TestCase):
         self.assertEqual(self.source.extract(Meta(), {"things": {"for": [{"1": "yep"}]}})["things__for__0____1"], "yep")
         self.assertIsNone(self.source.extract(Meta(), {})["things__for__0____1"])
 
+    def test_begin(self):
+
+        self.assertIsNone(self.source.begin())
+        self.assertEqual(self.source.transaction, [])
+
+        self.source.transaction.append("undo")
+
+        self.assertEqual(self.source.begin(), 1)
+        self.assertEqual(self.source.transaction, ["undo"])
+
+    def test_commit(self):
+
+        self.source.begin()
+        self.source.journal(self.source.ids, "simple")
+
+        self.source.commit(1)
+        self.assertEqual(len(self.source.transaction), 1)
+
+        self.source.commit()
+        self.assertIsNone(self.source.transaction)
+
     def test_rollback(self):
 
-        model = unittest.mock.MagicMock()
-        model.NAME = "unittest"
+        values = {"a": 1}
+
+        self.source.begin()
+
+        self.source.journal(values, "a")
+        values["a"] = 2
+
+        savepoint = self.source.begin()
+
+        self.source.journal(values, "b")
+        values["b"] = 3
+
+        self.source.rollback(savepoint)
+        self.assertEqual(values, {"a": 2})
+        self.assertEqual(len(self.source.transaction), 1)
 
-        source = unittest.mock.MagicMock()
-        source.UniqueError = relations.unittest.MockSource.UniqueError
-        (source.ids, source.data, source.unique, source.transaction) = ("people", "stuff", "things", None)
+        self.source.rollback()
+        self.assertEqual(values, {"a": 1})
+        self.assertIsNone(self.source.transaction)
 
-        @relations.unittest.MockSource.rollback
-        def rolling(self, action):
+    def test_journal(self):
 
-            (self.ids, self.data, self.unique) = ("persons", "stuffins", "thingies")
+        values = {"a": 1}
 
-            if action == "fail":
+        self.source.journal(values, "a")
+        self.assertIsNone(self.source.transaction)
 
-                raise relations.unittest.MockSource.UniqueError(model, "nope")
+        self.source.begin()
+
+        self.source.journal(values, "a")
+        self.source.journal(values, "b")
+
+        values["a"] = 2
+        values["b"] = 3
+
+        self.source.transaction.pop()()
+        self.assertEqual(values, {"a": 2})
+
+        self.source.transaction.pop()()
+        self.assertEqual(values, {"a": 1})
+
+    def test_atomic(self):
+
+        Simple("ya").create()
+
+        ids = copy.deepcopy(self.source.ids)
+        data = copy.deepcopy(self.source.data)
+        unique = copy.deepcopy(self.source.unique)
+        owners = copy.deepcopy(self.source.owners)
+        indexes = copy.deepcopy(self.source.indexes)
 
         # fail
 
-        self.assertRaisesRegex(relations.unittest.MockSource.UniqueError, "unittest: nope", rolling, source, "fail")
+        self.assertRaisesRegex(
+            relations.unittest.MockSource.UniqueError,
+            'simple: value {"name": "ya"} violates unique name',
+            Simple([["sure"], ["ya"]]).create
+        )
 
-        self.assertEqual(source.ids, "people")
-        self.assertEqual(source.data, "stuff")
-        self.assertEqual(source.unique, "things")
+        self.assertIsNone(self.source.transaction)
+        self.assertEqual(self.source.ids, ids)
+        self.assertEqual(self.source.data, data)
+        self.assertEqual(self.source.unique, unique)
+        self.assertEqual(self.source.owners, owners)
+        self.assertEqual(self.source.indexes, indexes)
+
+        Simple("sure").create()
+
+        self.assertRaisesRegex(
+            relations.unittest.MockSource.UniqueError,
+            'simple: value {"name": "sure"} violates unique name',
+            Simple.many().set(name="sure").update
+        )
+
+        self.assertEqual(Simple.many().name, ["sure", "ya"])
 
         # pass
 
-        rolling(source, "pass")
+        self.assertEqual(Simple.many(name="ya").delete(), 1)
+
+        self.assertIsNone(self.source.transaction)
+        self.assertEqual(Simple.many().name, ["sure"])
+
+    def test_index_change(self):
+
+        self.source.begin()
+
+        self.source.index_change(Simple.thy(), 1, None, {"id": 1, "name": "ya"})
+        self.assertEqual(self.source.indexes["simple"]["name"]["hash"], {("ya",): {1}})
 
-        self.assertEqual(source.ids, "persons")
-        self.assertEqual(source.data, "stuffins")
-        self.assertEqual(source.unique, "thingies")
+        self.source.index_change(Simple.thy(), 1, {"id": 1, "name": "ya"}, {"id": 1, "name": "sure"})
+        self.assertEqual(self.source.indexes["simple"]["name"]["hash"], {("sure",): {1}})
+
+        self.source.rollback()
+        self.assertEqual(self.source.indexes["simple"]["name"]["hash"], {})
+
+        self.source.columns["simple"] = {}
+        self.source.index_change(Simple.thy(), 1, None, {"id": 1, "name": "ya"})
+        self.assertEqual(self.source.columns, {})
 
     def test_uniques(self):
 
@@ -416,10 +671,363 @@ class TestSource(unittest.TestCase):
 
         self.assertRaisesRegex(relations.unittest.MockSource.UniqueError, 'simple: value {"name": "sure"} violates unique name', self.source.uniques, sure, sure.export(), 3)
 
+        sure.name = "whatever"
+
+        self.source.uniques(sure, sure.export(), 2)
+
+        self.assertEqual(self.source.owners['simple']['name'], {
+            '{"name": "ya"}': 1,
+            '{"name": "whatever"}': 2
+        })
+
+        self.source.uniques(Simple("sure"), Simple("sure").export(), 3)
+
+        self.assertEqual(self.source.unique['simple']['name'][3], '{"name": "sure"}')
+
+    def test_unique_owners(self):
+
+        Simple("ya").create()
+        Simple("sure").create()
+
+        del self.source.owners['simple']
+
+        owners = self.source.unique_owners(Simple.thy(), "name")
+
+        self.assertIs(self.source.unique_owners(Simple.thy(), "name"), owners)
+        self.assertEqual(owners, {
+            '{"name": "ya"}': 1,
+            '{"name": "sure"}': 2
+        })
+
+        Simple.one(name="ya").delete()
+
+        self.assertEqual(owners, {
+            '{"name": "sure"}': 2
+        })
+
+        Simple("ya").create()
+
+        self.assertEqual(owners, {
+            '{"name": "sure"}': 2,
+            '{"name": "ya"}': 3
+        })
+
+    def test_copied(self):
+
+        stored = {"id": 1, "meta": {"a": [1]}}
+        copied = self.source.copied(stored)
+
+        self.assertEqual(copied, stored)
+        self.assertIsNot(copied["meta"], stored["meta"])
+        self.assertIsNot(copied["meta"]["a"], stored["meta"]["a"])
+
+        # Changing a retrieved dict in place keeps the indexes right
+
+        Thing("yep", {"a": 1}).create()
+
+        thing = Thing.one(name="yep")
+        thing.meta["a"] = 9
+        thing.update()
+
+        self.assertEqual(self.source.data["thing"][1]["meta"], {"a": 9})
+        self.assertEqual(Thing.many(meta__a__eq=9).name, ["yep"])
+        self.assertEqual(Thing.many(meta__a__eq=1).name, [])
+
+    def test_index_key(self):
+
+        self.assertEqual(self.source.index_key((1, "a")), (1, "a"))
+        self.assertEqual(self.source.index_key(([1], "a")), '[[1], "a"]')
+
+    def test_model_indexes(self):
+
+        Unit([["people"], ["stuff"]]).create()
+
+        indexes = self.source.model_indexes(Unit.thy())
+
+        self.assertIs(self.source.model_indexes(Unit.thy()), indexes)
+        self.assertEqual(indexes["name"]["specs"], [("name", None, str)])
+        self.assertEqual(indexes["name"]["hash"], {("people",): {1}, ("stuff",): {2}})
+        self.assertEqual(indexes["name"]["sorted"], [("people", 1), ("stuff", 2)])
+
+        indexes = self.source.model_indexes(Net.thy())
+
+        self.assertEqual(indexes["ip__address"]["specs"], [("ip", "address", ipaddress.IPv4Address)])
+        self.assertIsNone(indexes["ip__address"]["sorted"])
+
+    def test_index_add(self):
+
+        self.source.index_add(Unit.thy(), 1, {"id": 1, "name": "People"})
+
+        self.assertEqual(self.source.indexes["unit"]["name"]["hash"], {("People",): {1}})
+        self.assertEqual(self.source.indexes["unit"]["name"]["sorted"], [("people", 1)])
+
+    def test_index_remove(self):
+
+        Unit([["people"], ["stuff"]]).create()
+
+        self.source.index_remove(Unit.thy(), 1, {"id": 1, "name": "people"})
+
+        self.assertEqual(self.source.indexes["unit"]["name"]["hash"], {("stuff",): {2}})
+        self.assertEqual(self.source.indexes["unit"]["name"]["sorted"], [("stuff", 2)])
+
+    def test_like_grams(self):
+
+        self.assertEqual(self.source.like_grams("abcd"), {"a", "b", "c", "d", "ab", "bc", "cd", "abc", "bcd"})
+        self.assertEqual(self.source.like_grams(""), set())
+
+    def test_like_texts(self):
+
+        self.assertEqual(self.source.like_texts(Test.thy(), {"id": 1, "unit_id": 2, "name": "Things"}), ["things"])
+        self.assertEqual(self.source.like_texts(Simple.thy(), {"id": 1}), ["none"])
+        self.assertEqual(self.source.like_texts(Net.thy(), {"ip": {"address": "1.2.3.4"}}), ["1.2.3.4"])
+
+    def test_model_likes(self):
+
+        Unit([["ab"], ["bc"]]).create()
+
+        self.source.trigrams = True
+
+        likes = self.source.model_likes(Test.thy())
+
+        self.assertIs(self.source.model_likes(Test.thy()), likes)
+        self.assertEqual(likes, {"grams": {}, "parents": {"unit_id": {}}})
+
+        self.assertEqual(self.source.model_likes(Unit.thy())["grams"], {
+            "a": {1},
+            "b": {1, 2},
+            "c": {2},
+            "ab": {1},
+            "bc": {2}
+        })
+
+    def test_like_add(self):
+
+        self.source.like_add(Unit.thy(), 1, {"id": 1, "name": "ab"})
+        self.assertEqual(self.source.likes, {})
+
+        self.source.trigrams = True
+
+        self.source.like_add(Test.thy(), 1, {"id": 1, "unit_id": 2, "name": "Ab"})
+        self.assertEqual(self.source.likes["test"], {
+            "grams": {"a": {1}, "b": {1}, "ab": {1}},
+            "parents": {"unit_id": {2: {1}}}
+        })
+
+    def test_like_remove(self):
+
+        self.source.trigrams = True
+
+        self.source.like_add(Test.thy(), 1, {"id": 1, "unit_id": 2, "name": "ab"})
+        self.source.like_add(Test.thy(), 2, {"id": 2, "unit_id": 2, "name": "b"})
+        self.source.like_remove(Test.thy(), 1, {"id": 1, "unit_id": 2, "name": "ab"})
+
+        self.assertEqual(self.source.likes["test"], {
+            "grams": {"b": {2}},
+            "parents": {"unit_id": {2: {2}}}
+        })
+
+    def test_like_ids(self):
+
+        Unit([["people"], ["stuff"]]).create()
+
+        self.assertIsNone(self.source.like_ids(Unit.many(like="peo"), {}))
+
+        self.source.trigrams = True
+
+        self.assertIsNone(self.source.like_ids(Unit.many(like=""), {}))
+        self.assertEqual(self.source.like_ids(Unit.many(like="F"), {}), {2})
+        self.assertEqual(self.source.like_ids(Unit.many(like="peopl"), {}), {1})
+        self.assertEqual(self.source.like_ids(Unit.many(like="stuffy"), {}), set())
+
+        unit = Unit.one(name="people")
+        unit.test.add("things").add("stuffing")
+        unit.update()
+
+        self.assertEqual(self.source.like_ids(Test.many(like="stuff"), {"unit_id": [2]}), {2})
+        self.assertEqual(self.source.like_ids(Test.many(like="peo"), {"unit_id": [1]}), {1, 2})
+
+        Test.one(name="stuffing").delete()
+
+        self.assertEqual(self.source.like_ids(Test.many(like="stuff"), {"unit_id": [2]}), set())
+
+    def test_index_range(self):
+
+        index = {"specs": [("id", None, int)], "sorted": [(1, 1), (2, 2), (2, 3), (4, 4)]}
+
+        self.assertIsNone(self.source.index_range(index, {}))
+        self.assertEqual(self.source.index_range(index, {"gt": 1}), {2, 3, 4})
+        self.assertEqual(self.source.index_range(index, {"gte": 2, "lt": 4}), {2, 3})
+        self.assertEqual(self.source.index_range(index, {"lte": 2}), {1, 2, 3})
+
+        index = {"specs": [("name", None, str)], "sorted": [("people", 1), ("persons", 2), ("stuff", 3)]}
+
+        self.assertEqual(self.source.index_range(index, {"start": "PE"}), {1, 2})
+        self.assertIsNone(self.source.index_range(index, {"gt": "a"}))
+
+    def test_index_keys(self):
+
+        index = self.source.model_indexes(Test.thy())["unit_id-name"]
+
+        self.assertIsNone(self.source.index_keys(Test.many(unit_id=1), index))
+        self.assertEqual(self.source.index_keys(Test.many(unit_id__in=[1, 2], name="a"), index), (
+            [[1, 2], ["a"]],
+            [("unit_id", "in"), ("name", "eq")]
+        ))
+
+        index = self.source.model_indexes(Net.thy())["ip__address"]
+
+        self.assertEqual(self.source.index_keys(Net.many(ip__address="1.2.3.4"), index), (
+            [["1.2.3.4"]],
+            [("ip", "address__eq")]
+        ))
+
+    def test_index_ids(self):
+
+        Test([[1, "a"], [1, "b"], [2, "a"]]).create()
+
+        index = self.source.model_indexes(Test.thy())["unit_id-name"]
+
+        self.assertEqual(self.source.index_ids(index, [[1, 2], ["a"]]), {1, 3})
+        self.assertEqual(self.source.index_ids(index, [[], ["a"]]), set())
+        self.assertIsNone(self.source.index_ids(index, [[1, 2], ["a"]], limit=1))
+
+    def test_model_ids(self):
+
+        Unit([["people"], ["persons"], ["stuff"]]).create()
+        Test([[1, "a"], [1, "b"], [2, "a"]]).create()
+
+        self.assertIsNone(self.source.model_ids(Unit.many(id=1)))
+        self.assertEqual(self.source.model_ids(Unit.many(name="people")), {1})
+        self.assertEqual(self.source.model_ids(Unit.many(name__in=["people", "stuff", "nope"])), {1, 3})
+        self.assertEqual(self.source.model_ids(Unit.many(name__start="per")), {2})
+        self.assertEqual(self.source.model_ids(Unit.many(name__in=["people", "stuff"], name__start="p")), {1, 3})
+
+        self.assertIsNone(self.source.model_ids(Test.many(unit_id=1)))
+        self.assertEqual(self.source.model_ids(Test.many(unit_id__in=[1, 2], name="a")), {1, 3})
+        self.assertIsNone(self.source.model_ids(Test.many(unit_id__in=[1, 2], name="a"), limit=1))
+
+        Net(ip="1.2.3.4", subnet="1.2.3.0/24").create()
+
+        self.assertEqual(self.source.model_ids(Net.many(ip__address="1.2.3.4")), {1})
+
+    def test_model_count(self):
+
+        Unit([["people"], ["persons"], ["stuff"]]).create()
+        Test([[1, "a"], [1, "b"], [2, "a"]]).create()
+
+        self.assertEqual(self.source.model_count(Unit.many()), 3)
+        self.assertEqual(self.source.model_count(Unit.many(name__in=["people", "stuff", "nope"])), 2)
+        self.assertEqual(self.source.model_count(Test.many(unit_id__in=[1, 2], name="a")), 2)
+
+        self.assertIsNone(self.source.model_count(Unit.many(id=1)))
+        self.assertIsNone(self.source.model_count(Unit.many(name__start="per")))
+
+        unit = Unit.many()
+        unit._record._names["name"].criteria = {"in": ["people", None]}
+        self.assertIsNone(self.source.model_count(unit))
+
+        self.assertIsNone(self.source.model_count(Test.many(unit_id=1)))
+        self.assertIsNone(self.source.model_count(Test.many(unit_id__in=[1, 2], name="a", id=1)))
+        self.assertIsNone(self.source.model_count(Test.many(unit_id__in=[1, 2], name="a"), limit=1))
+
+    def test_model_values(self):
+
+        Unit([["stuff"], ["people"]]).create()
+
+        self.assertIs(self.source.model_values(Unit.many(), None), self.source.data["unit"])
+        self.assertEqual(self.source.model_values(Unit.many(), {2}), {2: {"id": 2, "name": "people"}})
+
+    def test_model_candidates(self):
+
+        Unit([["stuff"], ["people"]]).create()
+
+        self.assertIs(self.source.model_candidates(Unit.many(id=1)), self.source.data["unit"])
+        self.assertEqual(self.source.model_candidates(Unit.many(name__in=["stuff", "people"])), {
+            1: {"id": 1, "name": "stuff"},
+            2: {"id": 2, "name": "people"}
+        })
+
+    @unittest.skipUnless(relations.unittest.numpy, "requires numpy")
+    def test_model_column(self):
+
+        Meta.insert([
+            {"name": "yep", "flag": True, "spend": 1.5},
+            {"name": "sure", "spend": None},
+            {"name": "huge", "spend": 2}
+        ])
+
+        ids, column, nulls = self.source.model_column(Meta.thy(), Meta.thy()._fields._names["spend"])
+
+        self.assertEqual(ids.tolist(), [1, 2, 3])
+        self.assertEqual(column.tolist(), [1.5, 0.0, 2.0])
+        self.assertEqual(nulls.tolist(), [False, True, False])
+
+        self.source.data["meta"][3] = {**self.source.data["meta"][3], "id": 2**70}
+
+        ids, column, nulls = self.source.model_column(Meta.thy(), Meta.thy()._fields._names["id"])
+        self.assertIsNone(column)
+
+    @unittest.skipUnless(relations.unittest.numpy, "requires numpy")
+    def test_column_mask(self):
+
+        column = relations.unittest.numpy.array([1, 0, 2, 3])
+        nulls = relations.unittest.numpy.array([False, True, False, False])
+
+        def mask(operator, satisfy):
+            return relations.unittest.MockSource.column_mask(column, nulls, operator, satisfy).tolist()
+
+        self.assertEqual(mask("null", True), [False, True, False, False])
+        self.assertEqual(mask("null", False), [True, False, True, True])
+        self.assertEqual(mask("in", [0, 2, None]), [False, False, True, False])
+        self.assertEqual(mask("eq", 0), [False, False, False, False])
+        self.assertEqual(mask("gt", 1), [False, False, True, True])
+        self.assertEqual(mask("gte", 2), [False, False, True, True])
+        self.assertEqual(mask("lt", 2), [True, False, False, False])
+        self.assertEqual(mask("lte", 2), [True, False, True, False])
+
+    @unittest.skipUnless(relations.unittest.numpy, "requires numpy")
+    def test_model_scan(self):
+
+        Meta.insert([
+            {"name": "yep", "flag": True, "spend": 1.5},
+            {"name": "sure", "flag": False, "spend": None},
+            {"name": "fine", "flag": True, "spend": 2}
+        ])
+
+        self.assertIsNone(self.source.model_scan(Meta.many(spend__gt=1)))
+
+        self.source.columnar = True
+
+        self.assertEqual(self.source.model_scan(Meta.many(spend__gt=1)), ([1, 3], []))
+        self.assertEqual(self.source.model_scan(Meta.many(spend__not_eq=2, flag=True)), ([1], []))
+        self.assertEqual(self.source.model_scan(Meta.many(spend__null=True)), ([2], []))
+
+        meta = Meta.many(spend__gte=1.5, name__like="i")
+        self.assertEqual(self.source.model_scan(meta), ([1, 3], [meta._record._names["name"]]))
+
+        self.assertEqual(self.source.model_scan(Meta.many(spend__lt=2**80)), ([1, 3], []))
+
+        self.assertIsNone(self.source.model_scan(Meta.many(name="yep")))
+        self.assertIsNone(self.source.model_scan(Meta.many(spend__gt=1, like="y")))
+
+        meta = Meta.many(spend__gt=1, name="yep")
+        self.assertEqual(self.source.model_scan(meta), ([1, 3], [meta._record._names["name"]]))
+
     def test_create_query(self):
 
         self.assertEqual(self.source.create_query(None).action, "CREATE")
 
+    def test_model_create(self):
+
+        simple = Simple("ya")
+
+        self.source.model_create(simple, simple)
+
+        self.assertEqual(simple.id, 1)
+        self.assertEqual(self.source.ids["simple"], 1)
+        self.assertEqual(self.source.data["simple"], {1: {"id": 1, "name": "ya"}})
+        self.assertEqual(self.source.owners["simple"]["name"], {'{"name": "ya"}': 1})
+
     def test_create(self):
 
         simple = Simple("sure")
@@ -515,6 +1123,51 @@ class TestSource(unittest.TestCase):
 
         self.assertRaisesRegex(relations.ModelError, 'simple: value {"name": "sure"} violates unique name', simple.create)
 
+    def test_model_insert(self):
+
+        self.assertEqual(self.source.model_insert(Simple.thy(), [{"name": "ya"}]), 1)
+
+        self.assertEqual(self.source.ids["simple"], 1)
+        self.assertEqual(self.source.data["simple"], {1: {"id": 1, "name": "ya"}})
+        self.assertEqual(self.source.owners["simple"]["name"], {'{"name": "ya"}': 1})
+
+    def test_insert(self):
+
+        self.assertEqual(self.source.insert(Simple.thy(), [{"name": "ya"}, {"id": 5, "name": "sure"}]), 2)
+
+        self.assertEqual(self.source.ids["simple"], 2)
+        self.assertEqual(self.source.data["simple"], {
+            1: {"id": 1, "name": "ya"},
+            2: {"id": 5, "name": "sure"}
+        })
+        self.assertEqual(Simple.one(name="sure").id, 5)
+
+        self.assertRaisesRegex(
+            relations.unittest.MockSource.UniqueError,
+            'simple: value {"name": "ya"} violates unique name',
+            self.source.insert, Simple.thy(), [{"name": "fine"}, {"name": "ya"}]
+        )
+
+        self.assertEqual(self.source.ids["simple"], 2)
+        self.assertEqual(len(self.source.data["simple"]), 2)
+        self.assertEqual(Simple.many(name="fine").count(), 0)
+
+        self.source.insert(Meta.thy(), [{"name": "yep", "things": {"for": [{"1": "sure"}]}}])
+        self.assertEqual(self.source.data["meta"][1]["things__for__0____1"], "sure")
+
+    def test_like_parents(self):
+
+        self.assertEqual(self.source.like_parents(Unit.many(like="p")), {})
+
+        parents = self.source.like_parents(Test.many(like="p", _chunk=5))
+
+        relation, parent = parents["unit_id"]
+
+        self.assertIs(relation.Parent, Unit)
+        self.assertEqual(parent._like, "p")
+        self.assertEqual(parent._limit, 5)
+        self.assertEqual(parent._action, "retrieve")
+
     def test_model_like(self):
 
         Unit([["stuff"], ["people"]]).create()
@@ -545,45 +1198,143 @@ class TestSource(unittest.TestCase):
         }])
         self.assertTrue(test.overflow)
 
-    def test_model_sort(self):
+        self.source.trigrams = True
 
-        unit = Unit([["stuff"], ["people"], ["things"]]).create()
+        self.assertEqual(self.source.model_like(Unit.many(like="peop")), [{
+            "id": 2,
+            "name": "people"
+        }])
 
-        self.source.model_sort(unit)
-        self.assertEqual(unit.name, ["people", "stuff", "things"])
+        self.assertEqual(self.source.model_like(Test.many(like="p")), [{
+            "id": 1,
+            "unit_id": 2,
+            "name": "things"
+        }])
 
-        unit._sort = ['-id']
-        self.source.model_sort(unit)
-        self.assertEqual(unit.name, ["things", "people", "stuff"])
-        self.assertIsNone(unit._sort)
+        self.assertEqual(self.source.model_like(Test.many(like="hin")), [{
+            "id": 1,
+            "unit_id": 2,
+            "name": "things"
+        }])
 
-    def test_model_limit(self):
+        self.assertEqual(self.source.model_like(Unit.many(like="pope")), [])
 
-        unit = Unit.many()
+    def test_model_order(self):
+
+        Unit([["stuff"], ["people"], ["things"]]).create()
+
+        records = list(self.source.data["unit"].values())
+
+        self.assertEqual([record["name"] for record in self.source.model_order(Unit.many(), records)], ["people", "stuff", "things"])
+
+        unit = Unit.many().sort("-id")
+        self.assertEqual([record["name"] for record in self.source.model_order(unit, records)], ["things", "people", "stuff"])
+
+        Meta("yep", spend=1.0).create()
+        Meta("sure", spend=None).create()
+        Meta("fine", spend=1.0).create()
+
+        records = list(self.source.data["meta"].values())
+        meta = Meta.many().sort("-spend", "name")
+        self.assertEqual([record["name"] for record in self.source.model_order(meta, records)], ["fine", "yep", "sure"])
+
+        Meta.many().delete()
+        Meta("dive", things={"a": 2}).create()
+        Meta("deep", things={"a": 1}).create()
+
+        records = list(self.source.data["meta"].values())
+        meta = Meta.many().sort("things__a")
+        self.assertEqual([record["name"] for record in self.source.model_order(meta, records)], ["deep", "dive"])
+
+        Meta("dove", things={"a": 0}).create()
+
+        records = list(self.source.data["meta"].values())
+        meta = Meta.many().sort("-things__a").limit(2)
+        self.assertEqual([record["name"] for record in self.source.model_order(meta, records)], ["dive", "deep"])
+
+        Meta.many().delete()
+        Meta("a", push="c").create()
+        Meta("b", push="a").create()
+        Meta("c", push="b").create()
+
+        records = list(self.source.data["meta"].values())
+        meta = Meta.many().sort("push")
+        self.assertEqual([record["name"] for record in self.source.model_order(meta, records)], ["b", "c", "a"])
+        self.assertEqual(Meta.many().sort("push").name, ["b", "c", "a"])
+
+    def test_model_matches(self):
+
+        Unit([["stuff"], ["people"], ["things"]]).create()
+
+        self.assertEqual(self.source.model_matches(Unit.many(name__not_eq="people")), [
+            {"id": 1, "name": "stuff"},
+            {"id": 3, "name": "things"}
+        ])
+
+        self.assertEqual(self.source.model_matches(Unit.many(like="p")), [
+            {"id": 2, "name": "people"}
+        ])
+
+        unit = Unit.one(name="people")
+        unit.test.add("moar")
+        unit.update()
+
+        parents = self.source.like_parents(Test.many(like="p"))
+
+        self.assertEqual(self.source.model_matches(Test.many(like="p"), parents), [
+            {"id": 1, "unit_id": 2, "name": "moar"}
+        ])
+
+    @unittest.skipUnless(relations.unittest.numpy, "requires numpy")
+    def test_model_matches_columnar(self):
+
+        self.source.columnar = True
+
+        Test.insert([[1, "stuff"], [2, "people"], [1, "things"], [None, "nope"]])
+
+        self.assertEqual(self.source.model_matches(Test.many(unit_id__gte=1, name__not_eq="stuff")), [
+            {"id": 2, "unit_id": 2, "name": "people"},
+            {"id": 3, "unit_id": 1, "name": "things"}
+        ])
+
+        self.assertEqual(self.source.model_matches(Test.many(unit_id__not_in=[1])), [
+            {"id": 2, "unit_id": 2, "name": "people"},
+            {"id": 4, "unit_id": None, "name": "nope"}
+        ])
+
+        # Indexes are looked up once, and preferred to scanning if they apply
+
+        with unittest.mock.patch.object(self.source, "model_ids", wraps=self.source.model_ids) as model_ids:
+            with unittest.mock.patch.object(self.source, "model_scan", wraps=self.source.model_scan) as model_scan:
+
+                self.assertEqual(self.source.model_matches(Test.many(unit_id__in=[1, 2], name="people")), [
+                    {"id": 2, "unit_id": 2, "name": "people"}
+                ])
 
-        unit._models = [1, 2, 3]
-        self.source.model_limit(unit)
-        self.assertEqual(unit._models, [1, 2, 3])
-        self.assertFalse(unit.overflow)
-
-        unit._models = [1, 2, 3]
-        unit._limit = 4
-        unit._offset = 0
-        self.source.model_limit(unit)
-        self.assertEqual(unit._models, [1, 2, 3])
-        self.assertFalse(unit.overflow)
-
-        unit._models = [1, 2, 3]
-        unit._limit = 2
-        self.source.model_limit(unit)
-        self.assertEqual(unit._models, [1, 2])
-        self.assertTrue(unit.overflow)
-
-        unit._models = [1, 2, 3]
-        unit._offset = 1
-        self.source.model_limit(unit)
-        self.assertEqual(unit._models, [2, 3])
-        self.assertTrue(unit.overflow)
+                self.assertEqual(model_ids.call_count, 1)
+                model_scan.assert_not_called()
+
+    def test_model_records(self):
+
+        Unit([["stuff"], ["people"], ["things"]]).create()
+
+        units = Unit.many(name__not_eq="people")
+        self.assertEqual(self.source.model_records(units), [
+            {"id": 1, "name": "stuff"},
+            {"id": 3, "name": "things"}
+        ])
+        self.assertFalse(units.overflow)
+
+        units = Unit.many().sort("-name").limit(1, 1)
+        self.assertEqual(self.source.model_records(units), [
+            {"id": 1, "name": "stuff"}
+        ])
+        self.assertTrue(units.overflow)
+
+        units = Unit.many(like="p")
+        self.assertEqual(self.source.model_records(units), [
+            {"id": 2, "name": "people"}
+        ])
 
     def test_count_query(self):
 
@@ -601,7 +1352,24 @@ class TestSource(unittest.TestCase):
 
     def test_retrieve_query(self):
 
-        self.assertEqual(self.source.retrieve_query(None).action, "RETRIEVE")
+        self.assertEqual(self.source.retrieve_query(Unit.many()).action, "RETRIEVE")
+        self.assertIsNone(self.source.retrieve_query(Unit.many()).fields)
+        self.assertEqual(self.source.retrieve_query(Unit.many().only("name")).fields, ["id", "name"])
+
+    def test_model_retrieve(self):
+
+        Unit([["stuff"], ["people"]]).create()
+
+        unit = self.source.model_retrieve(Unit.one(name="people"))
+        self.assertEqual(unit.id, 2)
+        self.assertEqual(unit._action, "update")
+
+        units = self.source.model_retrieve(Unit.many().sort("name"))
+        self.assertEqual(units.name, ["people", "stuff"])
+        self.assertIsNone(units._sort)
+
+        self.assertIsNone(self.source.model_retrieve(Unit.one(name="nope"), False))
+        self.assertRaisesRegex(relations.ModelError, "unit: none retrieved", self.source.model_retrieve, Unit.one(name="nope"))
 
     def test_retrieve(self):
 
@@ -767,6 +1535,24 @@ class TestSource(unittest.TestCase):
         model = Net.many(subnet__max_value=int(ipaddress.IPv4Address('1.2.3.0')))
         self.assertEqual(len(model), 0)
 
+    def test_retrieve_iter(self):
+
+        Unit([["stuff"], ["people"], ["things"]]).create()
+
+        units = Unit.many(name__not_eq="stuff")
+        iterating = self.source.retrieve_iter(units, 1)
+
+        self.assertEqual(next(iterating).name, "people")
+        self.assertEqual([unit.name for unit in iterating], ["things"])
+        self.assertEqual(units._action, "retrieve")
+
+        units = Unit.many().sort("-name").limit(2, 1)
+        self.assertEqual([unit.name for unit in self.source.retrieve_iter(units, 2)], ["stuff", "people"])
+        self.assertTrue(units.overflow)
+
+        units = Unit.many(like="p")
+        self.assertEqual([unit.id for unit in self.source.retrieve_iter(units, 10)], [2])
+
     def test_titles_query(self):
 
         self.assertEqual(self.source.titles_query(None).action, "TITLES")
@@ -813,6 +1599,26 @@ class TestSource(unittest.TestCase):
 
         self.assertEqual(self.source.update_query(None).action, "UPDATE")
 
+    def test_model_mass(self):
+
+        Unit([["people"], ["stuff"]]).create()
+
+        self.assertEqual(self.source.model_mass(Unit.many(id=2).set(name="things")), 1)
+        self.assertEqual(self.source.data["unit"][2], {"id": 2, "name": "things"})
+        self.assertEqual(self.source.model_mass(Unit.many(name="nope").set(name="things")), 0)
+
+    def test_model_update(self):
+
+        Unit([["people"], ["stuff"]]).create()
+
+        unit = Unit.one(2)
+        unit.name = "things"
+
+        self.source.model_update(unit, unit)
+
+        self.assertEqual(self.source.data["unit"][2], {"id": 2, "name": "things"})
+        self.assertEqual(self.source.owners["unit"]["name"], {'{"name": "people"}': 1, '{"name": "things"}': 2})
+
     def test_update(self):
 
         Unit([["people"], ["stuff"]]).create()
@@ -859,6 +1665,20 @@ class TestSource(unittest.TestCase):
 
         self.assertEqual(self.source.delete_query(None).action, "DELETE")
 
+    def test_model_delete(self):
+
+        Unit([["people"], ["stuff"]]).create()
+
+        self.assertEqual(self.source.model_delete(Unit.many(name="stuff")), 1)
+        self.assertEqual(self.source.data["unit"], {1: {"id": 1, "name": "people"}})
+        self.assertEqual(self.source.unique["unit"]["name"], {1: '{"name": "people"}'})
+
+        unit = Unit.one(1).retrieve()
+
+        self.assertEqual(self.source.model_delete(unit), 1)
+        self.assertEqual(unit._action, "create")
+        self.assertEqual(self.source.data["unit"], {})
+
     def test_delete(self):
 
         unit = Unit("people")
@@ -1086,6 +1906,18 @@ class TestSource(unittest.TestCase):
                 }
             ])
 
+    def test_model_execute(self):
+
+        self.source.model_execute({"ACTION": "add", "name": "simple"})
+
+        self.assertEqual(self.source.ids["simple"], 0)
+        self.assertEqual(dict(self.source.data["simple"]), {})
+
+        self.source.model_execute({"ACTION": "remove", "name": "simple"})
+
+        self.assertNotIn("simple", self.source.ids)
+        self.assertNotIn("simple", self.source.data)
+
     def test_execute(self):
 
         self.source.ids = {}
@@ -1304,6 +2136,34 @@ class TestSource(unittest.TestCase):
             }
         })
 
+    def test_migrate_paths(self):
+
+        source_path = f"ddl/{self.source.name}/{self.source.KIND}"
+
+        self.assertEqual(self.source.migrate_paths(source_path), [f"{source_path}/definition.json"])
+
+        os.makedirs(source_path)
+        pathlib.Path(f"{source_path}/migration-2012-07-07.json").touch()
+        pathlib.Path(f"{source_path}/migration-2012-07-08.json").touch()
+
+        self.source.migrations = ["2012-07-07"]
+
+        self.assertEqual(self.source.migrate_paths(source_path), [f"{source_path}/migration-2012-07-08.json"])
+
+    def test_migrate_stamps(self):
+
+        source_path = f"ddl/{self.source.name}/{self.source.KIND}"
+
+        os.makedirs(source_path)
+        pathlib.Path(f"{source_path}/migration-2012-07-08.json").touch()
+        pathlib.Path(f"{source_path}/migration-2012-07-07.json").touch()
+
+        self.source.migrate_stamps(source_path)
+        self.assertEqual(self.source.migrations, ["2012-07-07", "2012-07-08"])
+
+        self.source.migrate_stamps(source_path)
+        self.assertEqual(self.source.migrations, ["2012-07-07", "2012-07-08"])
+
     def test_migrate(self):
 
         self.source.ids = {}
@@ -1332,6 +2192,264 @@ class TestSource(unittest.TestCase):
         self.assertFalse(self.source.migrate(f"ddl/{self.source.name}/{self.source.KIND}"))
 
 
+class TestAsyncMockSource(unittest.IsolatedAsyncioTestCase):
+
+    maxDiff = None
+
+    def setUp(self):
+
+        self.source = relations.unittest.AsyncMockSource("AsyncUnittestSource")
+
+        shutil.rmtree("ddl", ignore_errors=True)
+        os.makedirs("ddl", exist_ok=True)
+
+    def tearDown(self):
+
+        shutil.rmtree("ddl", ignore_errors=True)
+
+    @unittest.mock.patch("relations.SOURCES", {})
+    def test___init__(self):
+
+        source = relations.unittest.AsyncMockSource("unit")
+
+        self.assertEqual(source.name, "unit")
+        self.assertFalse(source.lock.locked())
+        self.assertFalse(source.writer.get())
+
+    async def test_atomic(self):
+
+        await AsyncSimple("ya").create()
+
+        data = copy.deepcopy(self.source.data)
+
+        # concurrent writes each commit or roll back on their own
+
+        results = await asyncio.gather(
+            AsyncSimple([["sure"], ["ya"]]).create(),
+            AsyncSimple("fine").create(),
+            return_exceptions=True
+        )
+
+        self.assertIsInstance(results[0], relations.unittest.MockSource.UniqueError)
+        self.assertEqual(results[1].id, 2)
+        self.assertIsNone(self.source.transaction)
+        self.assertFalse(self.source.lock.locked())
+        self.assertEqual(self.source.data["async_simple"], {**data["async_simple"], 2: {"id": 2, "name": "fine"}})
+
+        # nested writes roll back with the outer
+
+        unit = AsyncUnit("people")
+        unit.test.add("stuff").add("stuff")
+
+        with self.assertRaisesRegex(relations.unittest.MockSource.UniqueError, 'async_test: value {"name": "stuff", "unit_id": 1} violates unique unit_id-name'):
+            await unit.create()
+
+        self.assertEqual(self.source.data["async_unit"], {})
+        self.assertEqual(self.source.data["async_test"], {})
+        self.assertIsNone(self.source.transaction)
+
+    async def test_atomically(self):
+
+        async def good(source, name):
+            return await source.create(AsyncSimple(name))
+
+        async def bad(source, name):
+            await source.create(AsyncSimple(name))
+            raise Exception("whoops")
+
+        self.assertEqual((await self.source.atomically(good, "ya")).id, 1)
+        self.assertIsNone(self.source.transaction)
+
+        with self.assertRaisesRegex(Exception, "whoops"):
+            await self.source.atomically(bad, "sure")
+
+        self.assertIsNone(self.source.transaction)
+        self.assertEqual(self.source.data["async_simple"], {1: {"id": 1, "name": "ya"}})
+
+    async def test_model_relatives(self):
+
+        await AsyncUnit("people").create()
+
+        test = AsyncTest.many(unit__name="people")
+
+        await self.source.model_relatives(test)
+
+        self.assertEqual(test._parents["unit"]._action, "update")
+        self.assertEqual(test._parents["unit"].id, [1])
+
+    async def test_model_liked(self):
+
+        unit = AsyncUnit("people")
+        unit.test.add("stuff")
+        await unit.create()
+
+        self.assertIsNone(await self.source.model_liked(AsyncTest.many()))
+
+        relation, parent = (await self.source.model_liked(AsyncTest.many(like="p")))["unit_id"]
+
+        self.assertIs(relation.Parent, AsyncUnit)
+        self.assertEqual(parent.id, [1])
+
+    async def test_create(self):
+
+        unit = AsyncUnit("people")
+        unit.test.add("stuff")
+
+        self.assertIs(await self.source.create(unit), unit)
+        self.assertEqual(unit._action, "update")
+        self.assertEqual(self.source.data["async_unit"], {1: {"id": 1, "name": "people"}})
+        self.assertEqual(self.source.data["async_test"], {1: {"id": 1, "unit_id": 1, "name": "stuff"}})
+
+        units = AsyncUnit([["stuff"], ["things"]], _bulk=True)
+
+        await self.source.create(units)
+
+        self.assertEqual(units._models, [])
+        self.assertEqual(len(self.source.data["async_unit"]), 3)
+
+    async def test_insert(self):
+
+        self.assertEqual(await self.source.insert(AsyncSimple.thy(), [{"name": "ya"}, {"name": "sure"}]), 2)
+        self.assertEqual(self.source.data["async_simple"][2], {"id": 2, "name": "sure"})
+
+        with self.assertRaises(relations.unittest.MockSource.UniqueError):
+            await self.source.insert(AsyncSimple.thy(), [{"name": "fine"}, {"name": "ya"}])
+
+        self.assertEqual(len(self.source.data["async_simple"]), 2)
+
+    async def test_count(self):
+
+        unit = AsyncUnit("people")
+        unit.test.add("stuff").add("things")
+        await unit.create()
+
+        self.assertEqual(await self.source.count(AsyncTest.many()), 2)
+        self.assertEqual(await self.source.count(AsyncTest.many(name="stuff")), 1)
+        self.assertEqual(await self.source.count(AsyncTest.many(unit__name="people")), 2)
+        self.assertEqual(await self.source.count(AsyncTest.many(like="p")), 2)
+        self.assertEqual(await self.source.count(AsyncTest.many(like="nope")), 0)
+
+    async def test_retrieve(self):
+
+        unit = AsyncUnit("people")
+        unit.test.add("stuff").add("things")
+        await unit.create()
+
+        tests = await self.source.retrieve(AsyncTest.many(unit__name="people").sort("-name"))
+        self.assertEqual(tests.name, ["things", "stuff"])
+
+        tests = await self.source.retrieve(AsyncTest.many(like="peo"))
+        self.assertEqual(tests.name, ["stuff", "things"])
+
+        test = await self.source.retrieve(AsyncTest.one(name="stuff"))
+        self.assertEqual(test.id, 1)
+
+        self.assertIsNone(await self.source.retrieve(AsyncTest.one(name="nope"), False))
+
+    async def test_retrieve_iter(self):
+
+        await AsyncUnit.insert([("people",), ("stuff",), ("things",)])
+
+        units = [unit async for unit in self.source.retrieve_iter(AsyncUnit.many(name__not_eq="stuff"), 1)]
+
+        self.assertEqual([unit.name for unit in units], ["people", "things"])
+        self.assertEqual(units[0]._action, "update")
+
+    async def test_titles(self):
+
+        unit = AsyncUnit("people")
+        unit.test.add("stuff").add("things")
+        await unit.create()
+
+        tests = AsyncTest.many()
+
+        titles = await self.source.titles(tests)
+
+        self.assertEqual(titles.ids, [1, 2])
+        self.assertEqual(titles.titles, {1: ["people", "stuff"], 2: ["people", "things"]})
+        self.assertEqual(tests._titled[(AsyncUnit, "id")].ids, [1])
+
+    async def test_update(self):
+
+        await AsyncUnit.insert([("people",), ("stuff",)])
+
+        self.assertEqual(await self.source.update(AsyncUnit.many(id=2).set(name="things")), 1)
+        self.assertEqual(self.source.data["async_unit"][2], {"id": 2, "name": "things"})
+
+        unit = await AsyncUnit.one(1).retrieve()
+        unit.name = "thing"
+        unit.test
+
+        self.assertEqual(await self.source.update(unit), 1)
+        self.assertEqual(self.source.data["async_unit"][1], {"id": 1, "name": "thing"})
+        self.assertEqual(self.source.data["async_test"], {})
+
+        unit = AsyncUnit("people")
+        unit.test.add("stuff")
+        await unit.create()
+        unit.test.add("moar")
+
+        self.assertEqual(await self.source.update(unit), 1)
+        self.assertEqual(self.source.data["async_test"][2], {"id": 2, "unit_id": 3, "name": "moar"})
+
+        with self.assertRaisesRegex(relations.ModelError, "async_plain: nothing to update from"):
+            await self.source.update(AsyncPlain.many())
+
+    async def test_delete(self):
+
+        await AsyncUnit.insert([("people",), ("stuff",), ("things",)])
+
+        self.assertEqual(await self.source.delete(AsyncUnit.many(name__in=["people", "stuff"])), 2)
+        self.assertEqual(self.source.data["async_unit"], {3: {"id": 3, "name": "things"}})
+
+        unit = await AsyncUnit.one(3).retrieve()
+
+        self.assertEqual(await self.source.delete(unit), 1)
+        self.assertEqual(unit._action, "create")
+        self.assertEqual(self.source.data["async_unit"], {})
+
+    async def test_execute(self):
+
+        self.source.ids = {}
+        self.source.data = {}
+
+        await self.source.execute(AsyncUnit.define())
+
+        self.assertEqual(self.source.ids, {"async_unit": 0})
+        self.assertEqual(self.source.data, {"async_unit": {}})
+
+    async def test_load(self):
+
+        self.source.ids = {}
+        self.source.data = {}
+
+        migrations = relations.Migrations()
+
+        migrations.generate([AsyncUnit])
+        migrations.convert(self.source.name)
+
+        await self.source.load(f"ddl/{self.source.name}/{self.source.KIND}/definition.json")
+
+        self.assertEqual(await AsyncUnit.many().count(), 0)
+
+    async def test_migrate(self):
+
+        self.source.ids = {}
+        self.source.data = {}
+
+        migrations = relations.Migrations()
+
+        migrations.generate([AsyncUnit])
+        migrations.generate([AsyncUnit, AsyncTest])
+        migrations.convert(self.source.name)
+
+        self.assertTrue(await self.source.migrate(f"ddl/{self.source.name}/{self.source.KIND}"))
+
+        self.assertEqual(await AsyncTest.many().count(), 0)
+
+        self.assertFalse(await self.source.migrate(f"ddl/{self.source.name}/{self.source.KIND}"))
+
+
 class TestUnitTest(relations.unittest.TestCase):
 
     def test_consistent(self):
@@ -1383,6 +2501,39 @@ class TestUnitTest(relations.unittest.TestCase):
 
         self.assertFields(fields, [1, 2, 3])
 
+    def test_assertNoNPlusOne(self):
+
+        relations.unittest.MockSource("UnittestSource")
+
+        unit = Unit([["people"], ["stuff"]]).create()
+        unit[0].test.add("moar")
+        unit[1].test.add("less")
+        unit.update()
+
+        with self.assertNoNPlusOne() as detector:
+            for test in Test.many().prefetch("unit"):
+                test.unit.name
+
+        self.assertEqual(detector.problems(), [])
+
+        def repeated():
+            with self.assertNoNPlusOne():
+                for test in Test.many():
+                    test.unit.name
+
+        self.assertRaisesRegex(AssertionError, "2 retrieve queries of unit by id through test.unit from", repeated)
+
+        def message():
+            with self.assertNoNPlusOne(message="nope"):
+                for test in Test.many():
+                    test.unit.name
+
+        self.assertRaisesRegex(AssertionError, "^nope$", message)
+
+        with self.assertNoNPlusOne(3):
+            for test in Test.many():
+                test.unit.name
+
     def test_assertassertStatusValue(self):
 
         response = unittest.mock.MagicMock()